@@ -4,8 +4,12 @@ import os
 from pathlib import Path
 from aws_cdk import App, Environment, Tags, Stack
 from stacks.website_stack import WebsiteStack
+from stacks.access_logs_stack import AccessLogsStack
+from stacks.monitoring_stack import MonitoringStack
 from stacks.acm_certificates_stack import ACMCertificatesStack
 from stacks.backup_website_bucket import BackupWebsiteBucketStack
+from stacks.ssm_replication_provider_stack import SSMReplicationProviderStack
+from stacks.synthetic_probe_stack import SyntheticProbeStack
 from config import EnvironmentConfig
 
 
@@ -55,11 +59,30 @@ region = environment_config.region
 domain_name = environment_config.domain_name
 source_file_path = environment_config.file_path
 cloudfront_region = environment_config.cloudfront_region
-replication_target_region = environment_config.replication_target_region
+replication_target_regions = environment_config.replication_target_regions
 cloudfront_price_class = environment_config.cloudfront_price_class
 acm_ssm_params = environment_config.acm_ssm_params
 backup_website_bucket_ssm_params = environment_config.backup_website_bucket_ssm_params
 geo_restrictions = environment_config.geo_restrictions.to_dict()
+asset_deployment_mode = environment_config.asset_deployment_mode
+max_invalidation_paths = environment_config.max_invalidation_paths
+precompressed_encodings = environment_config.precompressed_encodings
+backup_sync = environment_config.backup_sync
+active_release = environment_config.active_release
+retain_releases = environment_config.retain_releases
+edge_routes = (
+    {path: route.to_dict() for path, route in environment_config.edge_routes.items()}
+    if environment_config.edge_routes is not None
+    else None
+)
+access_logs = environment_config.access_logs
+access_log_retention_days = environment_config.access_log_retention_days
+monitoring = (
+    environment_config.monitoring.to_dict()
+    if environment_config.monitoring is not None
+    else None
+)
+synthetic_probe = environment_config.synthetic_probe
 
 env = Environment(account=account_id, region=region)
 cloudfront_env = Environment(account=account_id, region=cloudfront_region)
@@ -74,12 +97,21 @@ default_tags = {
     "github": "https://github.com/cullancarey/PortfolioWebsite",
 }
 
+# One replication Lambda/provider shared by every replicator in cloudfront_env
+replication_provider_stack = SSMReplicationProviderStack(
+    scope=app,
+    id="SSMReplicationProvider",
+    env=cloudfront_env,
+    description=f"Stack to deploy the shared SSM replication provider in {cloudfront_env.region}",
+)
+
 certificates = ACMCertificatesStack(
     scope=app,
     id="ACMCertificates",
     domain_name=domain_name,
     env_region=cloudfront_region,
-    replication_target_region=replication_target_region,
+    replication_target_regions=replication_target_regions,
+    replication_provider=replication_provider_stack.provider,
     ssm_params=acm_ssm_params,
     env=cloudfront_env,
     description=f"Stack to create ACM certificates in {cloudfront_env.region} for Cloudfront",
@@ -90,7 +122,8 @@ backup_bucket_stack = BackupWebsiteBucketStack(
     id="BackupWebsiteBucket",
     ssm_params=backup_website_bucket_ssm_params,
     region=cloudfront_region,
-    replication_target_region=replication_target_region,
+    replication_target_regions=replication_target_regions,
+    replication_provider=replication_provider_stack.provider,
     env=cloudfront_env,
     description=f"Stack to deploy the website's failover bucket in {cloudfront_env.region}",
 )
@@ -104,15 +137,80 @@ website_stack = WebsiteStack(
     backup_website_bucket_ssm_params=backup_website_bucket_ssm_params,
     geo_restrictions=geo_restrictions,
     cloudfront_price_class=cloudfront_price_class,
+    asset_deployment_mode=asset_deployment_mode,
+    max_invalidation_paths=max_invalidation_paths,
+    precompressed_encodings=precompressed_encodings,
+    backup_sync=backup_sync,
+    active_release=active_release,
+    retain_releases=retain_releases,
+    edge_routes=edge_routes,
     env=env,
+    # The access logs and monitoring stacks in cloudfront_env reference the
+    # distribution.
+    cross_region_references=access_logs or monitoring is not None,
     description="Stack to deploy the website resources",
 )
 
 website_stack.add_dependency(certificates)
 website_stack.add_dependency(backup_bucket_stack)
 
+add_tags(replication_provider_stack, default_tags)
 add_tags(certificates, default_tags)
 add_tags(backup_bucket_stack, default_tags)
 add_tags(website_stack, default_tags)
 
+if access_logs:
+    access_logs_stack = AccessLogsStack(
+        scope=app,
+        id="AccessLogs",
+        distribution=website_stack.distribution,
+        retention_days=access_log_retention_days,
+        env=cloudfront_env,
+        cross_region_references=True,
+        description=f"Stack to deliver the website's CloudFront access logs in {cloudfront_env.region}",
+    )
+    add_tags(access_logs_stack, default_tags)
+
+if monitoring is not None:
+    monitoring_stack = MonitoringStack(
+        scope=app,
+        id="Monitoring",
+        distribution=website_stack.distribution,
+        thresholds=monitoring,
+        env=cloudfront_env,
+        cross_region_references=True,
+        description=f"Stack to deploy the website's dashboard and alarms in {cloudfront_env.region}",
+    )
+    add_tags(monitoring_stack, default_tags)
+
+if synthetic_probe is not None:
+    # The probe reads the backup bucket name at run time and mirrors the
+    # edge's origin path and rewrites to find each page's object in it.
+    probe_settings = {
+        **synthetic_probe.to_dict(),
+        "backup_bucket_param": backup_website_bucket_ssm_params[
+            "backup_website_bucket_name_param"
+        ],
+        # CloudFormation names the bucket `<stack name>-<logical id>-<suffix>`
+        # in lowercase, so only that stack's buckets can be read.
+        "backup_bucket_name_pattern": f"{backup_bucket_stack.stack_name.lower()}-*",
+        "backup_bucket_region": cloudfront_region,
+        "backup_origin_path": website_stack.origin_path,
+        "backup_rewrites": {
+            alias: f"/{object_key}"
+            for object_key, aliases in website_stack.clean_url_aliases.items()
+            for alias in aliases
+        },
+    }
+    for probe_region in synthetic_probe.regions:
+        probe_stack = SyntheticProbeStack(
+            scope=app,
+            id=f"SyntheticProbe-{probe_region}",
+            domain_name=domain_name,
+            probe_settings=probe_settings,
+            env=Environment(account=account_id, region=probe_region),
+            description=f"Stack to probe the website's time to first byte from {probe_region}",
+        )
+        add_tags(probe_stack, default_tags)
+
 app.synth()
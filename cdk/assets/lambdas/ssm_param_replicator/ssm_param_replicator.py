@@ -1,55 +1,746 @@
 import boto3
+import hashlib
 import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from telemetry import THROTTLING_ERROR_CODES, Telemetry
+
+# GetParameters accepts at most 10 names per call.
+GET_PARAMETERS_BATCH_SIZE = 10
+
+# Target writes fan out over a bounded worker pool. The token bucket starts at
+# WRITE_RATE_LIMIT requests/second and halves its rate whenever SSM throttles,
+# so parallel workers back off together instead of hammering the account limit.
+WRITE_CONCURRENCY = int(os.environ.get("WRITE_CONCURRENCY", "4"))
+WRITE_RATE_LIMIT = float(os.environ.get("WRITE_RATE_LIMIT", "10"))
+WRITE_MAX_ATTEMPTS = int(os.environ.get("WRITE_MAX_ATTEMPTS", "6"))
+
+# SSM clients live for the lifetime of the execution environment, keyed by
+# region, so warm invocations and isComplete polls reuse the same endpoint
+# resolution and kept-alive connections instead of rebuilding them each time.
+# The pool is sized to the write worker pool so concurrent puts never wait
+# for a connection; adaptive retries add client-side rate limiting on top of
+# the token bucket below.
+SSM_CLIENT_CONFIG = Config(
+    max_pool_connections=max(WRITE_CONCURRENCY, 1),
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=10,
+    retries={"mode": "adaptive", "max_attempts": 3},
+)
+# Writes are retried by `put_parameter_with_backoff`, which feeds throttles
+# into the shared token bucket, so their clients send each call only once.
+# Retrying in botocore too would multiply the sends per write.
+SSM_WRITE_CLIENT_CONFIG = SSM_CLIENT_CONFIG.merge(
+    Config(retries={"mode": "standard", "total_max_attempts": 1})
+)
+_ssm_clients = {}
+_ssm_write_clients = {}
+_ssm_clients_lock = threading.Lock()
+
+# Backoff jitter only spreads retries out; SystemRandom keeps it off the
+# non-cryptographic generator security scanners flag.
+_jitter = random.SystemRandom()
+
+# Stop starting new SSM calls once less than this much Lambda time remains.
+DEADLINE_SAFETY_MARGIN_MS = int(os.environ.get("DEADLINE_SAFETY_MARGIN_MS", "10000"))
+
+# Every SSM client is instrumented: per-call latency, retries, throttles and
+# bytes go out as EMF metrics under METRIC_NAMESPACE at the end of each
+# invocation, with X-Ray subsegments around each call when tracing is on.
+telemetry = Telemetry(
+    namespace=os.environ.get("METRIC_NAMESPACE", "SSMParameterReplicator"),
+    tracing_enabled=os.environ.get("TRACING_ENABLED", "false").lower() == "true",
+)
 
 
 def lambda_handler(event, context):
+    """CloudFormation onEvent handler.
+
+    Replicates as much as fits before the Lambda deadline. When the resource
+    uses async completion, unfinished work is picked up by
+    `is_complete_handler`; otherwise running out of time fails the request.
+    """
     print("Received event:", json.dumps(event))
 
-    request_type = event.get("RequestType", "Create")
+    request = parse_request(event)
+    physical_resource_id = request["PhysicalResourceId"]
+
+    if request["RequestType"] == "Delete":
+        # Nothing to clean up. Source and target SSM params are managed elsewhere.
+        return {
+            "PhysicalResourceId": physical_resource_id,
+            "Data": {"Message": "Delete - nothing to do"},
+        }
+
+    try:
+        data, complete = run_replication(request, Deadline(context))
+        if not complete and not request["AsyncCompletion"]:
+            raise TimeoutError(
+                "Replication did not finish before the Lambda deadline "
+                f"({data['PendingCount']} parameter(s) pending); enable async "
+                "completion on the SSMParameterReplicator for large jobs"
+            )
+
+        if not complete:
+            message = "Replication in progress"
+        elif data["FailedCount"]:
+            message = "Replication completed with failures"
+        else:
+            message = "Replication complete"
+        return {
+            "PhysicalResourceId": physical_resource_id,
+            "Data": {"Message": message, **data},
+        }
+    except Exception as e:
+        print(f"Error replicating parameters: {e}")
+        # With custom_resources.Provider, raise to signal failure.
+        raise
+    finally:
+        telemetry.flush()
+
+
+def is_complete_handler(event, context):
+    """CloudFormation isComplete handler used with async completion.
+
+    The provider polls this handler until it reports completion. Progress is
+    checkpointed in the target regions themselves: each poll re-diffs the
+    targets, skips everything earlier invocations already wrote and resumes
+    with whatever is still out of date, stopping again before its deadline.
+    On the final poll, parameters written by earlier invocations are
+    reported as skipped.
+    """
+    print("Received event:", json.dumps(event))
+
+    request = parse_request(event)
+    if request["RequestType"] == "Delete":
+        return {"IsComplete": True}
+
+    try:
+        data, complete = run_replication(request, Deadline(context))
+    except Exception as e:
+        print(f"Error replicating parameters: {e}")
+        raise
+    finally:
+        telemetry.flush()
+
+    if not complete:
+        return {"IsComplete": False}
+
+    message = (
+        "Replication completed with failures"
+        if data["FailedCount"]
+        else "Replication complete"
+    )
+    return {"IsComplete": True, "Data": {"Message": message, **data}}
+
+
+def event_handler(event, context):
+    """SQS handler for EventBridge "Parameter Store Change" events.
+
+    Each message names one changed source parameter and carries the
+    replication settings of the `SSMParameterReplicator` whose rule matched
+    it. The event source mapping's batching window coalesces bursts of
+    changes into one batch: repeated changes to a parameter collapse into a
+    single read of its current value, and each replicator's changes are
+    written together. Messages whose replication failed or ran out of time
+    are reported as batch item failures so SQS redelivers only those.
+    """
+    records = event.get("Records", [])
+    print(f"Received {len(records)} parameter change message(s)")
+
+    jobs = {}
+    for record in records:
+        message = json.loads(record["body"])
+        key = json.dumps(message["Replication"], sort_keys=True)
+        job = jobs.setdefault(
+            key,
+            {"Replication": message["Replication"], "Names": set(), "MessageIds": []},
+        )
+        job["Names"].add(message["Name"])
+        job["MessageIds"].append(record["messageId"])
+
+    failed_message_ids = []
+    deadline = Deadline(context)
+    try:
+        for job in jobs.values():
+            try:
+                complete = replicate_changed_parameters(
+                    job["Replication"], job["Names"], deadline
+                )
+            except Exception as e:
+                print(f"Error replicating changed parameters: {e}")
+                complete = False
+            if not complete:
+                failed_message_ids.extend(job["MessageIds"])
+    finally:
+        telemetry.flush()
+
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": message_id} for message_id in failed_message_ids
+        ]
+    }
+
+
+def replicate_changed_parameters(replication, names, deadline=None):
+    """Replicate the current values of changed source parameters.
+
+    `replication` holds the same properties as the custom resource. Names
+    outside its parameters or source path are ignored, and parameters
+    deleted since the change event are skipped. Returns True when every
+    target write succeeded before the deadline.
+    """
+    request = parse_request({"ResourceProperties": replication})
+    targets_by_source = {
+        parameter["source"]: parameter["target"] for parameter in request["Parameters"]
+    }
+    source_root = (request["SourcePath"] or "").rstrip("/")
+
+    targets = {}
+    for name in sorted(names):
+        if name in targets_by_source:
+            targets[name] = targets_by_source[name]
+        elif request["SourcePath"] and name.startswith(f"{source_root}/"):
+            targets[name] = map_to_target_path(
+                name, request["SourcePath"], request["TargetPath"]
+            )
+
+    started_at = time.perf_counter()
+    values, missing = get_parameter_values(
+        get_ssm_client(request["SourceRegion"]), list(targets)
+    )
+    if missing:
+        print(f"Skipping deleted source parameters: {', '.join(sorted(missing))}")
+    desired = {targets[name]: value for name, value in values.items()}
+
+    target_clients = {
+        region: get_ssm_client(region) for region in request["TargetRegions"]
+    }
+    write_clients = {
+        region: get_ssm_write_client(region) for region in request["TargetRegions"]
+    }
+    data, failures, complete = replicate(
+        [(desired, False)], target_clients, deadline, write_clients
+    )
+    data["CoalescedCount"] = len(names)
+    print("Replication result:", json.dumps({"Complete": complete, **data}))
+    telemetry.record_result(data, (time.perf_counter() - started_at) * 1000)
+    for name, error in sorted(failures.items()):
+        print(f"Failed to write {name}: {error}")
+    return complete and not failures
+
+
+def parse_request(event):
+    """Normalize a custom resource event into the settings replication needs."""
     resource_props = event.get("ResourceProperties", {})
 
     source_region = resource_props["SourceRegion"]
-    target_region = resource_props["TargetRegion"]
+    target_regions = get_target_regions(resource_props)
 
-    parameters_raw = resource_props["Parameters"]
+    parameters_raw = resource_props.get("Parameters", [])
     parameters = (
         json.loads(parameters_raw)
         if isinstance(parameters_raw, str)
         else parameters_raw
     )
+    source_path = resource_props.get("SourcePath")
+    old_resource_props = event.get("OldResourceProperties")
+
+    return {
+        "RequestType": event.get("RequestType", "Create"),
+        "PhysicalResourceId": event.get(
+            "PhysicalResourceId",
+            f"ssm-param-replicator-{source_region}-to-{'-'.join(target_regions)}",
+        ),
+        "SourceRegion": source_region,
+        "TargetRegions": target_regions,
+        "Parameters": parameters,
+        "SourcePath": source_path,
+        "TargetPath": resource_props.get("TargetPath") or source_path,
+        "FailOnError": _is_true(resource_props.get("FailOnError", "true")),
+        "AsyncCompletion": _is_true(resource_props.get("AsyncCompletion", "false")),
+        "FullResync": _is_true(resource_props.get("FullResync", "false")),
+        "UpdateTriggers": resource_props.get("UpdateTriggers", []),
+        "ParameterTriggers": resource_props.get("ParameterTriggers", {}),
+        "OldRequest": (
+            parse_request({"ResourceProperties": old_resource_props})
+            if old_resource_props
+            else None
+        ),
+    }
+
+
+def run_replication(request, deadline=None):
+    """Replicate a parsed request until done or out of time.
+
+    Returns a `(data, complete)` tuple. Raises when writes failed and the
+    request has `FailOnError` set.
+    """
+    ssm_src = get_ssm_client(request["SourceRegion"])
+    target_clients = {
+        region: get_ssm_client(region) for region in request["TargetRegions"]
+    }
+    write_clients = {
+        region: get_ssm_write_client(region) for region in request["TargetRegions"]
+    }
 
-    physical_resource_id = event.get(
-        "PhysicalResourceId", f"ssm-param-replicator-{source_region}-to-{target_region}"
+    started_at = time.perf_counter()
+    parameters = select_changed_parameters(request)
+    batches = iter_desired_batches(
+        ssm_src,
+        parameters,
+        request["SourcePath"],
+        request["TargetPath"],
     )
+    data, failures, complete = replicate(
+        batches, target_clients, deadline, write_clients
+    )
+    data["UnchangedCount"] = len(request["Parameters"]) - len(parameters)
+    print("Replication result:", json.dumps({"Complete": complete, **data}))
+    telemetry.record_result(data, (time.perf_counter() - started_at) * 1000)
 
-    if request_type == "Delete":
-        # Nothing to clean up. Source and target SSM params are managed elsewhere.
-        return {
-            "PhysicalResourceId": physical_resource_id,
-            "Data": {"Message": "Delete - nothing to do"},
+    if failures and request["FailOnError"]:
+        details = "; ".join(
+            f"{name}: {error}" for name, error in sorted(failures.items())
+        )
+        raise RuntimeError(
+            f"Failed to write {len(failures)} target parameter(s): {details}"
+        )
+
+    return data, complete
+
+
+def select_changed_parameters(request):
+    """Return the explicitly listed parameters this event has to replicate.
+
+    Updates compare each parameter's hash against the previous properties
+    and keep only mappings that are new or whose triggers changed, so a
+    rotated certificate ARN moves just the parameter it feeds. Everything is
+    replicated on Create, on `FullResync`, in path mode, and when the
+    regions or the resource-wide `UpdateTriggers` changed, since every
+    parameter depends on those.
+    """
+    parameters = request["Parameters"]
+    old_request = request["OldRequest"]
+    if (
+        request["RequestType"] != "Update"
+        or old_request is None
+        or request["FullResync"]
+        or request["SourcePath"]
+        or any(
+            old_request[key] != request[key]
+            for key in ("SourceRegion", "TargetRegions", "UpdateTriggers")
+        )
+    ):
+        return parameters
+
+    old_hashes = {
+        parameter_hash(parameter, old_request["ParameterTriggers"])
+        for parameter in old_request["Parameters"]
+    }
+    return [
+        parameter
+        for parameter in parameters
+        if parameter_hash(parameter, request["ParameterTriggers"]) not in old_hashes
+    ]
+
+
+def parameter_hash(parameter, parameter_triggers):
+    """Hash a parameter's source/target mapping together with its triggers."""
+    triggers = parameter_triggers.get(parameter["source"], [])
+    if isinstance(triggers, str):
+        triggers = [triggers]
+    payload = json.dumps(
+        {
+            "source": parameter["source"],
+            "target": parameter["target"],
+            "triggers": triggers,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_ssm_client(region):
+    """Return the cached SSM client for `region`, creating it on first use.
+
+    Creation is serialized because boto3's default session is not safe to
+    build clients from concurrently; the clients themselves are thread-safe.
+    """
+    return _get_cached_client(_ssm_clients, region, SSM_CLIENT_CONFIG)
+
+
+def get_ssm_write_client(region):
+    """Return the cached single-attempt SSM client used for writes."""
+    return _get_cached_client(_ssm_write_clients, region, SSM_WRITE_CLIENT_CONFIG)
+
+
+def _get_cached_client(cache, region, config):
+    with _ssm_clients_lock:
+        client = cache.get(region)
+        if client is None:
+            client = boto3.client("ssm", region_name=region, config=config)
+            cache[region] = client
+        return telemetry.instrument(client)
+
+
+def _is_true(value):
+    return str(value).lower() == "true"
+
+
+class Deadline:
+    """Tracks the Lambda's remaining time against a safety margin.
+
+    Once less than `margin_ms` remains, no new SSM calls are started so the
+    handler always has time to report progress back to CloudFormation.
+    Without a Lambda context (local runs) the deadline never expires.
+    """
+
+    def __init__(self, context, margin_ms=None):
+        self.context = context
+        self.margin_ms = DEADLINE_SAFETY_MARGIN_MS if margin_ms is None else margin_ms
+
+    def expired(self):
+        if self.context is None:
+            return False
+        return self.context.get_remaining_time_in_millis() <= self.margin_ms
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of starting an SSM call after the deadline has passed."""
+
+
+def get_target_regions(resource_props):
+    """Return the ordered, de-duplicated target regions for a request.
+
+    Accepts the `TargetRegions` list and falls back to the single
+    `TargetRegion` property used by earlier versions of the construct.
+    """
+    regions = resource_props.get("TargetRegions")
+    if not regions:
+        regions = [resource_props["TargetRegion"]]
+    elif isinstance(regions, str):
+        regions = json.loads(regions)
+    return list(dict.fromkeys(regions))
+
+
+def iter_desired_batches(ssm_src, parameters, source_path=None, target_path=None):
+    """Yield `(desired, more)` batches, one at a time.
+
+    `desired` maps target name to source value, and `more` is True when
+    further batches may follow. Explicitly listed parameters form a single
+    batch. When `source_path` is set, every String parameter below it is
+    streamed page by page so memory stays bounded by the page size
+    regardless of how large the hierarchy is.
+    """
+    if parameters:
+        source_values = read_parameters(
+            ssm_src, [param["source"] for param in parameters]
+        )
+        desired = {
+            param["target"]: source_values[param["source"]] for param in parameters
         }
+        yield desired, bool(source_path)
 
-    ssm_src = boto3.client("ssm", region_name=source_region)
-    ssm_dst = boto3.client("ssm", region_name=target_region)
+    if source_path:
+        for page, more in iter_parameters_by_path(ssm_src, source_path):
+            desired = {
+                map_to_target_path(name, source_path, target_path): value
+                for name, value in page.items()
+            }
+            yield desired, more
 
-    try:
-        for param in parameters:
-            response = ssm_src.get_parameter(Name=param["source"])
-            ssm_dst.put_parameter(
-                Name=param["target"],
-                Value=response["Parameter"]["Value"],
+
+def iter_parameters_by_path(ssm_client, path):
+    """Yield `(values, more)` per GetParametersByPath page.
+
+    `values` maps name to value, and `more` is True when the page has a
+    continuation token. Empty pages are skipped.
+    """
+    paginator = ssm_client.get_paginator("get_parameters_by_path")
+    pages = paginator.paginate(
+        Path=path,
+        Recursive=True,
+        # SecureString values would come back encrypted and be written as
+        # plain String parameters, so only plain strings are replicated.
+        ParameterFilters=[{"Key": "Type", "Option": "Equals", "Values": ["String"]}],
+        PaginationConfig={"PageSize": GET_PARAMETERS_BATCH_SIZE},
+    )
+    for page in pages:
+        parameters = page.get("Parameters", [])
+        if parameters:
+            yield (
+                {parameter["Name"]: parameter["Value"] for parameter in parameters},
+                "NextToken" in page,
+            )
+
+
+def map_to_target_path(name, source_path, target_path):
+    """Re-root a parameter name from `source_path` under `target_path`."""
+    source_root = source_path.rstrip("/")
+    if not name.startswith(f"{source_root}/"):
+        raise ValueError(f"Parameter {name!r} is not under path {source_path!r}")
+    return f"{target_path.rstrip('/')}{name[len(source_root):]}"
+
+
+def replicate(batches, target_clients, deadline=None, write_clients=None):
+    """Replicate each `(desired, more)` batch to every target region.
+
+    Regions are independent, so each batch is diffed and written to all of
+    them in parallel. Rate limiters persist across batches so throttling in
+    one page slows the following pages for that region too. No new batch is
+    started once `deadline` has expired. Targets are read with
+    `target_clients` and written with `write_clients`, both keyed by region;
+    writes use the read clients when `write_clients` is not given.
+
+    Returns a `(data, failures, complete)` tuple: `data` holds total and
+    per-region replicated/skipped/failed/pending counts, `failures` maps
+    `region:name` to the error for every write that failed, and `complete`
+    is False when the deadline left writes pending or batches unread.
+    Expiring after the final batch does not make a finished run incomplete.
+    """
+    rate_limiters = {region: TokenBucket(WRITE_RATE_LIMIT) for region in target_clients}
+    counts = {
+        region: {
+            "ReplicatedCount": 0,
+            "SkippedCount": 0,
+            "FailedCount": 0,
+            "PendingCount": 0,
+        }
+        for region in target_clients
+    }
+    failures = {}
+    complete = True
+    write_clients = write_clients or target_clients
+
+    with ThreadPoolExecutor(max_workers=len(target_clients)) as executor:
+        for desired, more in batches:
+            region_futures = {
+                region: executor.submit(
+                    telemetry.in_trace_context(replicate_to_region),
+                    client,
+                    desired,
+                    rate_limiters[region],
+                    deadline,
+                    write_clients[region],
+                )
+                for region, client in target_clients.items()
+            }
+            for region, future in region_futures.items():
+                error = future.exception()
+                if error is None:
+                    result, region_failures = future.result()
+                else:
+                    # The region could not even be diffed; count every
+                    # parameter as failed there rather than hiding the other
+                    # regions' results.
+                    region_failures = {name: error for name in desired}
+                    result = {"FailedCount": len(desired)}
+                for key, value in result.items():
+                    counts[region][key] += value
+                failures.update(
+                    {f"{region}:{name}": err for name, err in region_failures.items()}
+                )
+
+            if more and deadline is not None and deadline.expired():
+                complete = False
+                break
+
+    data = {
+        "ReplicatedCount": 0,
+        "SkippedCount": 0,
+        "FailedCount": 0,
+        "PendingCount": 0,
+    }
+    for region, region_counts in counts.items():
+        for key, value in region_counts.items():
+            data[key] += value
+            data[f"{region}.{key}"] = value
+    if data["PendingCount"]:
+        complete = False
+    return data, failures, complete
+
+
+def replicate_to_region(
+    ssm_dst, desired, rate_limiter=None, deadline=None, ssm_writer=None
+):
+    """Diff and write the desired target values in a single region.
+
+    Current values are read with `ssm_dst` and changes written with
+    `ssm_writer`, which defaults to `ssm_dst`.
+
+    Returns a `(result, failures)` tuple where `result` holds the
+    replicated/skipped/failed/pending counts for the region. Writes that
+    were not started because the deadline passed are counted as pending
+    rather than failed.
+    """
+    # Only write targets whose current value differs; a missing target
+    # simply reads as "changed".
+    current, _missing = get_parameter_values(ssm_dst, list(desired))
+    changed = {
+        name: value for name, value in desired.items() if current.get(name) != value
+    }
+
+    outcomes = write_parameters(ssm_writer or ssm_dst, changed, rate_limiter, deadline)
+    pending = {
+        name for name, error in outcomes.items() if isinstance(error, DeadlineExceeded)
+    }
+    failures = {name: error for name, error in outcomes.items() if name not in pending}
+    result = {
+        "ReplicatedCount": len(changed) - len(outcomes),
+        "SkippedCount": len(desired) - len(changed),
+        "FailedCount": len(failures),
+        "PendingCount": len(pending),
+    }
+    return result, failures
+
+
+def read_parameters(ssm_client, names):
+    """Read parameter values that must all exist.
+
+    Returns a dict of parameter name to value. Raises a single error listing
+    every name SSM reported as invalid so missing sources surface in bulk
+    rather than one failed deployment at a time.
+    """
+    values, invalid = get_parameter_values(ssm_client, names)
+    if invalid:
+        raise ValueError(
+            f"Source parameters not found or invalid: {', '.join(sorted(invalid))}"
+        )
+    return values
+
+
+def get_parameter_values(ssm_client, names):
+    """Read parameter values in GetParameters-sized batches.
+
+    Returns a `(values, invalid)` tuple: a dict of name to value for every
+    parameter found and a list of names SSM reported as invalid or missing.
+    """
+    unique_names = list(dict.fromkeys(names))
+    values = {}
+    invalid = []
+
+    for batch in chunked(unique_names, GET_PARAMETERS_BATCH_SIZE):
+        response = ssm_client.get_parameters(Names=batch)
+        for parameter in response.get("Parameters", []):
+            values[parameter["Name"]] = parameter["Value"]
+        invalid.extend(response.get("InvalidParameters", []))
+
+    return values, invalid
+
+
+def chunked(items, size):
+    """Yield successive lists of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def write_parameters(ssm_client, values, rate_limiter=None, deadline=None):
+    """Write target parameters concurrently under a shared adaptive rate limit.
+
+    Every write is attempted; returns a dict of target name to exception for
+    the writes that still failed after retries, so one bad parameter does not
+    hide the others. Writes skipped because `deadline` expired map to a
+    `DeadlineExceeded` error.
+    """
+    rate_limiter = rate_limiter or TokenBucket(WRITE_RATE_LIMIT)
+    put_parameter = telemetry.in_trace_context(put_parameter_with_backoff)
+    failures = {}
+
+    with ThreadPoolExecutor(max_workers=WRITE_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(
+                put_parameter,
+                ssm_client,
+                rate_limiter,
+                name,
+                value,
+                deadline,
+            ): name
+            for name, value in values.items()
+        }
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                failures[futures[future]] = error
+
+    return failures
+
+
+def put_parameter_with_backoff(ssm_client, rate_limiter, name, value, deadline=None):
+    """Put a single parameter, retrying throttled calls with jittered backoff."""
+    for attempt in range(1, WRITE_MAX_ATTEMPTS + 1):
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(name)
+        rate_limiter.acquire()
+        try:
+            ssm_client.put_parameter(
+                Name=name,
+                Value=value,
                 Type="String",
                 Overwrite=True,
             )
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code")
+            if code not in THROTTLING_ERROR_CODES or attempt == WRITE_MAX_ATTEMPTS:
+                raise
+            rate_limiter.throttled()
+            # Full jitter keeps retrying workers from re-synchronizing.
+            time.sleep(_jitter.uniform(0, min(5.0, 0.1 * 2**attempt)))
+        else:
+            rate_limiter.succeeded()
+            return
 
-        return {
-            "PhysicalResourceId": physical_resource_id,
-            "Data": {
-                "Message": "Replication complete",
-                "ReplicatedCount": len(parameters),
-            },
-        }
-    except Exception as e:
-        print(f"Error replicating parameters: {e}")
-        # With custom_resources.Provider, raise to signal failure.
-        raise
+
+class TokenBucket:
+    """Thread-safe token bucket whose refill rate adapts to throttling.
+
+    The rate is halved on every throttle (down to `min_rate`) and recovers
+    additively on success, capped at the configured starting rate.
+    """
+
+    def __init__(self, rate, min_rate=0.5):
+        self.max_rate = max(rate, min_rate)
+        self.min_rate = min_rate
+        self.rate = self.max_rate
+        self.capacity = max(1.0, self.max_rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttled(self):
+        with self.lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+
+    def succeeded(self):
+        with self.lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
@@ -0,0 +1,241 @@
+"""CloudWatch Embedded Metric Format (EMF) metrics and X-Ray subsegments.
+
+`Telemetry.instrument` hooks a botocore client's call events, so every SSM
+call -- including paginator pages and botocore's own retries -- is timed
+and counted without touching the replication code. Metrics are printed to
+stdout as EMF JSON lines, which Lambda ships to CloudWatch Logs and
+CloudWatch turns into metrics. X-Ray subsegments are only created when
+tracing is enabled and the `aws_xray_sdk` package is importable.
+"""
+
+import json
+import os
+import threading
+import time
+
+try:
+    from aws_xray_sdk.core import xray_recorder
+except ImportError:  # The SDK is optional; tracing degrades to a no-op.
+    xray_recorder = None
+
+# EMF accepts at most 100 values per metric in a single record.
+MAX_VALUES_PER_RECORD = 100
+
+THROTTLING_ERROR_CODES = {"ThrottlingException", "TooManyUpdates"}
+
+_CALL_METRICS = [
+    {"Name": "Latency", "Unit": "Milliseconds"},
+    {"Name": "Calls", "Unit": "Count"},
+    {"Name": "Retries", "Unit": "Count"},
+    {"Name": "Throttles", "Unit": "Count"},
+    {"Name": "Errors", "Unit": "Count"},
+    {"Name": "RequestBytes", "Unit": "Bytes"},
+    {"Name": "ResponseBytes", "Unit": "Bytes"},
+]
+_RESULT_COUNTS = ["ReplicatedCount", "SkippedCount", "FailedCount", "PendingCount"]
+
+
+class Telemetry:
+    """Aggregates SSM call metrics per region/operation and emits EMF records.
+
+    Latencies are buffered per region/operation and flushed every
+    `MAX_VALUES_PER_RECORD` values, so memory stays bounded however many
+    calls an invocation makes. Call `flush` at the end of every invocation.
+    """
+
+    def __init__(self, namespace, tracing_enabled=False, emit=print):
+        self.namespace = namespace
+        self.tracing_enabled = tracing_enabled and xray_recorder is not None
+        self.emit = emit
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def instrument(self, client):
+        """Register call hooks on a botocore client once."""
+        if getattr(client, "_telemetry_instrumented", False):
+            return client
+        events = client.meta.events
+        # Registered first, on the same wildcard node botocore's Stubber uses,
+        # so the hook still runs when another before-call handler
+        # short-circuits the request.
+        events.register_first("before-call.*.*", self._before_call)
+        events.register("after-call.*.*", self._after_call)
+        events.register("after-call-error.*.*", self._after_call_error)
+        client._telemetry_instrumented = True
+        return client
+
+    def in_trace_context(self, fn):
+        """Wrap `fn` to run under the calling thread's X-Ray trace entity.
+
+        The recorder keeps its context per thread, so without this the
+        subsegments of calls made from executor workers would not be nested
+        under the invocation's segment.
+        """
+        if not self.tracing_enabled:
+            return fn
+        try:
+            entity = xray_recorder.get_trace_entity()
+        except Exception as e:  # Tracing must never fail replication.
+            print(f"X-Ray trace entity not found: {e}")
+            return fn
+
+        def run(*args, **kwargs):
+            xray_recorder.set_trace_entity(entity)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                # Pool threads are reused; leave no entity behind.
+                xray_recorder.clear_trace_entities()
+
+        return run
+
+    def _before_call(self, params, model, context, **kwargs):
+        # after-call-error carries no operation model, so keep its name here.
+        context["telemetry_operation"] = model.name
+        context["telemetry_started_at"] = time.perf_counter()
+        context["telemetry_request_bytes"] = len(params.get("body") or b"")
+        if self.tracing_enabled:
+            context["telemetry_subsegment"] = _begin_subsegment(
+                model.name, context.get("client_region")
+            )
+
+    def _after_call(self, http_response, parsed, model, context, **kwargs):
+        error_code = parsed.get("Error", {}).get("Code")
+        metadata = parsed.get("ResponseMetadata", {})
+        response_bytes = int(
+            (getattr(http_response, "headers", None) or {}).get("content-length", 0)
+        )
+        self._record_call(
+            context,
+            model.name,
+            retries=metadata.get("RetryAttempts", 0),
+            throttled=error_code in THROTTLING_ERROR_CODES,
+            failed=error_code is not None,
+            response_bytes=response_bytes,
+        )
+
+    def _after_call_error(self, exception, context, model=None, **kwargs):
+        # Sent for transport errors (timeouts, resets, unreachable endpoints)
+        # with only `exception` and `context`.
+        operation = model.name if model is not None else None
+        self._record_call(
+            context,
+            operation or context.get("telemetry_operation", "unknown"),
+            failed=True,
+            exception=exception,
+        )
+
+    def _record_call(
+        self,
+        context,
+        operation,
+        retries=0,
+        throttled=False,
+        failed=False,
+        response_bytes=0,
+        exception=None,
+    ):
+        context.pop("telemetry_operation", None)
+        started_at = context.pop("telemetry_started_at", None)
+        if started_at is None:
+            return
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        _end_subsegment(context.pop("telemetry_subsegment", None), exception)
+
+        region = context.get("client_region") or "unknown"
+        with self.lock:
+            stats = self.calls.setdefault((region, operation), _new_call_stats())
+            stats["Latency"].append(round(latency_ms, 3))
+            stats["Calls"] += 1
+            stats["Retries"] += retries
+            stats["Throttles"] += int(throttled)
+            stats["Errors"] += int(failed)
+            stats["RequestBytes"] += context.pop("telemetry_request_bytes", 0)
+            stats["ResponseBytes"] += response_bytes
+            if len(stats["Latency"]) >= MAX_VALUES_PER_RECORD:
+                self._emit_call_stats(
+                    region, operation, self.calls.pop((region, operation))
+                )
+
+    def record_result(self, data, duration_ms):
+        """Emit per-region replication counts and the invocation's totals."""
+        regions = sorted({key.split(".", 1)[0] for key in data if "." in key})
+        for region in regions:
+            self._emit(
+                [["Region"]],
+                {key: "Count" for key in _RESULT_COUNTS},
+                {
+                    "Region": region,
+                    **{key: data.get(f"{region}.{key}", 0) for key in _RESULT_COUNTS},
+                },
+            )
+        self._emit(
+            [[]],
+            {"ReplicationDuration": "Milliseconds", "UnchangedCount": "Count"},
+            {
+                "ReplicationDuration": round(duration_ms, 3),
+                "UnchangedCount": data.get("UnchangedCount", 0),
+            },
+        )
+
+    def flush(self):
+        """Emit every buffered call metric."""
+        with self.lock:
+            calls, self.calls = self.calls, {}
+            for (region, operation), stats in sorted(calls.items()):
+                self._emit_call_stats(region, operation, stats)
+
+    def _emit_call_stats(self, region, operation, stats):
+        self._emit(
+            [["Region", "Operation"]],
+            {metric["Name"]: metric["Unit"] for metric in _CALL_METRICS},
+            {"Region": region, "Operation": operation, **stats},
+        )
+
+    def _emit(self, dimensions, units, values):
+        record = {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [
+                    {
+                        "Namespace": self.namespace,
+                        "Dimensions": dimensions,
+                        "Metrics": [
+                            {"Name": name, "Unit": unit} for name, unit in units.items()
+                        ],
+                    }
+                ],
+            },
+            "FunctionName": os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "local"),
+            **values,
+        }
+        self.emit(json.dumps(record))
+
+
+def _new_call_stats():
+    stats = {metric["Name"]: 0 for metric in _CALL_METRICS}
+    stats["Latency"] = []
+    return stats
+
+
+def _begin_subsegment(operation, region):
+    try:
+        subsegment = xray_recorder.begin_subsegment(f"SSM.{operation}", "aws")
+    except Exception as e:  # Tracing must never fail replication.
+        print(f"X-Ray subsegment not started: {e}")
+        return None
+    if subsegment is not None:
+        subsegment.put_annotation("operation", operation)
+        subsegment.put_annotation("region", region or "unknown")
+    return subsegment
+
+
+def _end_subsegment(subsegment, exception=None):
+    if subsegment is None:
+        return
+    try:
+        if exception is not None:
+            subsegment.add_exception(exception, [])
+        xray_recorder.end_subsegment()
+    except Exception as e:
+        print(f"X-Ray subsegment not closed: {e}")
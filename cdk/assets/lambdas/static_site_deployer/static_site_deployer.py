@@ -0,0 +1,619 @@
+"""Incremental static site deployment custom resource.
+
+The built site arrives as a CDK asset zip. Every file in it is hashed into a
+content manifest, which is diffed against the manifest stored with the
+previous release in the destination bucket. Only new or changed objects are
+uploaded (in parallel) and only objects that disappeared from the site are
+pruned, so a deploy costs roughly as many S3 requests as the change itself.
+
+Each object is uploaded with the Cache-Control header of the first rule whose
+glob matches its path and an explicit Content-Type. Both are recorded in the
+manifest next to the content hash, so changing a rule re-uploads the objects
+it covers even when their content is unchanged.
+
+Precompressed `.br`/`.gz` variants produced by the frontend build are uploaded
+with the matching Content-Encoding and the Content-Type and Cache-Control of
+the file they encode.
+
+When a deploy moves the site to a new key prefix (a new release under
+`releases/<id>/`), files that are unchanged from the previous prefix are
+copied server-side instead of being uploaded again. With `RetainReleases`
+set, releases beyond that many most recently deployed ones are removed after
+the deploy, except the live release and the ones the update replaces. The
+same Lambda serves
+`Custom::StaticSiteReleaseInvalidation`, which invalidates a release's mutable
+paths once CloudFront has switched to it.
+"""
+
+import fnmatch
+import hashlib
+import json
+import mimetypes
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Version 2 records Cache-Control and Content-Type with each hash; a version 1
+# manifest is discarded, so the first deploy re-uploads every object once.
+MANIFEST_VERSION = 2
+
+# DeleteObjects accepts at most 1000 keys per call.
+DELETE_BATCH_SIZE = 1000
+
+UPLOAD_CONCURRENCY = int(os.environ.get("UPLOAD_CONCURRENCY", "8"))
+
+# Past this many changed paths a single wildcard is cheaper and faster to
+# process than listing every path (each path counts toward the monthly quota).
+DEFAULT_MAX_INVALIDATION_PATHS = 20
+
+WILDCARD_INVALIDATION = ["/*"]
+
+RELEASE_INVALIDATION_RESOURCE_TYPE = "Custom::StaticSiteReleaseInvalidation"
+
+# Types the runtime's mimetypes table lacks or names differently.
+CONTENT_TYPES = {
+    ".ico": "image/x-icon",
+    ".js": "text/javascript",
+    ".map": "application/json",
+    ".mjs": "text/javascript",
+    ".webmanifest": "application/manifest+json",
+    ".woff2": "font/woff2",
+}
+
+# Suffixes of the build's precompressed variants and the Content-Encoding each
+# is served with.
+CONTENT_ENCODINGS = {".br": "br", ".gz": "gzip"}
+
+# Textual types are served with an explicit charset so browsers skip sniffing.
+UTF8_CONTENT_TYPES = {
+    "application/json",
+    "application/manifest+json",
+    "image/svg+xml",
+}
+
+# The client lives for the lifetime of the execution environment; its pool
+# is sized to the upload workers so concurrent puts never wait on a socket.
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=max(UPLOAD_CONCURRENCY, 1),
+    retries={"mode": "adaptive", "max_attempts": 5},
+)
+_s3_client = None
+_cloudfront_client = None
+
+
+def lambda_handler(event, context):
+    """CloudFormation onEvent handler for `StaticSiteDeployment` resources."""
+    print("Received event:", json.dumps(event))
+
+    if event.get("ResourceType") == RELEASE_INVALIDATION_RESOURCE_TYPE:
+        return release_invalidation_handler(event)
+
+    request = parse_request(event)
+    s3 = get_s3_client()
+
+    if request["RequestType"] == "Delete":
+        if request["RetainOnDelete"]:
+            message = "Delete - objects retained"
+        else:
+            deleted = remove_release(
+                s3,
+                request["DestinationBucket"],
+                request["DestinationKeyPrefix"],
+                request["ManifestKey"],
+            )
+            message = f"Delete - removed {deleted} object(s)"
+        return {
+            "PhysicalResourceId": request["PhysicalResourceId"],
+            "Data": {"Message": message},
+        }
+
+    try:
+        data = deploy(s3, request)
+    except Exception as e:
+        print(f"Error deploying static site: {e}")
+        # With custom_resources.Provider, raise to signal failure.
+        raise
+
+    print("Deployment result:", json.dumps(data))
+    return {
+        "PhysicalResourceId": request["PhysicalResourceId"],
+        "Data": {"Message": "Deployment complete", **data},
+    }
+
+
+def parse_request(event):
+    """Normalize a custom resource event into the settings a deploy needs."""
+    props = event.get("ResourceProperties", {})
+    bucket = props["DestinationBucket"]
+    prefix = _normalize_prefix(props.get("DestinationKeyPrefix", ""))
+
+    # A new prefix in the same bucket can reuse the objects deployed under
+    # the old one.
+    old_props = event.get("OldResourceProperties") or {}
+    previous_prefix = None
+    if old_props.get("DestinationBucket") == bucket:
+        old_prefix = _normalize_prefix(old_props.get("DestinationKeyPrefix", ""))
+        if old_prefix != prefix:
+            previous_prefix = old_prefix
+
+    # Releases CloudFront may still serve while this request runs, or that a
+    # rollback of it would return to, are never pruned.
+    protected_prefixes = {prefix}
+    for source in (props, old_props):
+        if source.get("LiveKeyPrefix"):
+            protected_prefixes.add(_normalize_prefix(source["LiveKeyPrefix"]))
+    if old_props.get("DestinationBucket") == bucket:
+        protected_prefixes.add(
+            _normalize_prefix(old_props.get("DestinationKeyPrefix", ""))
+        )
+
+    return {
+        "RequestType": event.get("RequestType", "Create"),
+        "RequestId": event.get("RequestId", ""),
+        # Tied to the destination, so moving the site to another bucket or
+        # prefix replaces the resource and cleans up the old location.
+        "PhysicalResourceId": f"static-site-{bucket}/{prefix}",
+        "SourceBucket": props.get("SourceBucket"),
+        "SourceKey": props.get("SourceKey"),
+        "DestinationBucket": bucket,
+        "DestinationKeyPrefix": prefix,
+        "PreviousKeyPrefix": previous_prefix,
+        "ManifestKey": props.get("ManifestKey", ".deploy-manifest.json"),
+        "Prune": _is_true(props.get("Prune", "true")),
+        "CacheControl": [
+            (rule["Pattern"], rule["Value"]) for rule in props.get("CacheControl", [])
+        ],
+        "DefaultCacheControl": props.get("DefaultCacheControl") or None,
+        "DistributionId": props.get("DistributionId"),
+        "InvalidationAliases": props.get("InvalidationAliases") or {},
+        "MaxInvalidationPaths": int(
+            props.get("MaxInvalidationPaths", DEFAULT_MAX_INVALIDATION_PATHS)
+        ),
+        "RetainOnDelete": _is_true(props.get("RetainOnDelete", "false")),
+        "RetainReleases": (
+            int(props["RetainReleases"]) if props.get("RetainReleases") else None
+        ),
+        "ProtectedKeyPrefixes": protected_prefixes,
+    }
+
+
+def deploy(s3, request):
+    """Upload changed files, prune removed ones and store the new manifest.
+
+    The manifest is written last, so a deploy that fails part-way leaves the
+    previous manifest in place and the next deploy retries every change.
+    """
+    bucket = request["DestinationBucket"]
+    prefix = request["DestinationKeyPrefix"]
+    manifest_key = prefix + request["ManifestKey"]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        archive_path = os.path.join(workdir, "source.zip")
+        download_source(s3, request["SourceBucket"], request["SourceKey"], archive_path)
+
+        with zipfile.ZipFile(archive_path) as archive:
+            manifest = build_manifest(
+                archive, request["CacheControl"], request["DefaultCacheControl"]
+            )
+            previous = load_manifest(s3, bucket, manifest_key)
+            changed, removed = diff_manifests(previous, manifest)
+            if not request["Prune"]:
+                removed = []
+
+            copied = []
+            if not previous and request["PreviousKeyPrefix"] is not None:
+                copied = reusable_paths(
+                    load_manifest(
+                        s3,
+                        bucket,
+                        request["PreviousKeyPrefix"] + request["ManifestKey"],
+                    ),
+                    manifest,
+                )
+            copy_objects(s3, bucket, request["PreviousKeyPrefix"], prefix, copied)
+
+            uploaded = sorted(set(changed) - set(copied))
+            upload_files(
+                s3, archive, bucket, prefix, {path: manifest[path] for path in uploaded}
+            )
+
+    delete_objects(s3, bucket, [prefix + path for path in removed])
+    s3.put_object(
+        Bucket=bucket,
+        Key=manifest_key,
+        Body=json.dumps(
+            {"version": MANIFEST_VERSION, "files": manifest}, sort_keys=True
+        ).encode(),
+        ContentType="application/json",
+    )
+
+    data = {
+        "UploadedCount": len(uploaded),
+        "CopiedCount": len(copied),
+        "DeletedCount": len(removed),
+        "UnchangedCount": len(manifest) - len(changed),
+    }
+    if request["RetainReleases"]:
+        data["PrunedReleaseCount"] = prune_releases(
+            s3,
+            bucket,
+            _parent_prefix(prefix),
+            request["RetainReleases"],
+            request["ProtectedKeyPrefixes"],
+            request["ManifestKey"],
+        )
+    # An unchanged release leaves the edge cache alone.
+    if request["DistributionId"] and (changed or removed):
+        paths = invalidation_paths(
+            changed + removed,
+            request["InvalidationAliases"],
+            request["MaxInvalidationPaths"],
+        )
+        print("Invalidating:", json.dumps(paths))
+        data["InvalidatedPathCount"] = len(paths)
+        data["InvalidationId"] = invalidate(
+            get_cloudfront_client(),
+            request["DistributionId"],
+            paths,
+            # Stable across retries of one CloudFormation request, so a
+            # retried deploy does not start a second invalidation.
+            caller_reference=request["RequestId"],
+        )
+    return data
+
+
+def download_source(s3, bucket, key, path):
+    """Download the site asset zip to `path`."""
+    s3.download_file(bucket, key, path)
+
+
+def build_manifest(archive, cache_rules=(), default_cache_control=None):
+    """Return the manifest entry for every file in `archive`, keyed by path.
+
+    An entry holds the file's sha256, its Content-Type, its Content-Encoding
+    for a precompressed variant and, when a rule or the default applies, its
+    Cache-Control header.
+    """
+    manifest = {}
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        digest = hashlib.sha256()
+        with archive.open(info) as source:
+            for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                digest.update(chunk)
+        encoded_path, encoding = split_encoding(info.filename)
+        entry = {
+            "sha256": digest.hexdigest(),
+            "content_type": content_type(encoded_path),
+        }
+        if encoding:
+            entry["content_encoding"] = encoding
+        header = cache_control(encoded_path, cache_rules, default_cache_control)
+        if header:
+            entry["cache_control"] = header
+        manifest[info.filename] = entry
+    return manifest
+
+
+def load_manifest(s3, bucket, key):
+    """Return the manifest entries of the previous release, or {} for a first deploy."""
+    try:
+        response = s3.get_object(Bucket=bucket, Key=key)
+    except ClientError as error:
+        if error.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return {}
+        raise
+    document = json.loads(response["Body"].read())
+    if document.get("version") != MANIFEST_VERSION:
+        # Unknown layout: treat every file as changed rather than guess.
+        return {}
+    return document.get("files", {})
+
+
+def diff_manifests(previous, current):
+    """Return `(changed, removed)` sorted path lists between two manifests."""
+    changed = sorted(
+        path for path, entry in current.items() if previous.get(path) != entry
+    )
+    removed = sorted(set(previous) - set(current))
+    return changed, removed
+
+
+def reusable_paths(base, current):
+    """Return the paths whose manifest entry is identical in `base`."""
+    return sorted(path for path, entry in current.items() if base.get(path) == entry)
+
+
+def copy_objects(s3, bucket, source_prefix, prefix, paths):
+    """Copy `paths` server-side from `source_prefix` to `prefix` concurrently.
+
+    CopyObject keeps the source's metadata, which the manifest entries
+    already matched.
+    """
+    _run_concurrently(
+        "copy",
+        {
+            path: (
+                s3.copy_object,
+                {
+                    "Bucket": bucket,
+                    "Key": prefix + path,
+                    "CopySource": {"Bucket": bucket, "Key": source_prefix + path},
+                },
+            )
+            for path in paths
+        },
+    )
+
+
+def upload_files(s3, archive, bucket, prefix, entries):
+    """Upload the files in `entries` (path to manifest entry) concurrently."""
+    _run_concurrently(
+        "upload",
+        {
+            path: (
+                upload_file,
+                {
+                    "s3": s3,
+                    "archive": archive,
+                    "bucket": bucket,
+                    "prefix": prefix,
+                    "path": path,
+                    "entry": entry,
+                },
+            )
+            for path, entry in entries.items()
+        },
+    )
+
+
+def _run_concurrently(action, calls):
+    """Run `calls` (path to `(function, kwargs)`) on the upload workers.
+
+    Every call is attempted; raises a single error listing all failures so
+    one bad object does not hide the others.
+    """
+    failures = {}
+    with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(function, **kwargs): path
+            for path, (function, kwargs) in calls.items()
+        }
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                failures[futures[future]] = error
+
+    if failures:
+        details = "; ".join(
+            f"{path}: {error}" for path, error in sorted(failures.items())
+        )
+        raise RuntimeError(f"Failed to {action} {len(failures)} object(s): {details}")
+
+
+def upload_file(s3, archive, bucket, prefix, path, entry):
+    """Upload one file, reading it inside the worker so memory stays bounded."""
+    metadata = {"ContentType": entry["content_type"]}
+    if "content_encoding" in entry:
+        metadata["ContentEncoding"] = entry["content_encoding"]
+    if "cache_control" in entry:
+        metadata["CacheControl"] = entry["cache_control"]
+    # ZipFile serializes reads of the underlying file, so workers can share it.
+    s3.put_object(Bucket=bucket, Key=prefix + path, Body=archive.read(path), **metadata)
+
+
+def delete_objects(s3, bucket, keys):
+    """Delete `keys` in DeleteObjects-sized batches, raising on any error."""
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[start : start + DELETE_BATCH_SIZE]
+        response = s3.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+        )
+        errors = response.get("Errors", [])
+        if errors:
+            details = "; ".join(f"{e['Key']}: {e.get('Code')}" for e in errors)
+            raise RuntimeError(f"Failed to delete {len(errors)} object(s): {details}")
+
+
+def remove_release(s3, bucket, prefix, manifest_name):
+    """Delete every object the stored manifest lists, then the manifest itself.
+
+    Only objects this resource deployed are removed; anything else in the
+    bucket is left alone.
+    """
+    manifest_key = prefix + manifest_name
+    files = load_manifest(s3, bucket, manifest_key)
+    keys = [prefix + path for path in sorted(files)]
+    delete_objects(s3, bucket, keys + [manifest_key])
+    return len(keys)
+
+
+def prune_releases(s3, bucket, releases_prefix, retain, protected, manifest_name):
+    """Remove all but the `retain` most recently deployed releases.
+
+    Releases are the prefixes directly under `releases_prefix`, ranked by
+    when their manifest was last written. Prefixes without a manifest (not
+    deployed by this resource) and the `protected` ones are left alone.
+    Returns the number of releases removed.
+    """
+    releases = []
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=bucket, Prefix=releases_prefix, Delimiter="/"
+    ):
+        for common_prefix in page.get("CommonPrefixes", []):
+            prefix = common_prefix["Prefix"]
+            try:
+                head = s3.head_object(Bucket=bucket, Key=prefix + manifest_name)
+            except ClientError as error:
+                if error.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                    continue
+                raise
+            releases.append((head["LastModified"], prefix))
+
+    releases.sort(reverse=True)
+    stale = [prefix for _, prefix in releases[retain:] if prefix not in protected]
+    for prefix in stale:
+        print(f"Pruning release {prefix}")
+        remove_release(s3, bucket, prefix, manifest_name)
+    return len(stale)
+
+
+def invalidation_paths(
+    paths,
+    aliases=None,
+    max_paths=DEFAULT_MAX_INVALIDATION_PATHS,
+    include_variants=False,
+):
+    """Return the viewer paths to invalidate for changed object `paths`.
+
+    Each object is invalidated under its own URL plus any clean-URL
+    `aliases` that serve it (for example `/resume` for `resume.pdf`); a
+    root `index.html` also covers `/`, which the default root object serves.
+    `include_variants` adds a trailing `*` so one path also covers the
+    object's precompressed variants. More than `max_paths` paths collapse
+    into a single `/*` wildcard.
+    """
+    aliases = aliases or {}
+    suffix = "*" if include_variants else ""
+    result = set()
+    for path in paths:
+        result.add("/" + quote(path, safe="/-._~") + suffix)
+        result.update(aliases.get(path, []))
+        if path == "index.html":
+            result.add("/")
+    if len(result) > max_paths:
+        return list(WILDCARD_INVALIDATION)
+    return sorted(result)
+
+
+def release_invalidation_handler(event):
+    """Invalidate the mutable paths of the release CloudFront now serves.
+
+    Runs after the distribution's origin path moved to the release, for a
+    new release and a rollback alike. Objects matching `ImmutablePatterns`
+    have unique names per content and are never stale, so they are skipped.
+    """
+    props = event.get("ResourceProperties", {})
+    physical_id = f"release-invalidation-{props['DistributionId']}"
+    if event.get("RequestType") == "Delete":
+        return {"PhysicalResourceId": physical_id}
+
+    prefix = _normalize_prefix(props.get("ReleaseKeyPrefix", ""))
+    manifest = load_manifest(
+        get_s3_client(),
+        props["Bucket"],
+        prefix + props.get("ManifestKey", ".deploy-manifest.json"),
+    )
+    if not manifest:
+        raise RuntimeError(f"No release manifest found under {prefix}")
+
+    mutable = [
+        path
+        for path in manifest
+        if split_encoding(path)[1] is None
+        and not any(
+            fnmatch.fnmatchcase(path, pattern)
+            for pattern in props.get("ImmutablePatterns", [])
+        )
+    ]
+    paths = invalidation_paths(
+        mutable,
+        props.get("InvalidationAliases") or {},
+        int(props.get("MaxInvalidationPaths", DEFAULT_MAX_INVALIDATION_PATHS)),
+        include_variants=True,
+    )
+    print("Invalidating:", json.dumps(paths))
+    invalidation_id = invalidate(
+        get_cloudfront_client(),
+        props["DistributionId"],
+        paths,
+        caller_reference=event.get("RequestId", ""),
+    )
+    return {
+        "PhysicalResourceId": physical_id,
+        "Data": {
+            "InvalidationId": invalidation_id,
+            "InvalidatedPathCount": len(paths),
+        },
+    }
+
+
+def invalidate(cloudfront, distribution_id, paths, caller_reference):
+    """Start a CloudFront invalidation for `paths` and return its id."""
+    response = cloudfront.create_invalidation(
+        DistributionId=distribution_id,
+        InvalidationBatch={
+            "Paths": {"Quantity": len(paths), "Items": paths},
+            "CallerReference": caller_reference,
+        },
+    )
+    return response["Invalidation"]["Id"]
+
+
+def content_type(path):
+    """Return the Content-Type S3 should serve `path` with."""
+    extension = os.path.splitext(path)[1].lower()
+    guessed = CONTENT_TYPES.get(extension) or mimetypes.guess_type(path)[0]
+    if guessed is None:
+        return "application/octet-stream"
+    if guessed.startswith("text/") or guessed in UTF8_CONTENT_TYPES:
+        return f"{guessed}; charset=utf-8"
+    return guessed
+
+
+def split_encoding(path):
+    """Split a precompressed variant's path into `(encoded_path, encoding)`.
+
+    Returns `(path, None)` for files that are not a variant.
+    """
+    stem, extension = os.path.splitext(path)
+    encoding = CONTENT_ENCODINGS.get(extension)
+    if encoding is None or not os.path.splitext(stem)[1]:
+        return path, None
+    return stem, encoding
+
+
+def cache_control(path, rules, default=None):
+    """Return the Cache-Control of the first `(glob, header)` rule matching `path`."""
+    for pattern, header in rules:
+        if fnmatch.fnmatchcase(path, pattern):
+            return header
+    return default
+
+
+def get_s3_client():
+    """Return the S3 client cached for the execution environment."""
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client("s3", config=S3_CLIENT_CONFIG)
+    return _s3_client
+
+
+def get_cloudfront_client():
+    """Return the CloudFront client cached for the execution environment."""
+    global _cloudfront_client
+    if _cloudfront_client is None:
+        _cloudfront_client = boto3.client("cloudfront")
+    return _cloudfront_client
+
+
+def _normalize_prefix(prefix):
+    prefix = prefix.strip("/")
+    return f"{prefix}/" if prefix else ""
+
+
+def _parent_prefix(prefix):
+    return _normalize_prefix(prefix.rstrip("/").rpartition("/")[0])
+
+
+def _is_true(value):
+    return str(value).lower() == "true"
@@ -0,0 +1,331 @@
+"""Synthetic time-to-first-byte probe for the website.
+
+Each invocation fetches a fixed set of pages through CloudFront from the
+Lambda's region and records DNS, TCP connect, TLS, time-to-first-byte and
+total time per request as CloudWatch Embedded Metric Format (EMF) metrics.
+A `{bundle}` path stands for the first hashed script the home page loads,
+so a real Vite bundle is probed however often its name changes.
+
+With `PROBE_BACKUP` enabled the same pages are also fetched straight from
+the backup bucket -- the failover origin -- through presigned URLs, timing
+the path a viewer takes when the primary origin fails.
+
+Only the standard library is needed for probing; boto3 (in the Lambda
+runtime) is imported to presign backup requests and read the backup bucket
+name from SSM.
+"""
+
+import gzip
+import http.client
+import json
+import os
+import re
+import socket
+import ssl
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from urllib.parse import urljoin, urlsplit
+
+METRIC_NAMESPACE = os.environ.get("METRIC_NAMESPACE", "WebsiteProbe")
+TARGET_URL = os.environ.get("TARGET_URL", "")
+PROBE_PATHS = json.loads(os.environ.get("PROBE_PATHS", '["/", "{bundle}", "/resume"]'))
+PROBE_TIMEOUT = float(os.environ.get("PROBE_TIMEOUT", "10"))
+
+# Backup origin settings; see `backup_urls`.
+PROBE_BACKUP = os.environ.get("PROBE_BACKUP", "false").lower() == "true"
+BACKUP_BUCKET_PARAM = os.environ.get("BACKUP_BUCKET_PARAM", "")
+BACKUP_BUCKET_REGION = os.environ.get("BACKUP_BUCKET_REGION", "us-east-1")
+BACKUP_ORIGIN_PATH = os.environ.get("BACKUP_ORIGIN_PATH", "")
+BACKUP_REWRITES = json.loads(os.environ.get("BACKUP_REWRITES", "{}"))
+DEFAULT_ROOT_OBJECT = "index.html"
+
+BUNDLE_PLACEHOLDER = "{bundle}"
+# Vite fingerprints every bundle it emits under /assets/.
+BUNDLE_PATTERN = re.compile(r"""(?:src|href)=["'](/assets/[^"']+\.js)["']""")
+
+USER_AGENT = "website-ttfb-probe/1"
+
+_TIMING_METRICS = [
+    {"Name": "DnsTime", "Unit": "Milliseconds"},
+    {"Name": "ConnectTime", "Unit": "Milliseconds"},
+    {"Name": "TlsTime", "Unit": "Milliseconds"},
+    {"Name": "TimeToFirstByte", "Unit": "Milliseconds"},
+    {"Name": "TotalTime", "Unit": "Milliseconds"},
+    {"Name": "Success", "Unit": "Count"},
+]
+
+
+@dataclass
+class ProbeResult:
+    """Timings of one request, in milliseconds from the previous phase."""
+
+    url: str
+    status: int | None = None
+    dns_ms: float | None = None
+    connect_ms: float | None = None
+    tls_ms: float | None = None
+    ttfb_ms: float | None = None
+    total_ms: float | None = None
+    bytes: int = 0
+    pop: str | None = None
+    cache: str | None = None
+    content_encoding: str | None = None
+    error: str | None = None
+    body: bytes = b""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+
+def probe(url, headers=None, timeout=PROBE_TIMEOUT, ssl_context=None):
+    """Fetch `url` once over a new connection and time each phase.
+
+    DNS, connect and TLS are measured around `getaddrinfo`, the TCP connect
+    and the handshake. Time to first byte runs from sending the request to
+    the parsed status line and headers; total time runs from the DNS lookup
+    to the last body byte. Failures are recorded in `error`, never raised.
+    """
+    parts = urlsplit(url)
+    https = parts.scheme == "https"
+    port = parts.port or (443 if https else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    result = ProbeResult(url=url)
+    sock = None
+    started_at = time.perf_counter()
+    try:
+        addresses = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+        resolved_at = time.perf_counter()
+        result.dns_ms = _elapsed_ms(started_at, resolved_at)
+
+        family, socktype, proto, _, address = addresses[0]
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(timeout)
+        sock.connect(address)
+        connected_at = time.perf_counter()
+        result.connect_ms = _elapsed_ms(resolved_at, connected_at)
+
+        if https:
+            context = ssl_context or ssl.create_default_context()
+            sock = context.wrap_socket(sock, server_hostname=parts.hostname)
+            handshaken_at = time.perf_counter()
+            result.tls_ms = _elapsed_ms(connected_at, handshaken_at)
+
+        connection = (
+            http.client.HTTPSConnection if https else http.client.HTTPConnection
+        )(parts.hostname, port, timeout=timeout)
+        connection.sock = sock
+        connection.putrequest("GET", target, skip_accept_encoding=True)
+        for name, value in {
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": "br, gzip",
+            "Connection": "close",
+            **(headers or {}),
+        }.items():
+            connection.putheader(name, value)
+        connection.endheaders()
+        sent_at = time.perf_counter()
+        response = connection.getresponse()
+        result.ttfb_ms = _elapsed_ms(sent_at, time.perf_counter())
+        result.body = response.read()
+        result.total_ms = _elapsed_ms(started_at, time.perf_counter())
+        result.status = response.status
+        result.bytes = len(result.body)
+        result.pop = response.getheader("X-Amz-Cf-Pop")
+        result.cache = response.getheader("X-Cache")
+        result.content_encoding = response.getheader("Content-Encoding")
+    except (OSError, http.client.HTTPException) as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+    finally:
+        if sock is not None:
+            sock.close()
+    return result
+
+
+def _elapsed_ms(start, end):
+    return round((end - start) * 1000, 3)
+
+
+def decoded_body(result):
+    """The response body without its content coding, or None.
+
+    Brotli is not in the standard library, so `br` bodies return None.
+    """
+    encoding = (result.content_encoding or "identity").strip().lower()
+    try:
+        if encoding == "identity":
+            return result.body
+        if encoding in ("gzip", "x-gzip"):
+            return gzip.decompress(result.body)
+        if encoding == "deflate":
+            return zlib.decompress(result.body)
+    except (OSError, EOFError, zlib.error):
+        pass
+    return None
+
+
+def find_bundle_path(html):
+    """The first fingerprinted script a page references, or None."""
+    match = BUNDLE_PATTERN.search(html.decode("utf-8", "replace"))
+    return match.group(1) if match else None
+
+
+def resolve_paths(paths, home_page, fetch_identity=None):
+    """Replace the `{bundle}` placeholder using the fetched home page.
+
+    The home page is timed as viewers fetch it, compressed. When its body
+    cannot be decoded here, `fetch_identity()` fetches it again
+    uncompressed for discovery only. The placeholder is dropped when the
+    home page did not load or has no fingerprinted script.
+    """
+    bundle = None
+    if home_page.ok:
+        html = decoded_body(home_page)
+        if html is None and fetch_identity is not None:
+            identity_page = fetch_identity()
+            html = decoded_body(identity_page) if identity_page.ok else None
+        bundle = find_bundle_path(html) if html is not None else None
+    resolved = []
+    for path in paths:
+        if path == BUNDLE_PLACEHOLDER:
+            if bundle is None:
+                continue
+            path = bundle
+        resolved.append(path)
+    return resolved
+
+
+def object_key(path, rewrites=None, origin_path=""):
+    """The backup bucket key CloudFront would request for viewer `path`."""
+    path = (rewrites or {}).get(path, path)
+    key = path.lstrip("/") or DEFAULT_ROOT_OBJECT
+    prefix = origin_path.strip("/")
+    return f"{prefix}/{key}" if prefix else key
+
+
+def run_probes(
+    base_url,
+    paths,
+    origin="primary",
+    backup_url_for=None,
+    ssl_context=None,
+):
+    """Probe every path and return `{(origin, path): ProbeResult}`.
+
+    `/` is always fetched first to resolve `{bundle}`. `backup_url_for` maps
+    a viewer path to the URL of its object in the backup origin; when given,
+    every path is probed there too.
+    """
+    results = {}
+    home_page = probe(urljoin(base_url, "/"), ssl_context=ssl_context)
+
+    def fetch_identity():
+        return probe(
+            urljoin(base_url, "/"),
+            headers={"Accept-Encoding": "identity"},
+            ssl_context=ssl_context,
+        )
+
+    for path in resolve_paths(paths, home_page, fetch_identity):
+        results[(origin, path)] = (
+            home_page
+            if path == "/"
+            else probe(urljoin(base_url, path), ssl_context=ssl_context)
+        )
+    if backup_url_for is not None:
+        for _, path in list(results):
+            results[("backup", path)] = probe(
+                backup_url_for(path), ssl_context=ssl_context
+            )
+    return results
+
+
+def emf_record(origin, path, result, region, timestamp_ms=None):
+    """The EMF log line for one probe result."""
+    timings = {
+        "DnsTime": result.dns_ms,
+        "ConnectTime": result.connect_ms,
+        "TlsTime": result.tls_ms,
+        "TimeToFirstByte": result.ttfb_ms,
+        "TotalTime": result.total_ms,
+    }
+    metrics = [
+        metric
+        for metric in _TIMING_METRICS
+        if metric["Name"] == "Success" or timings.get(metric["Name"]) is not None
+    ]
+    record = {
+        "_aws": {
+            "Timestamp": timestamp_ms or int(time.time() * 1000),
+            "CloudWatchMetrics": [
+                {
+                    "Namespace": METRIC_NAMESPACE,
+                    "Dimensions": [["ProbeRegion", "Origin", "Path"]],
+                    "Metrics": metrics,
+                }
+            ],
+        },
+        "ProbeRegion": region,
+        "Origin": origin,
+        "Path": path,
+        "Success": 1 if result.ok else 0,
+        **{name: value for name, value in timings.items() if value is not None},
+    }
+    details = asdict(result)
+    del details["body"]
+    # Presigned URLs carry a signature; log the path only.
+    details["url"] = details["url"].split("?", 1)[0]
+    record["Result"] = details
+    return json.dumps(record)
+
+
+def backup_urls():
+    """Presigned GET URLs for viewer paths in the backup bucket."""
+    import boto3
+
+    bucket = boto3.client("ssm", region_name=BACKUP_BUCKET_REGION).get_parameter(
+        Name=BACKUP_BUCKET_PARAM
+    )["Parameter"]["Value"]
+    s3 = boto3.client("s3", region_name=BACKUP_BUCKET_REGION)
+
+    def url_for(path):
+        return s3.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": bucket,
+                "Key": object_key(path, BACKUP_REWRITES, BACKUP_ORIGIN_PATH),
+            },
+            ExpiresIn=300,
+        )
+
+    return url_for
+
+
+def lambda_handler(event, context):
+    """Scheduled handler. `{"probe_backup": true}` in the event forces the
+    backup origin probes on for one run."""
+    event = event or {}
+    probe_backup = bool(event.get("probe_backup", PROBE_BACKUP))
+    region = os.environ.get("AWS_REGION", "local")
+
+    results = run_probes(
+        TARGET_URL,
+        PROBE_PATHS,
+        backup_url_for=backup_urls() if probe_backup else None,
+    )
+    for (origin, path), result in results.items():
+        print(emf_record(origin, path, result, region))
+
+    failures = sorted(
+        f"{origin}:{path}"
+        for (origin, path), result in results.items()
+        if not result.ok
+    )
+    return {
+        "ProbedCount": len(results),
+        "FailedCount": len(failures),
+        "Failures": failures,
+    }
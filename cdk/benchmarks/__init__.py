@@ -0,0 +1,16 @@
+"""Local benchmarks for the Lambda handlers shipped with the CDK app.
+
+Benchmarks run the real handler code against local stand-ins, so they need
+no AWS account. Run them from the ``cdk`` directory, for example
+``python -m benchmarks.client_reuse``.
+"""
+
+from pathlib import Path
+import sys
+
+LAMBDAS_DIR = Path(__file__).resolve().parents[1] / "assets" / "lambdas"
+REPLICATOR_LAMBDA_DIR = LAMBDAS_DIR / "ssm_param_replicator"
+DEPLOYER_LAMBDA_DIR = LAMBDAS_DIR / "static_site_deployer"
+for path in (REPLICATOR_LAMBDA_DIR, DEPLOYER_LAMBDA_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,289 @@
+"""Cache efficiency report for downloaded CloudFront access logs.
+
+Streams standard log files (v2 Parquet from `CloudFrontAccessLogs`, or JSON
+lines and W3C text, optionally gzipped) and reports:
+
+- hit, miss, error and other ratios from ``x-edge-result-type``, and the
+  origin fetch ratio (misses and refresh hits, which both reach the origin);
+- p50/p95/p99 ``time-taken`` and ``time-to-first-byte``;
+- the paths (``cs-uri-stem``) with the most misses.
+
+Memory stays bounded however large the log set is: files are read one at a
+time in chunks of ``--chunk-size`` rows, latencies go into fixed log-scale
+histograms (percentiles within 1%), and miss counts are kept for at most
+``--max-tracked-paths`` paths. Past that, rarely missed paths are evicted and
+the top paths' counts become lower bounds; the report says so.
+
+    aws s3 sync s3://<log bucket>/ logs/
+    python -m benchmarks.access_log_report logs/ --top 20 --output report.json
+
+Reading Parquet needs pyarrow (``pip install pyarrow``); the text formats
+need only the standard library.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Mapping
+
+RESULT_CATEGORIES = {
+    "Hit": "hit",
+    "RefreshHit": "hit",
+    "OriginShieldHit": "hit",
+    "Miss": "miss",
+    "Error": "error",
+    "LimitExceeded": "error",
+    "CapacityExceeded": "error",
+}
+# Result types whose request reached the origin.
+ORIGIN_FETCH_RESULT_TYPES = frozenset({"Miss", "RefreshHit"})
+REPORT_FIELDS = (
+    "x-edge-result-type",
+    "cs-uri-stem",
+    "time-taken",
+    "time-to-first-byte",
+)
+
+# Relative width of a latency histogram bucket.
+HISTOGRAM_PRECISION = 0.01
+
+
+class LatencyHistogram:
+    """Log-scale histogram of durations with bounded memory."""
+
+    def __init__(self, precision: float = HISTOGRAM_PRECISION) -> None:
+        self._log_base = math.log1p(precision)
+        self._buckets: Counter[int] = Counter()
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        # Durations are logged in milliseconds at best, so sub-millisecond
+        # values share the lowest bucket.
+        milliseconds = max(seconds * 1000, 1.0)
+        self._buckets[int(math.log(milliseconds) / self._log_base)] += 1
+        self.count += 1
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the `fraction` percentile in milliseconds."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                # Middle of the bucket, within `precision` of any value in it.
+                return math.exp((bucket + 0.5) * self._log_base)
+        raise AssertionError("unreachable")
+
+
+class TopCounter:
+    """Counts keys, keeping at most `capacity` of the most frequent ones."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.approximate = False
+        self._counts: Counter[str] = Counter()
+
+    def add(self, key: str) -> None:
+        self._counts[key] += 1
+        # Prune in batches, so eviction costs O(1) amortized per key.
+        if len(self._counts) > 2 * self.capacity:
+            self._counts = Counter(dict(self._counts.most_common(self.capacity)))
+            self.approximate = True
+
+    def most_common(self, count: int) -> list[tuple[str, int]]:
+        return self._counts.most_common(count)
+
+
+class AccessLogReport:
+    """Aggregates log records into cache efficiency metrics."""
+
+    def __init__(self, max_tracked_paths: int = 10_000) -> None:
+        self.requests = 0
+        self.result_types: Counter[str] = Counter()
+        self.time_taken = LatencyHistogram()
+        self.time_to_first_byte = LatencyHistogram()
+        self.missed_paths = TopCounter(max_tracked_paths)
+
+    def add(self, record: Mapping[str, object]) -> None:
+        result_type = _text(record.get("x-edge-result-type")) or "-"
+        self.requests += 1
+        self.result_types[result_type] += 1
+        if result_type == "Miss":
+            self.missed_paths.add(_text(record.get("cs-uri-stem")) or "-")
+        for histogram, field in (
+            (self.time_taken, "time-taken"),
+            (self.time_to_first_byte, "time-to-first-byte"),
+        ):
+            seconds = _number(record.get(field))
+            if seconds is not None:
+                histogram.add(seconds)
+
+    def summary(self, top: int = 10) -> dict:
+        categories: Counter[str] = Counter()
+        for result_type, count in self.result_types.items():
+            categories[RESULT_CATEGORIES.get(result_type, "other")] += count
+        origin_fetches = sum(
+            self.result_types[result_type] for result_type in ORIGIN_FETCH_RESULT_TYPES
+        )
+
+        def ratio(count: int) -> float:
+            return round(count / self.requests, 4) if self.requests else 0.0
+
+        def percentiles(histogram: LatencyHistogram) -> dict:
+            return {
+                f"p{round(fraction * 100)}_ms": (
+                    None if value is None else round(value, 1)
+                )
+                for fraction in (0.50, 0.95, 0.99)
+                for value in [histogram.percentile(fraction)]
+            }
+
+        return {
+            "requests": self.requests,
+            "hit_ratio": ratio(categories["hit"]),
+            "miss_ratio": ratio(categories["miss"]),
+            "error_ratio": ratio(categories["error"]),
+            "other_ratio": ratio(categories["other"]),
+            "origin_fetch_ratio": ratio(origin_fetches),
+            "result_types": dict(self.result_types.most_common()),
+            "time_taken": percentiles(self.time_taken),
+            "time_to_first_byte": percentiles(self.time_to_first_byte),
+            "top_missed_paths": [
+                {"path": path, "misses": misses}
+                for path, misses in self.missed_paths.most_common(top)
+            ],
+            "top_missed_paths_approximate": self.missed_paths.approximate,
+        }
+
+
+def _text(value: object) -> str | None:
+    if value is None or value == "-":
+        return None
+    return str(value)
+
+
+def _number(value: object) -> float | None:
+    if value is None or value == "-" or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def log_files(paths: Iterable[Path]) -> Iterator[Path]:
+    """Every log file under `paths`, in a stable order, skipping dotfiles."""
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(
+                file
+                for file in path.rglob("*")
+                if file.is_file() and not file.name.startswith(".")
+            )
+        else:
+            yield path
+
+
+def read_records(
+    path: Path, chunk_size: int = 65_536
+) -> Iterator[Mapping[str, object]]:
+    """Stream the records of one log file, whatever its format."""
+    if ".parquet" in path.suffixes:
+        yield from _read_parquet(path, chunk_size)
+        return
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8", newline="") as lines:
+        yield from _read_text(lines)
+
+
+def _read_parquet(path: Path, chunk_size: int) -> Iterator[Mapping[str, object]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError(
+            f"Reading {path} needs pyarrow: pip install pyarrow"
+        ) from exc
+
+    parquet_file = pq.ParquetFile(path)
+    columns = [
+        name for name in parquet_file.schema_arrow.names if name in REPORT_FIELDS
+    ]
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        data = batch.to_pydict()
+        for values in zip(*data.values()):
+            yield dict(zip(data, values))
+
+
+def _read_text(lines: IO[str]) -> Iterator[Mapping[str, object]]:
+    """Read JSON lines or W3C (tab-separated, with a #Fields header) logs."""
+    fields: list[str] | None = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        if line.startswith("{"):
+            yield json.loads(line)
+        elif line.startswith("#Fields:"):
+            fields = line.removeprefix("#Fields:").split()
+        elif line.startswith("#"):
+            continue
+        elif fields is not None:
+            yield dict(zip(fields, line.split("\t")))
+        else:
+            raise ValueError(f"{getattr(lines, 'name', 'log')}: no #Fields header")
+
+
+def build_report(
+    paths: Iterable[Path], chunk_size: int = 65_536, max_tracked_paths: int = 10_000
+) -> AccessLogReport:
+    report = AccessLogReport(max_tracked_paths)
+    for path in log_files(paths):
+        for record in read_records(path, chunk_size):
+            report.add(record)
+    return report
+
+
+def print_summary(summary: dict, output: IO[str] = sys.stdout) -> None:
+    print(f"requests            {summary['requests']}", file=output)
+    for name in ("hit", "miss", "error", "other", "origin_fetch"):
+        print(f"{name + ' ratio':<20}{summary[f'{name}_ratio']:.2%}", file=output)
+    for name in ("time_taken", "time_to_first_byte"):
+        values = " ".join(
+            f"{key.removesuffix('_ms')} {'-' if value is None else f'{value:.1f}'} ms"
+            for key, value in summary[name].items()
+        )
+        print(f"{name:<20}{values}", file=output)
+    approximate = " (approximate)" if summary["top_missed_paths_approximate"] else ""
+    print(f"\ntop missed paths{approximate}", file=output)
+    for entry in summary["top_missed_paths"]:
+        print(f"{entry['misses']:>10}  {entry['path']}", file=output)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", type=Path, help="log files or directories")
+    parser.add_argument("--top", type=int, default=10, help="missed paths to list")
+    parser.add_argument("--chunk-size", type=int, default=65_536)
+    parser.add_argument("--max-tracked-paths", type=int, default=10_000)
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = build_report(args.paths, args.chunk_size, args.max_tracked_paths)
+    summary = report.summary(args.top)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(summary, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Per-invocation overhead of the SSM replicator with and without client reuse.
+
+Runs the real ``lambda_handler`` repeatedly against a local SSM stand-in.
+The "cold" run clears the module-level client cache before every invocation,
+which is what the handler did before clients were cached; the "warm" run
+keeps the cache, as a warm Lambda execution environment would.
+
+    python -m benchmarks.client_reuse --invocations 200 --latency 0.002
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+
+from benchmarks import ssm_stub
+
+import ssm_param_replicator
+
+SOURCE_REGION = "us-east-1"
+TARGET_REGIONS = ["us-east-2", "us-west-2"]
+PARAMETERS = [f"/Benchmark/param-{index}" for index in range(5)]
+
+
+def _event() -> dict:
+    return {
+        "RequestType": "Update",
+        "ResourceProperties": {
+            "Parameters": [{"source": name, "target": name} for name in PARAMETERS],
+            "SourceRegion": SOURCE_REGION,
+            "TargetRegions": TARGET_REGIONS,
+        },
+    }
+
+
+def _time_invocations(invocations: int, reuse_clients: bool) -> list[float]:
+    ssm_param_replicator._ssm_clients.clear()
+    ssm_param_replicator._ssm_write_clients.clear()
+    samples = []
+    for _ in range(invocations):
+        if not reuse_clients:
+            ssm_param_replicator._ssm_clients.clear()
+            ssm_param_replicator._ssm_write_clients.clear()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ssm_param_replicator.lambda_handler(_event(), None)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run(invocations: int, latency: float) -> None:
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+    with ssm_stub.SSMStubServer(latency=latency) as stub:
+        os.environ["AWS_ENDPOINT_URL_SSM"] = stub.endpoint_url
+        for region in [SOURCE_REGION, *TARGET_REGIONS]:
+            for name in PARAMETERS:
+                stub.put(region, name, "value")
+
+        # One untimed invocation loads botocore's service models.
+        _time_invocations(1, reuse_clients=False)
+
+        print(f"{'mode':<6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'conns':>7}")
+        for label, reuse in (("cold", False), ("warm", True)):
+            stub.reset_stats()
+            samples = _time_invocations(invocations, reuse_clients=reuse)
+            print(
+                f"{label:<6} {statistics.mean(samples) * 1000:>9.2f}"
+                f" {_percentile(samples, 0.5) * 1000:>9.2f}"
+                f" {_percentile(samples, 0.95) * 1000:>9.2f}"
+                f" {stub.connections:>7}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--invocations", type=int, default=100)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="seconds of simulated latency per SSM API call",
+    )
+    args = parser.parse_args()
+    run(args.invocations, args.latency)
+
+
+if __name__ == "__main__":
+    main()
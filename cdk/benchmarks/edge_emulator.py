@@ -0,0 +1,658 @@
+"""Local emulator of the website distribution's request path.
+
+Reads a synthesized `Website` template from ``cdk.out`` and answers requests
+the way `CloudFrontDistribution` configures CloudFront to:
+
+- picks the cache behavior by matching the viewer URI against the path
+  patterns, then runs its viewer-request CloudFront Function under node, with
+  the function's KeyValueStore loaded from the store's import source asset;
+- applies the default root object and reads the object under the origin path
+  from on-disk primary and backup "buckets". Missing objects return 403, as
+  S3 does behind Origin Access Control without ``s3:ListBucket``;
+- fails over to the backup origin on the origin group's failover status codes;
+- replaces error statuses with the custom error response page;
+- adds the response headers policy's security, CORS and custom headers.
+
+Objects carry the Content-Type, Content-Encoding and Cache-Control the static
+site deployer uploads them with, using the template's deployment rules. Edge
+caching and on-the-fly compression are not emulated: every request reaches an
+origin, as on a cache miss.
+
+Faults are injected per origin with `OriginFault`: a fixed latency per fetch
+and/or a status code returned instead of the object with some probability.
+
+    python -m benchmarks.edge_emulator --template cdk.out/Website.template.json \\
+        --primary ../frontend/dist --ignore-origin-path \\
+        --fault primary=503:0.5 --port 8080
+
+`EdgeEmulatorServer` serves the emulator over local HTTP; see
+`benchmarks.edge_load` for the load generator.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, unquote
+
+import static_site_deployer
+
+# What S3 returns behind OAC for a key with no object. The emulator also
+# returns it for directories and paths outside the bucket directory.
+MISSING_OBJECT_STATUS = 403
+
+# Prints "ready", then reads JSON events from stdin, one per line, and writes
+# the function's result for each. `cf.kvs()` is backed by the store passed as
+# argv[1].
+_FUNCTION_RUNNER = r"""
+const readline = require("readline");
+const store = JSON.parse(process.argv[1]);
+const cf = {
+  kvs: () => ({
+    get: async (key) => {
+      if (!Object.prototype.hasOwnProperty.call(store, key)) {
+        throw new Error("Key not found");
+      }
+      return store[key];
+    },
+  }),
+};
+const handler = new Function("cf", process.argv[2] + "\nreturn handler;")(cf);
+process.stdout.write("ready\n");
+readline.createInterface({ input: process.stdin }).on("line", async (line) => {
+  let result;
+  try {
+    result = { ok: await handler(JSON.parse(line)) };
+  } catch (err) {
+    result = { error: String(err) };
+  }
+  process.stdout.write(JSON.stringify(result) + "\n");
+});
+"""
+
+
+@dataclass(frozen=True)
+class OriginFault:
+    """Fault injected into every fetch from one origin."""
+
+    status: int | None = None
+    probability: float = 1.0
+    latency: float = 0.0
+
+    @classmethod
+    def parse(cls, value: str) -> "OriginFault":
+        """Parse ``STATUS[:PROBABILITY][@LATENCY_MS]``, e.g. ``503:0.1@20``."""
+        spec, _, latency_ms = value.partition("@")
+        status, _, probability = spec.partition(":")
+        return cls(
+            status=int(status) if status else None,
+            probability=float(probability) if probability else 1.0,
+            latency=float(latency_ms) / 1000 if latency_ms else 0.0,
+        )
+
+
+@dataclass
+class EdgeResponse:
+    """A response as the viewer receives it, with emulator timings."""
+
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    origin: str | None = None
+    failed_over: bool = False
+    function_ms: float = 0.0
+    origin_ms: float = 0.0
+
+
+@dataclass(frozen=True)
+class _Behavior:
+    path_pattern: str | None
+    function_id: str | None
+
+
+@dataclass
+class _Origin:
+    name: str
+    root: Path
+    path: str
+    fault: OriginFault | None = None
+
+
+@dataclass
+class _Fetch:
+    status: int
+    key: str
+    body: bytes = b""
+    origin: str | None = None
+    failed_over: bool = False
+    seconds: float = 0.0
+
+
+@dataclass
+class _DistributionConfig:
+    behaviors: list[_Behavior]
+    default_behavior: _Behavior
+    default_root_object: str | None
+    failover_statuses: frozenset[int]
+    error_responses: dict[int, tuple[str, int]]
+    origin_paths: tuple[str, str]
+    response_headers: dict[str, Any]
+    function_code: dict[str, str] = field(default_factory=dict)
+    key_value_stores: dict[str, dict[str, str]] = field(default_factory=dict)
+    cache_rules: list[tuple[str, str]] = field(default_factory=list)
+    default_cache_control: str | None = None
+
+
+class FunctionRunner:
+    """A persistent node process running one CloudFront Function."""
+
+    def __init__(self, code: str, store: dict[str, str]) -> None:
+        node = shutil.which("node")
+        if node is None:
+            raise RuntimeError("node is required to run CloudFront Functions")
+        # node has no `cloudfront` module; the runner passes in `cf` instead.
+        code = code.replace("import cf from 'cloudfront';", "")
+        self._process = subprocess.Popen(
+            [node, "-e", _FUNCTION_RUNNER, json.dumps(store), code],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        # Wait for node to start, so its start-up is not timed as a request.
+        self._process.stdout.readline()
+
+    def run(self, event: dict) -> dict:
+        """Run the handler on `event` and return the request or response."""
+        self._process.stdin.write(json.dumps(event) + "\n")
+        self._process.stdin.flush()
+        result = json.loads(self._process.stdout.readline())
+        if "error" in result:
+            raise RuntimeError(f"CloudFront Function failed: {result['error']}")
+        return result["ok"]
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        self._process.wait()
+
+
+class EdgeEmulator:
+    """The distribution's request path served from on-disk buckets."""
+
+    def __init__(
+        self,
+        template_path: str | Path,
+        primary_root: str | Path,
+        backup_root: str | Path | None = None,
+        faults: dict[str, OriginFault] | None = None,
+        ignore_origin_path: bool = False,
+        function_workers: int = 4,
+        seed: int = 0,
+    ) -> None:
+        faults = faults or {}
+        self.config = load_distribution_config(Path(template_path))
+        primary_path, backup_path = (
+            ("", "") if ignore_origin_path else self.config.origin_paths
+        )
+        self.origins = {
+            "primary": _Origin(
+                "primary", Path(primary_root), primary_path, faults.get("primary")
+            ),
+            "backup": _Origin(
+                "backup",
+                Path(backup_root or primary_root),
+                backup_path,
+                faults.get("backup"),
+            ),
+        }
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        # One pool of node processes per function; each serves one event at
+        # a time.
+        self._runners: dict[str, queue.Queue[FunctionRunner]] = {}
+        for function_id, code in self.config.function_code.items():
+            pool: queue.Queue[FunctionRunner] = queue.Queue()
+            store = self.config.key_value_stores.get(function_id, {})
+            for _ in range(function_workers):
+                pool.put(FunctionRunner(code, store))
+            self._runners[function_id] = pool
+
+    def __enter__(self) -> "EdgeEmulator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for pool in self._runners.values():
+            while not pool.empty():
+                pool.get_nowait().close()
+
+    def handle(
+        self, uri: str, headers: dict[str, str] | None = None, method: str = "GET"
+    ) -> EdgeResponse:
+        """Answer one viewer request for `uri` (path and optional query string)."""
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        path, _, query = uri.partition("?")
+        behavior = self._behavior_for(path)
+
+        function_ms = 0.0
+        if behavior.function_id is not None:
+            event = {
+                "version": "1.0",
+                "context": {"eventType": "viewer-request"},
+                "viewer": {"ip": "127.0.0.1"},
+                "request": {
+                    "method": method,
+                    "uri": path,
+                    "querystring": {
+                        name: {"value": value}
+                        for name, value in parse_qsl(query, keep_blank_values=True)
+                    },
+                    "headers": {
+                        name: {"value": value} for name, value in headers.items()
+                    },
+                    "cookies": {},
+                },
+            }
+            started_at = time.perf_counter()
+            result = self._run_function(behavior.function_id, event)
+            function_ms = (time.perf_counter() - started_at) * 1000
+            if "statusCode" in result:
+                # The function answered; no origin is involved.
+                return EdgeResponse(
+                    status=int(result["statusCode"]),
+                    headers={
+                        name: header["value"]
+                        for name, header in result.get("headers", {}).items()
+                    },
+                    body=b"",
+                    function_ms=function_ms,
+                )
+            path = result["uri"]
+
+        if path == "/" and self.config.default_root_object:
+            path = "/" + self.config.default_root_object
+
+        fetch = self._fetch(path)
+        origin_ms = fetch.seconds * 1000
+        status = fetch.status
+        if status in self.config.error_responses:
+            page_path, response_code = self.config.error_responses[status]
+            page = self._fetch(page_path)
+            origin_ms += page.seconds * 1000
+            if page.status == 200:
+                fetch = page
+                status = response_code
+
+        response_headers = self._object_headers(fetch) if fetch.status == 200 else {}
+        response_headers.update(self._policy_headers(headers, response_headers))
+        return EdgeResponse(
+            status=status,
+            headers=response_headers,
+            body=b"" if method == "HEAD" else fetch.body,
+            origin=fetch.origin,
+            failed_over=fetch.failed_over,
+            function_ms=function_ms,
+            origin_ms=origin_ms,
+        )
+
+    def _behavior_for(self, path: str) -> _Behavior:
+        for behavior in self.config.behaviors:
+            if fnmatchcase(path, behavior.path_pattern):
+                return behavior
+        return self.config.default_behavior
+
+    def _run_function(self, function_id: str, event: dict) -> dict:
+        pool = self._runners[function_id]
+        runner = pool.get()
+        try:
+            return runner.run(event)
+        finally:
+            pool.put(runner)
+
+    def _fetch(self, path: str) -> _Fetch:
+        """Fetch `path` through the origin group."""
+        started_at = time.perf_counter()
+        fetch = self._fetch_from(self.origins["primary"], path)
+        if fetch.status in self.config.failover_statuses:
+            fetch = self._fetch_from(self.origins["backup"], path)
+            fetch.failed_over = True
+        fetch.seconds = time.perf_counter() - started_at
+        return fetch
+
+    def _fetch_from(self, origin: _Origin, path: str) -> _Fetch:
+        key = unquote(path).lstrip("/")
+        fault = origin.fault
+        if fault is not None:
+            if fault.latency:
+                time.sleep(fault.latency)
+            with self._random_lock:
+                hit = self._random.random() < fault.probability
+            if fault.status is not None and hit:
+                return _Fetch(fault.status, key, origin=origin.name)
+
+        root = origin.root.resolve()
+        object_path = (root / origin.path.strip("/") / key).resolve()
+        if not object_path.is_relative_to(root) or not object_path.is_file():
+            return _Fetch(MISSING_OBJECT_STATUS, key, origin=origin.name)
+        return _Fetch(200, key, object_path.read_bytes(), origin.name)
+
+    def _object_headers(self, fetch: _Fetch) -> dict[str, str]:
+        """The metadata the deployer stores with the object at `fetch.key`."""
+        encoded_path, encoding = static_site_deployer.split_encoding(fetch.key)
+        headers = {
+            "Content-Type": static_site_deployer.content_type(encoded_path),
+            "Content-Length": str(len(fetch.body)),
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        cache_control = static_site_deployer.cache_control(
+            encoded_path, self.config.cache_rules, self.config.default_cache_control
+        )
+        if cache_control:
+            headers["Cache-Control"] = cache_control
+        return headers
+
+    def _policy_headers(
+        self, request_headers: dict[str, str], origin_headers: dict[str, str]
+    ) -> dict[str, str]:
+        """The headers the response headers policy adds to a response."""
+        policy = self.config.response_headers
+        present = {name.lower() for name in origin_headers}
+        added: dict[str, str] = {}
+
+        def add(name: str, value: str, override: bool) -> None:
+            if override or name.lower() not in present:
+                added[name] = value
+
+        for header in policy.get("CustomHeadersConfig", {}).get("Items", []):
+            add(header["Header"], header["Value"], header["Override"])
+
+        security = policy.get("SecurityHeadersConfig", {})
+        if "ContentSecurityPolicy" in security:
+            csp = security["ContentSecurityPolicy"]
+            add(
+                "Content-Security-Policy", csp["ContentSecurityPolicy"], csp["Override"]
+            )
+        if "FrameOptions" in security:
+            options = security["FrameOptions"]
+            add("X-Frame-Options", options["FrameOption"], options["Override"])
+        if "ReferrerPolicy" in security:
+            referrer = security["ReferrerPolicy"]
+            add("Referrer-Policy", referrer["ReferrerPolicy"], referrer["Override"])
+        if "StrictTransportSecurity" in security:
+            hsts = security["StrictTransportSecurity"]
+            value = f"max-age={hsts['AccessControlMaxAgeSec']}"
+            if hsts.get("IncludeSubdomains"):
+                value += "; includeSubDomains"
+            if hsts.get("Preload"):
+                value += "; preload"
+            add("Strict-Transport-Security", value, hsts["Override"])
+        if "XSSProtection" in security:
+            xss = security["XSSProtection"]
+            value = "1" if xss.get("Protection") else "0"
+            if xss.get("Protection") and xss.get("ModeBlock"):
+                value += "; mode=block"
+            add("X-XSS-Protection", value, xss["Override"])
+        if "ContentTypeOptions" in security:
+            add(
+                "X-Content-Type-Options",
+                "nosniff",
+                security["ContentTypeOptions"]["Override"],
+            )
+
+        cors = policy.get("CorsConfig")
+        origin = request_headers.get("origin")
+        if cors and origin in cors["AccessControlAllowOrigins"]["Items"]:
+            override = cors["OriginOverride"]
+            add("Access-Control-Allow-Origin", origin, override)
+            add(
+                "Access-Control-Allow-Methods",
+                ", ".join(cors["AccessControlAllowMethods"]["Items"]),
+                override,
+            )
+        return added
+
+
+class EdgeEmulatorServer:
+    """Threaded local HTTP endpoint backed by an `EdgeEmulator`.
+
+    Use as a context manager; ``url`` is valid once started. Responses carry
+    ``X-Emulator-Origin`` (``primary``, ``backup`` or ``function``),
+    ``X-Emulator-Failover`` and a ``Server-Timing`` header with the function
+    and origin durations, so clients can tell how they were served.
+    """
+
+    def __init__(self, emulator: EdgeEmulator, port: int = 0) -> None:
+        self.emulator = emulator
+        self.port = port
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "EdgeEmulatorServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Edge emulator server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer(
+            ("127.0.0.1", self.port), _handler_for(self.emulator)
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _handler_for(emulator: EdgeEmulator) -> type[BaseHTTPRequestHandler]:
+    class _EdgeRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without TCP_NODELAY the
+        # second write waits on delayed ACKs and dwarfs the emulator's own cost.
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            self._respond("GET")
+
+        def do_HEAD(self) -> None:
+            self._respond("HEAD")
+
+        def _respond(self, method: str) -> None:
+            response = emulator.handle(self.path, dict(self.headers), method)
+            self.send_response(response.status)
+            for name, value in response.headers.items():
+                self.send_header(name, value)
+            if "Content-Length" not in response.headers:
+                self.send_header("Content-Length", str(len(response.body)))
+            self.send_header("X-Emulator-Origin", response.origin or "function")
+            self.send_header("X-Emulator-Failover", str(response.failed_over).lower())
+            self.send_header(
+                "Server-Timing",
+                f"function;dur={response.function_ms:.3f}, "
+                f"origin;dur={response.origin_ms:.3f}",
+            )
+            self.end_headers()
+            self.wfile.write(response.body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return _EdgeRequestHandler
+
+
+def load_distribution_config(template_path: Path) -> _DistributionConfig:
+    """Read the distribution, its function, store and policy from a template."""
+    resources = json.loads(template_path.read_text())["Resources"]
+    distributions = [
+        resource
+        for resource in resources.values()
+        if resource["Type"] == "AWS::CloudFront::Distribution"
+    ]
+    if len(distributions) != 1:
+        raise ValueError(
+            f"{template_path} must define exactly one CloudFront distribution"
+        )
+    config = distributions[0]["Properties"]["DistributionConfig"]
+
+    def behavior(settings: dict) -> _Behavior:
+        function_id = None
+        for association in settings.get("FunctionAssociations", []):
+            if association["EventType"] == "viewer-request":
+                function_id = association["FunctionARN"]["Fn::GetAtt"][0]
+        return _Behavior(settings.get("PathPattern"), function_id)
+
+    behaviors = [behavior(settings) for settings in config.get("CacheBehaviors", [])]
+    default_behavior = behavior(config["DefaultCacheBehavior"])
+
+    origin_paths = {
+        origin["Id"]: origin.get("OriginPath", "") for origin in config["Origins"]
+    }
+    (group,) = config["OriginGroups"]["Items"]
+    primary_id, backup_id = (member["OriginId"] for member in group["Members"]["Items"])
+    policy_id = config["DefaultCacheBehavior"]["ResponseHeadersPolicyId"]["Ref"]
+
+    function_ids = {
+        b.function_id for b in [*behaviors, default_behavior] if b.function_id
+    }
+    function_code = {}
+    key_value_stores = {}
+    for function_id in function_ids:
+        properties = resources[function_id]["Properties"]
+        function_code[function_id] = properties["FunctionCode"]
+        for association in properties["FunctionConfig"].get(
+            "KeyValueStoreAssociations", []
+        ):
+            store_id = association["KeyValueStoreARN"]["Fn::GetAtt"][0]
+            key_value_stores[function_id] = _load_key_value_store(
+                template_path, resources[store_id]["Properties"]
+            )
+
+    # The deployment that invalidates the distribution serves the primary
+    # bucket; its rules set each object's Cache-Control.
+    cache_rules: list[tuple[str, str]] = []
+    default_cache_control = None
+    deployments = [
+        resource["Properties"]
+        for resource in resources.values()
+        if resource["Type"] == "Custom::StaticSiteDeployment"
+    ]
+    if deployments:
+        deployment = next(
+            (props for props in deployments if "DistributionId" in props),
+            deployments[0],
+        )
+        request = static_site_deployer.parse_request({"ResourceProperties": deployment})
+        cache_rules = request["CacheControl"]
+        default_cache_control = request["DefaultCacheControl"]
+
+    return _DistributionConfig(
+        behaviors=behaviors,
+        default_behavior=default_behavior,
+        default_root_object=config.get("DefaultRootObject"),
+        failover_statuses=frozenset(group["FailoverCriteria"]["StatusCodes"]["Items"]),
+        error_responses={
+            response["ErrorCode"]: (
+                response["ResponsePagePath"],
+                response.get("ResponseCode", response["ErrorCode"]),
+            )
+            for response in config.get("CustomErrorResponses", [])
+            if "ResponsePagePath" in response
+        },
+        origin_paths=(origin_paths[primary_id], origin_paths[backup_id]),
+        response_headers=resources[policy_id]["Properties"][
+            "ResponseHeadersPolicyConfig"
+        ],
+        function_code=function_code,
+        key_value_stores=key_value_stores,
+        cache_rules=cache_rules,
+        default_cache_control=default_cache_control,
+    )
+
+
+def _load_key_value_store(template_path: Path, properties: dict) -> dict[str, str]:
+    """Load a store's import source from the cloud assembly's asset files."""
+    source = properties.get("ImportSource")
+    if source is None:
+        return {}
+    # The source ARN ends in the asset's object key, "<asset hash>.json".
+    parts = source["SourceArn"]["Fn::Join"][1]
+    object_key = parts[-1].rsplit("/", 1)[-1]
+    manifest_path = template_path.with_name(
+        template_path.name.replace(".template.json", ".assets.json")
+    )
+    files = json.loads(manifest_path.read_text())["files"]
+    asset = files[object_key.split(".", 1)[0]]
+    data = json.loads((template_path.parent / asset["source"]["path"]).read_text())
+    return {entry["key"]: entry["value"] for entry in data["data"]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--template", type=Path, required=True)
+    parser.add_argument("--primary", type=Path, required=True)
+    parser.add_argument(
+        "--backup", type=Path, help="backup bucket directory (default: --primary)"
+    )
+    parser.add_argument(
+        "--ignore-origin-path",
+        action="store_true",
+        help="serve the bucket directories as is, e.g. a local build",
+    )
+    parser.add_argument(
+        "--fault",
+        action="append",
+        default=[],
+        metavar="ORIGIN=STATUS[:PROBABILITY][@LATENCY_MS]",
+        help="inject a fault into the primary or backup origin",
+    )
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    faults = {}
+    for value in args.fault:
+        origin, _, spec = value.partition("=")
+        faults[origin] = OriginFault.parse(spec)
+    emulator = EdgeEmulator(
+        args.template,
+        args.primary,
+        args.backup,
+        faults=faults,
+        ignore_origin_path=args.ignore_origin_path,
+    )
+    with emulator, EdgeEmulatorServer(emulator, args.port) as server:
+        print(f"Serving {args.template} at {server.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
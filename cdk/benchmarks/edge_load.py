@@ -0,0 +1,264 @@
+"""Load harness for the distribution's request path on the local edge emulator.
+
+Each scenario starts an `EdgeEmulatorServer` with the scenario's origin
+faults and drives it from ``--concurrency`` keep-alive HTTP clients cycling
+through a path mix. It reports requests per second, p50/p95/p99 latency,
+p50 CloudFront Function time, 5xx responses, failovers and the failover
+overhead: the p50 latency of requests the backup origin served after a
+failover minus the p50 latency of requests the primary served.
+
+    python -m benchmarks.edge_load --template cdk.out/Website.template.json \\
+        --primary ../frontend/dist --ignore-origin-path
+    python -m benchmarks.edge_load ... --scenario primary-503-10pct --requests 5000
+
+The default path mix is ``/``, every object in the primary bucket directory
+(except precompressed variants), every routed path in the function's
+KeyValueStore and one missing page.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import itertools
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from benchmarks.edge_emulator import EdgeEmulator, EdgeEmulatorServer, OriginFault
+
+import static_site_deployer
+
+MISSING_PATH = "/this-page-does-not-exist"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One load run: the faults injected into each origin."""
+
+    name: str
+    primary: OriginFault | None = None
+    backup: OriginFault | None = None
+
+
+SCENARIOS = (
+    Scenario("healthy"),
+    Scenario("primary-503-10pct", primary=OriginFault(503, probability=0.1)),
+    Scenario("primary-down", primary=OriginFault(503)),
+    Scenario("primary-slow-20ms", primary=OriginFault(latency=0.02)),
+    Scenario("both-down", primary=OriginFault(503), backup=OriginFault(502)),
+)
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def default_paths(emulator: EdgeEmulator) -> list[str]:
+    """The default path mix for the emulator's primary bucket directory."""
+    origin = emulator.origins["primary"]
+    root = origin.root / origin.path.strip("/")
+    objects = sorted(
+        "/" + path.relative_to(root).as_posix()
+        for path in root.rglob("*")
+        if path.is_file()
+        and not path.name.startswith(".")
+        and static_site_deployer.split_encoding(path.name)[1] is None
+    )
+    routes = sorted(
+        {
+            route
+            for store in emulator.config.key_value_stores.values()
+            for route in store
+        }
+    )
+    return ["/", *objects, *routes, MISSING_PATH]
+
+
+def run_scenario(
+    scenario: Scenario,
+    *,
+    template: Path,
+    primary: Path,
+    backup: Path | None = None,
+    ignore_origin_path: bool = False,
+    paths: list[str] | None = None,
+    requests: int = 1000,
+    concurrency: int = 8,
+    accept_encoding: str = "br, gzip",
+) -> dict:
+    """Serve `requests` requests under `scenario` and return its metrics."""
+    faults = {
+        origin: fault
+        for origin, fault in (
+            ("primary", scenario.primary),
+            ("backup", scenario.backup),
+        )
+        if fault is not None
+    }
+    emulator = EdgeEmulator(
+        template,
+        primary,
+        backup,
+        faults=faults,
+        ignore_origin_path=ignore_origin_path,
+        function_workers=concurrency,
+    )
+    with emulator, EdgeEmulatorServer(emulator) as server:
+        paths = paths or default_paths(emulator)
+        host, port = server.url.removeprefix("http://").split(":")
+        indexes = itertools.count()
+        index_lock = threading.Lock()
+        samples: list[tuple[float, int, str, bool, float]] = []
+        samples_lock = threading.Lock()
+
+        def worker() -> None:
+            connection = http.client.HTTPConnection(host, int(port))
+            local = []
+            while True:
+                with index_lock:
+                    index = next(indexes)
+                if index >= requests:
+                    break
+                started_at = time.perf_counter()
+                connection.request(
+                    "GET",
+                    paths[index % len(paths)],
+                    headers={"Accept-Encoding": accept_encoding},
+                )
+                response = connection.getresponse()
+                response.read()
+                latency_ms = (time.perf_counter() - started_at) * 1000
+                local.append(
+                    (
+                        latency_ms,
+                        response.status,
+                        response.getheader("X-Emulator-Origin"),
+                        response.getheader("X-Emulator-Failover") == "true",
+                        _server_timing(response.getheader("Server-Timing"), "function"),
+                    )
+                )
+            connection.close()
+            with samples_lock:
+                samples.extend(local)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started_at = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started_at
+
+    latencies = [sample[0] for sample in samples]
+    primary_latencies = [
+        sample[0] for sample in samples if sample[2] == "primary" and not sample[3]
+    ]
+    failover_latencies = [
+        sample[0] for sample in samples if sample[3] and sample[1] < 500
+    ]
+    failover_overhead_ms = None
+    if primary_latencies and failover_latencies:
+        failover_overhead_ms = round(
+            _percentile(failover_latencies, 0.50)
+            - _percentile(primary_latencies, 0.50),
+            3,
+        )
+    return {
+        "requests": len(samples),
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(len(samples) / seconds, 1),
+        "p50_ms": round(_percentile(latencies, 0.50), 3),
+        "p95_ms": round(_percentile(latencies, 0.95), 3),
+        "p99_ms": round(_percentile(latencies, 0.99), 3),
+        "function_p50_ms": round(_percentile([s[4] for s in samples], 0.50), 3),
+        "errors_5xx": sum(1 for sample in samples if sample[1] >= 500),
+        "failovers": sum(1 for sample in samples if sample[3]),
+        "failover_overhead_ms": failover_overhead_ms,
+    }
+
+
+def _server_timing(header: str | None, metric: str) -> float:
+    """Read `metric`'s duration from a Server-Timing header."""
+    for entry in (header or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        if name == metric:
+            return float(params.removeprefix("dur="))
+    return 0.0
+
+
+def print_table(results: dict[str, dict]) -> None:
+    print(
+        f"{'scenario':<20} {'requests':>8} {'req/s':>8} {'p50 ms':>8}"
+        f" {'p95 ms':>8} {'p99 ms':>8} {'fn p50':>7} {'5xx':>5}"
+        f" {'failovers':>9} {'overhead ms':>11}"
+    )
+    for name, result in results.items():
+        overhead = result["failover_overhead_ms"]
+        print(
+            f"{name:<20} {result['requests']:>8} {result['requests_per_second']:>8.1f}"
+            f" {result['p50_ms']:>8.3f} {result['p95_ms']:>8.3f}"
+            f" {result['p99_ms']:>8.3f} {result['function_p50_ms']:>7.3f}"
+            f" {result['errors_5xx']:>5} {result['failovers']:>9}"
+            f" {'-' if overhead is None else f'{overhead:.3f}':>11}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--template", type=Path, required=True)
+    parser.add_argument("--primary", type=Path, required=True)
+    parser.add_argument(
+        "--backup", type=Path, help="backup bucket directory (default: --primary)"
+    )
+    parser.add_argument(
+        "--ignore-origin-path",
+        action="store_true",
+        help="serve the bucket directories as is, e.g. a local build",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="scenario to run; repeat for several (default: all)",
+    )
+    parser.add_argument(
+        "--path",
+        action="append",
+        help="request path; repeat for several (default: the bucket's objects)",
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--accept-encoding", default="br, gzip")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = {
+        scenario.name: run_scenario(
+            scenario,
+            template=args.template,
+            primary=args.primary,
+            backup=args.backup,
+            ignore_origin_path=args.ignore_origin_path,
+            paths=args.path,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            accept_encoding=args.accept_encoding,
+        )
+        for scenario in SCENARIOS
+        if not args.scenario or scenario.name in args.scenario
+    }
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Cold/warm start benchmark for deployed replicator Lambda variants.
+
+Deploy one replicator function per packaging/architecture combination to
+compare (for example a zip ARM_64 and a Docker X86_64 build), then run:
+
+    python -m benchmarks.packaging \\
+        --function zip-arm64=<function-name> \\
+        --function docker-x86=<function-name> \\
+        --memory 128 --memory 256 --warm 10 --output results.json
+
+For every function and memory size the harness sets the memory and a fresh
+``BENCHMARK_NONCE`` environment variable, which forces Lambda to start a new
+execution environment, then invokes once cold and ``--warm`` times warm. Init
+and handler durations come from the REPORT line of each invocation's log
+tail. The default event is a Delete request, which measures runtime and
+module initialisation without touching SSM; pass ``--event`` with a real
+Create/Update event to include replication work.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import re
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+
+import boto3
+
+# Lambda on-demand compute price (USD per GB-second, us-east-1).
+PRICE_PER_GB_SECOND = {"arm64": 0.0000133334, "x86_64": 0.0000166667}
+
+_REPORT_FIELDS = {
+    "duration_ms": re.compile(r"\tDuration: ([\d.]+) ms"),
+    "billed_ms": re.compile(r"Billed Duration: ([\d.]+) ms"),
+    "max_memory_mb": re.compile(r"Max Memory Used: (\d+) MB"),
+    "init_ms": re.compile(r"Init Duration: ([\d.]+) ms"),
+}
+
+
+@dataclass
+class VariantResult:
+    """Timings for one function at one memory size."""
+
+    label: str
+    function_name: str
+    package_type: str
+    architecture: str
+    memory_mb: int
+    cold: dict = field(default_factory=dict)
+    warm: list = field(default_factory=list)
+
+    @property
+    def warm_p50_ms(self) -> float:
+        return statistics.median(report["duration_ms"] for report in self.warm)
+
+    @property
+    def cost_per_million_usd(self) -> float:
+        """Compute cost of a million warm invocations at the median billed time."""
+        billed_ms = statistics.median(report["billed_ms"] for report in self.warm)
+        gb_seconds = (billed_ms / 1000) * (self.memory_mb / 1024)
+        return gb_seconds * PRICE_PER_GB_SECOND[self.architecture] * 1_000_000
+
+
+def parse_report(log_tail: str) -> dict:
+    """Extract durations from the REPORT line of a Lambda log tail."""
+    report_line = next(
+        (line for line in log_tail.splitlines() if line.startswith("REPORT")), ""
+    )
+    report = {}
+    for key, pattern in _REPORT_FIELDS.items():
+        match = pattern.search(report_line)
+        if match:
+            report[key] = float(match.group(1))
+    if "duration_ms" not in report:
+        raise ValueError(f"No REPORT line in log tail:\n{log_tail}")
+    return report
+
+
+def invoke(lambda_client, function_name: str, payload: bytes) -> dict:
+    response = lambda_client.invoke(
+        FunctionName=function_name, Payload=payload, LogType="Tail"
+    )
+    if response.get("FunctionError"):
+        raise RuntimeError(
+            f"{function_name} failed: {response['Payload'].read().decode()}"
+        )
+    return parse_report(base64.b64decode(response["LogResult"]).decode())
+
+
+def force_cold_start(lambda_client, function_name: str, memory_mb: int) -> dict:
+    """Apply `memory_mb` and a new nonce so the next invocation starts cold."""
+    config = lambda_client.get_function_configuration(FunctionName=function_name)
+    variables = dict(config.get("Environment", {}).get("Variables", {}))
+    variables["BENCHMARK_NONCE"] = str(time.time_ns())
+    lambda_client.update_function_configuration(
+        FunctionName=function_name,
+        MemorySize=memory_mb,
+        Environment={"Variables": variables},
+    )
+    lambda_client.get_waiter("function_updated_v2").wait(FunctionName=function_name)
+    return config
+
+
+def benchmark_variant(
+    lambda_client,
+    label: str,
+    function_name: str,
+    memory_mb: int,
+    payload: bytes,
+    warm_invocations: int,
+) -> VariantResult:
+    config = force_cold_start(lambda_client, function_name, memory_mb)
+    result = VariantResult(
+        label=label,
+        function_name=function_name,
+        package_type=config.get("PackageType", "Zip"),
+        architecture=config.get("Architectures", ["x86_64"])[0],
+        memory_mb=memory_mb,
+    )
+    result.cold = invoke(lambda_client, function_name, payload)
+    result.warm = [
+        invoke(lambda_client, function_name, payload) for _ in range(warm_invocations)
+    ]
+    return result
+
+
+def print_table(results: list[VariantResult]) -> None:
+    print(
+        f"{'variant':<16} {'type':<6} {'arch':<7} {'MB':>5} {'init ms':>9}"
+        f" {'cold ms':>9} {'warm p50':>9} {'$/1M warm':>10}"
+    )
+    for result in sorted(results, key=lambda r: r.cost_per_million_usd):
+        print(
+            f"{result.label:<16} {result.package_type:<6} {result.architecture:<7}"
+            f" {result.memory_mb:>5} {result.cold.get('init_ms', 0):>9.1f}"
+            f" {result.cold['duration_ms']:>9.1f} {result.warm_p50_ms:>9.1f}"
+            f" {result.cost_per_million_usd:>10.4f}"
+        )
+
+
+def _default_event(region: str) -> dict:
+    return {
+        "RequestType": "Delete",
+        "PhysicalResourceId": "packaging-benchmark",
+        "ResourceProperties": {"SourceRegion": region, "TargetRegions": [region]},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--function",
+        action="append",
+        required=True,
+        metavar="LABEL=NAME",
+        help="deployed replicator function to benchmark; repeat for each variant",
+    )
+    parser.add_argument(
+        "--memory",
+        action="append",
+        type=int,
+        help="memory size in MB to test; repeat for several (default: 128)",
+    )
+    parser.add_argument("--warm", type=int, default=10, help="warm invocations")
+    parser.add_argument("--event", help="path to a JSON event to invoke with")
+    parser.add_argument("--region", default="us-east-1")
+    parser.add_argument("--output", help="write raw results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.event:
+        with open(args.event) as event_file:
+            event = json.load(event_file)
+    else:
+        event = _default_event(args.region)
+    payload = json.dumps(event).encode()
+
+    lambda_client = boto3.client("lambda", region_name=args.region)
+    results = []
+    for spec in args.function:
+        label, _, function_name = spec.partition("=")
+        for memory_mb in args.memory or [128]:
+            results.append(
+                benchmark_variant(
+                    lambda_client,
+                    label,
+                    function_name or label,
+                    memory_mb,
+                    payload,
+                    args.warm,
+                )
+            )
+
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump([asdict(result) for result in results], output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""In-memory SSM stand-ins for benchmarks.
+
+Implements the subset of the SSM JSON API the replicator uses
+(GetParameters, GetParametersByPath and PutParameter), with one store per
+region so a single stand-in can play both the source and the target regions.
+
+- `SSMStandIn` answers botocore clients in-process: `attach` short-circuits
+  each call from a before-call hook, so requests are still serialized and
+  responses parsed by botocore, but no socket is involved.
+- `SSMStubServer` serves the same API over local HTTP for benchmarks that
+  measure connection behaviour; point clients at it with
+  ``AWS_ENDPOINT_URL_SSM``.
+
+Both inject a fixed per-call latency and, optionally, throttling: a
+per-region PutParameter rate limit and/or a random PutParameter throttle
+probability. Reads are never throttled: the replicator's own backoff only
+covers writes, and the in-process stand-in bypasses botocore's retries.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from typing import Any
+
+from botocore.awsrequest import AWSResponse
+
+_CREDENTIAL_SCOPE = re.compile(r"Credential=[^/]+/\d{8}/([^/]+)/ssm/")
+
+
+class SSMStandIn:
+    """In-memory SSM with latency and throttling injection."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        put_rate_limit: float | None = None,
+        throttle_probability: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.put_rate_limit = put_rate_limit
+        self.throttle_probability = throttle_probability
+        self.calls: Counter[str] = Counter()
+        self.throttles = 0
+        self._random = random.Random(seed)
+        self._store: dict[tuple[str, str], dict[str, Any]] = {}
+        self._sorted_names: dict[str, list[str]] = {}
+        self._put_windows: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, client) -> None:
+        """Answer every call made by a botocore SSM client in-process."""
+        # Returning a response from before-call skips the HTTP send, the same
+        # mechanism botocore's Stubber uses. Hooks registered first (such as
+        # the replicator's telemetry) still run before it.
+        client.meta.events.register("before-call.*.*", self._answer_call)
+
+    def _answer_call(self, model, params, context, **kwargs):
+        payload = json.loads(params.get("body") or b"{}")
+        status, body = self.handle(
+            context.get("client_region") or "us-east-1", model.name, payload
+        )
+        encoded = json.dumps(body).encode()
+        response = AWSResponse(
+            params.get("url", ""),
+            status,
+            {"content-length": str(len(encoded))},
+            None,
+        )
+        metadata = {"HTTPStatusCode": status, "RetryAttempts": 0}
+        if status >= 300:
+            parsed = {
+                "Error": {"Code": body["__type"], "Message": body["message"]},
+                "ResponseMetadata": metadata,
+            }
+        else:
+            parsed = {**body, "ResponseMetadata": metadata}
+        return response, parsed
+
+    def put(self, region: str, name: str, value: str) -> None:
+        """Seed or overwrite a parameter directly, bypassing the API."""
+        with self._lock:
+            self._write(region, name, value)
+
+    def get(self, region: str, name: str) -> str | None:
+        with self._lock:
+            parameter = self._store.get((region, name))
+        return None if parameter is None else parameter["Value"]
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.throttles = 0
+
+    def handle(self, region: str, operation: str, payload: dict) -> tuple[int, dict]:
+        """Dispatch one API call; returns an HTTP status and JSON body."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[operation] += 1
+            if self._throttled(region, operation):
+                self.throttles += 1
+                return 400, _error("ThrottlingException", "Rate exceeded")
+            handler = getattr(self, f"_op_{operation}", None)
+            if handler is None:
+                return 400, _error("InvalidAction", f"{operation} is not stubbed")
+            return handler(region, payload)
+
+    def _op_GetParameters(self, region: str, payload: dict) -> tuple[int, dict]:
+        found, invalid = [], []
+        for name in payload["Names"]:
+            parameter = self._store.get((region, name))
+            if parameter is None:
+                invalid.append(name)
+            else:
+                found.append(parameter)
+        return 200, {"Parameters": found, "InvalidParameters": invalid}
+
+    def _op_GetParametersByPath(self, region: str, payload: dict) -> tuple[int, dict]:
+        path = payload["Path"].rstrip("/") + "/"
+        recursive = payload.get("Recursive", False)
+        max_results = int(payload.get("MaxResults", 10))
+        # NextToken is the last name returned, so each page is a bisect into
+        # the sorted names rather than a scan of the whole region.
+        names = self._region_names(region)
+        token = payload.get("NextToken")
+        start = bisect_right(names, token) if token else bisect_left(names, path)
+        page: list[str] = []
+        for name in islice(names, start, None):
+            if not name.startswith(path):
+                break
+            if recursive or "/" not in name[len(path) :]:
+                page.append(name)
+                if len(page) > max_results:
+                    break
+        body: dict[str, Any] = {
+            "Parameters": [self._store[(region, name)] for name in page[:max_results]]
+        }
+        if len(page) > max_results:
+            body["NextToken"] = page[max_results - 1]
+        return 200, body
+
+    def _op_PutParameter(self, region: str, payload: dict) -> tuple[int, dict]:
+        exists = (region, payload["Name"]) in self._store
+        if exists and not payload.get("Overwrite"):
+            return 400, _error("ParameterAlreadyExists", payload["Name"])
+        version = self._write(region, payload["Name"], payload["Value"])
+        return 200, {"Version": version, "Tier": "Standard"}
+
+    def _throttled(self, region: str, operation: str) -> bool:
+        if operation != "PutParameter":
+            return False
+        if self.throttle_probability and (
+            self._random.random() < self.throttle_probability
+        ):
+            return True
+        if not self.put_rate_limit:
+            return False
+        # Fixed one-second windows per region, like SSM's per-account TPS.
+        window = int(time.monotonic())
+        current_window, count = self._put_windows.get(region, (window, 0))
+        if current_window != window:
+            count = 0
+        if count >= self.put_rate_limit:
+            return True
+        self._put_windows[region] = (window, count + 1)
+        return False
+
+    def _region_names(self, region: str) -> list[str]:
+        """Sorted parameter names in `region`, cached until a name is added."""
+        names = self._sorted_names.get(region)
+        if names is None:
+            names = sorted(name for stored, name in self._store if stored == region)
+            self._sorted_names[region] = names
+        return names
+
+    def _write(self, region: str, name: str, value: str) -> int:
+        previous = self._store.get((region, name))
+        if previous is None:
+            self._sorted_names.pop(region, None)
+        version = 1 if previous is None else previous["Version"] + 1
+        self._store[(region, name)] = {
+            "Name": name,
+            "Type": "String",
+            "Value": value,
+            "Version": version,
+            "LastModifiedDate": time.time(),
+            "ARN": f"arn:aws:ssm:{region}:111111111111:parameter{name}",
+            "DataType": "text",
+        }
+        return version
+
+
+class SSMStubServer(SSMStandIn):
+    """Threaded local HTTP SSM endpoint backed by an `SSMStandIn`.
+
+    Use as a context manager; ``endpoint_url`` is valid once started.
+    """
+
+    def __init__(self, latency: float = 0.0, **stand_in_options: Any) -> None:
+        super().__init__(latency=latency, **stand_in_options)
+        self.connections = 0
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "SSMStubServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def endpoint_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("SSM stub server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_stats(self) -> None:
+        super().reset_stats()
+        with self._lock:
+            self.connections = 0
+
+
+def _error(code: str, message: str) -> dict:
+    return {"__type": code, "message": message}
+
+
+def _handler_for(stub: "SSMStubServer") -> type[BaseHTTPRequestHandler]:
+    class _SSMRequestHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 keeps connections alive, so client connection reuse is
+        # visible in `SSMStubServer.connections`.
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without TCP_NODELAY the
+        # second write waits on delayed ACKs and dwarfs the handler's own cost.
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            with stub._lock:
+                stub.connections += 1
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            operation = self.headers.get("X-Amz-Target", "").rpartition(".")[2]
+            match = _CREDENTIAL_SCOPE.search(self.headers.get("Authorization", ""))
+            region = match.group(1) if match else "us-east-1"
+
+            status, body = stub.handle(region, operation, payload)
+            encoded = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/x-amz-json-1.1")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return _SSMRequestHandler
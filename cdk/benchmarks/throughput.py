@@ -0,0 +1,312 @@
+"""Replication throughput of the SSM replicator from 1 to 10,000 parameters.
+
+Runs ``ssm_param_replicator.lambda_handler`` against the in-process
+`SSMStandIn` for each scenario and reports throughput, p50/p99 SSM call
+latency (from the handler's own EMF telemetry) and peak Python memory
+(tracemalloc). Each scenario runs ``--repeats`` times and the median of
+every metric is compared with ``baselines.json``; the run exits non-zero
+when any scenario regresses past the tolerance.
+
+    python -m benchmarks.throughput                      # all scenarios
+    python -m benchmarks.throughput --scenario path-1000 # just one
+    python -m benchmarks.throughput --update-baselines   # re-record
+
+Baselines are machine-dependent: re-record them on the machine (or CI
+runner class) that enforces them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+import boto3
+
+from benchmarks.ssm_stub import SSMStandIn
+
+import ssm_param_replicator
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+SOURCE_REGION = "us-east-1"
+SOURCE_PATH = "/Benchmark"
+
+# In-process call latency is a fraction of a millisecond, so allow this
+# much absolute slack on top of the relative tolerance.
+LATENCY_SLACK_MS = 1.0
+# Below this many calls p99 rests on a handful of samples and swings with
+# any scheduler hiccup, so it is reported but not compared.
+MIN_P99_CALLS = 1000
+DEFAULT_REPEATS = 3
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One benchmark run: parameter count, replication mode and injected faults."""
+
+    name: str
+    parameter_count: int
+    mode: Literal["explicit", "path"] = "path"
+    target_regions: tuple[str, ...] = ("us-east-2",)
+    latency_ms: float = 0.0
+    put_rate_limit: float | None = None
+    throttle_probability: float = 0.0
+    write_concurrency: int = 8
+    write_rate_limit: float = 2000
+
+
+SCENARIOS = (
+    Scenario("explicit-1", 1, mode="explicit"),
+    Scenario("explicit-100", 100, mode="explicit"),
+    Scenario("path-1000", 1000),
+    Scenario("path-10000", 10_000),
+    Scenario(
+        "path-1000-latency-2-regions",
+        1000,
+        target_regions=("us-east-2", "us-west-2"),
+        latency_ms=2,
+    ),
+    Scenario(
+        "path-500-throttled",
+        500,
+        put_rate_limit=250,
+        throttle_probability=0.02,
+    ),
+)
+
+
+def _parameter_name(index: int) -> str:
+    return f"{SOURCE_PATH}/group-{index // 100:03d}/param-{index:05d}"
+
+
+def _event(scenario: Scenario) -> dict:
+    properties = {
+        "SourceRegion": SOURCE_REGION,
+        "TargetRegions": list(scenario.target_regions),
+        "Parameters": [],
+    }
+    if scenario.mode == "path":
+        properties["SourcePath"] = SOURCE_PATH
+    else:
+        properties["Parameters"] = [
+            {"source": _parameter_name(index), "target": _parameter_name(index)}
+            for index in range(scenario.parameter_count)
+        ]
+    return {"RequestType": "Create", "ResourceProperties": properties}
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@contextlib.contextmanager
+def _patched(target, **attributes):
+    originals = {name: getattr(target, name) for name in attributes}
+    for name, value in attributes.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in originals.items():
+            setattr(target, name, value)
+
+
+def run_scenario(scenario: Scenario) -> dict:
+    """Replicate `scenario` once against a fresh stand-in and return its metrics."""
+    stand_in = SSMStandIn(
+        latency=scenario.latency_ms / 1000,
+        put_rate_limit=scenario.put_rate_limit,
+        throttle_probability=scenario.throttle_probability,
+    )
+    for index in range(scenario.parameter_count):
+        stand_in.put(SOURCE_REGION, _parameter_name(index), f"value-{index}")
+
+    clients = {}
+    for region in (SOURCE_REGION, *scenario.target_regions):
+        client = boto3.client(
+            "ssm",
+            region_name=region,
+            config=ssm_param_replicator.SSM_CLIENT_CONFIG,
+        )
+        stand_in.attach(client)
+        clients[region] = client
+    write_clients = {}
+    for region in scenario.target_regions:
+        client = boto3.client(
+            "ssm",
+            region_name=region,
+            config=ssm_param_replicator.SSM_WRITE_CLIENT_CONFIG,
+        )
+        stand_in.attach(client)
+        write_clients[region] = client
+
+    emitted: list[str] = []
+    with (
+        _patched(
+            ssm_param_replicator,
+            _ssm_clients=clients,
+            _ssm_write_clients=write_clients,
+            WRITE_CONCURRENCY=scenario.write_concurrency,
+            WRITE_RATE_LIMIT=scenario.write_rate_limit,
+        ),
+        _patched(ssm_param_replicator.telemetry, emit=emitted.append),
+        contextlib.redirect_stdout(io.StringIO()),
+    ):
+        tracemalloc.start()
+        started_at = time.perf_counter()
+        response = ssm_param_replicator.lambda_handler(_event(scenario), None)
+        seconds = time.perf_counter() - started_at
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    expected = scenario.parameter_count * len(scenario.target_regions)
+    replicated = response["Data"]["ReplicatedCount"]
+    if replicated != expected:
+        raise RuntimeError(
+            f"{scenario.name}: replicated {replicated} of {expected} parameters"
+        )
+
+    latencies = [
+        latency
+        for record in map(json.loads, emitted)
+        for latency in record.get("Latency", [])
+    ]
+    return {
+        "parameters": scenario.parameter_count,
+        "seconds": round(seconds, 3),
+        "throughput": round(expected / seconds, 1),
+        "call_p50_ms": round(_percentile(latencies, 0.50), 3),
+        "call_p99_ms": round(_percentile(latencies, 0.99), 3),
+        "calls": len(latencies),
+        "throttles": stand_in.throttles,
+        "peak_memory_mb": round(peak_bytes / 1024 / 1024, 2),
+    }
+
+
+def median_result(runs: list[dict]) -> dict:
+    """The median of every metric over repeated runs of one scenario."""
+    return {key: statistics.median_low(run[key] for run in runs) for key in runs[0]}
+
+
+def find_regressions(
+    results: dict[str, dict], baselines: dict[str, dict], tolerance: float
+) -> list[str]:
+    """Describe every metric that regressed past `tolerance` (a fraction)."""
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if result["throughput"] < baseline["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['throughput']}/s < "
+                f"baseline {baseline['throughput']}/s"
+            )
+        for percentile in ("p50", "p99"):
+            if percentile == "p99" and result["calls"] < MIN_P99_CALLS:
+                continue
+            metric = f"call_{percentile}_ms"
+            limit = baseline[metric] * (1 + tolerance) + LATENCY_SLACK_MS
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}: {percentile} call latency {result[metric]} ms > "
+                    f"{limit:.3f} ms"
+                )
+        memory_limit = baseline["peak_memory_mb"] * (1 + tolerance)
+        if result["peak_memory_mb"] > memory_limit:
+            regressions.append(
+                f"{name}: peak memory {result['peak_memory_mb']} MB > "
+                f"{memory_limit:.2f} MB"
+            )
+    return regressions
+
+
+def print_table(results: dict[str, dict]) -> None:
+    print(
+        f"{'scenario':<30} {'params':>7} {'seconds':>8} {'params/s':>9}"
+        f" {'p50 ms':>8} {'p99 ms':>8} {'throttles':>9} {'peak MB':>8}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<30} {result['parameters']:>7} {result['seconds']:>8.2f}"
+            f" {result['throughput']:>9.1f} {result['call_p50_ms']:>8.3f}"
+            f" {result['call_p99_ms']:>8.3f} {result['throttles']:>9}"
+            f" {result['peak_memory_mb']:>8.2f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="scenario to run; repeat for several (default: all)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed regression as a fraction of the baseline (default: 0.5)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help=f"runs per scenario; medians are reported (default: {DEFAULT_REPEATS})",
+    )
+    parser.add_argument("--baselines", type=Path, default=BASELINES_PATH)
+    parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        help="record these results as the new baselines instead of comparing",
+    )
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+    selected = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.scenario or scenario.name in args.scenario
+    ]
+    results = {
+        scenario.name: median_result(
+            [run_scenario(scenario) for _ in range(max(args.repeats, 1))]
+        )
+        for scenario in selected
+    }
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    baselines = (
+        json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+    )
+    if args.update_baselines:
+        baselines.update(results)
+        args.baselines.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"Baselines written to {args.baselines}")
+        return 0
+
+    regressions = find_regressions(results, baselines, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
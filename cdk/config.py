@@ -2,9 +2,29 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from typing import Any, Literal, Mapping
 
+# CloudFront KeyValueStore limits: keys are at most 512 bytes and values at
+# most 1 KB, which leaves room for the action prefix of an encoded route.
+EDGE_ROUTE_MAX_PATH_BYTES = 512
+EDGE_ROUTE_MAX_TARGET_BYTES = 1000
+EDGE_ROUTE_REDIRECT_STATUS_CODES = (301, 302, 307, 308)
+
+# Alarm thresholds used for any key an environment's `monitoring` omits.
+MONITORING_DEFAULTS: dict[str, float] = {
+    "cache_hit_rate_min_percent": 80,
+    "origin_latency_p90_max_ms": 1000,
+    "error_rate_4xx_max_percent": 5,
+    "error_rate_5xx_max_percent": 1,
+    "bytes_downloaded_max_gb_per_hour": 5,
+}
+
+# Pages the synthetic probe fetches; `{bundle}` is the first hashed script
+# the home page loads.
+SYNTHETIC_PROBE_DEFAULT_PATHS = ("/", "{bundle}", "/resume")
+
 
 @dataclass(frozen=True, slots=True)
 class GeoRestrictionsConfig:
@@ -53,6 +73,215 @@ class GeoRestrictionsConfig:
         return payload
 
 
+@dataclass(frozen=True, slots=True)
+class EdgeRouteConfig:
+    """A URL rewrite or redirect applied by the edge routing function."""
+
+    action: Literal["rewrite", "redirect"]
+    target: str
+    status_code: int | None = None
+
+    @classmethod
+    def from_context(cls, path: str, value: Any) -> "EdgeRouteConfig":
+        """Build an edge route from CDK context data."""
+        if not isinstance(value, Mapping):
+            raise TypeError(f"edge_routes[{path!r}] must be a mapping")
+
+        actions = [action for action in ("rewrite", "redirect") if action in value]
+        if len(actions) != 1:
+            raise ValueError(
+                f"edge_routes[{path!r}] must set exactly one of: rewrite, redirect"
+            )
+        action = actions[0]
+        unknown = set(value) - {action, "status_code"}
+        if unknown:
+            raise ValueError(
+                f"edge_routes[{path!r}] has unknown key(s): {', '.join(sorted(unknown))}"
+            )
+
+        target = value[action]
+        if (
+            not isinstance(target, str)
+            or not target
+            or any(char.isspace() for char in target)
+        ):
+            raise ValueError(
+                f"edge_routes[{path!r}].{action} must be a non-empty string "
+                "without whitespace"
+            )
+        if len(target.encode("utf-8")) > EDGE_ROUTE_MAX_TARGET_BYTES:
+            raise ValueError(
+                f"edge_routes[{path!r}].{action} must be at most "
+                f"{EDGE_ROUTE_MAX_TARGET_BYTES} bytes"
+            )
+
+        if action == "rewrite":
+            if "status_code" in value:
+                raise ValueError(
+                    f"edge_routes[{path!r}].status_code only applies to redirects"
+                )
+            if not target.startswith("/"):
+                raise ValueError(
+                    f"edge_routes[{path!r}].rewrite must be a path starting with /"
+                )
+            return cls(action="rewrite", target=target)
+
+        if not target.startswith(("/", "https://")):
+            raise ValueError(
+                f"edge_routes[{path!r}].redirect must be a path or an https:// URL"
+            )
+        status_code = value.get("status_code", 301)
+        if status_code not in EDGE_ROUTE_REDIRECT_STATUS_CODES:
+            raise ValueError(
+                f"edge_routes[{path!r}].status_code must be one of: "
+                + ", ".join(str(code) for code in EDGE_ROUTE_REDIRECT_STATUS_CODES)
+            )
+        return cls(action="redirect", target=target, status_code=status_code)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the route back into a plain dictionary for downstream consumers."""
+        payload: dict[str, Any] = {self.action: self.target}
+        if self.status_code is not None:
+            payload["status_code"] = self.status_code
+        return payload
+
+
+@dataclass(frozen=True, slots=True)
+class MonitoringConfig:
+    """Alarm thresholds and notification targets for the website dashboard."""
+
+    cache_hit_rate_min_percent: float = MONITORING_DEFAULTS[
+        "cache_hit_rate_min_percent"
+    ]
+    origin_latency_p90_max_ms: float = MONITORING_DEFAULTS["origin_latency_p90_max_ms"]
+    error_rate_4xx_max_percent: float = MONITORING_DEFAULTS[
+        "error_rate_4xx_max_percent"
+    ]
+    error_rate_5xx_max_percent: float = MONITORING_DEFAULTS[
+        "error_rate_5xx_max_percent"
+    ]
+    bytes_downloaded_max_gb_per_hour: float = MONITORING_DEFAULTS[
+        "bytes_downloaded_max_gb_per_hour"
+    ]
+    alarm_emails: tuple[str, ...] = ()
+
+    @classmethod
+    def from_context(cls, value: Any) -> "MonitoringConfig":
+        """Build monitoring config from CDK context data."""
+        if not isinstance(value, Mapping):
+            raise TypeError("monitoring must be a mapping of thresholds")
+
+        unknown = set(value) - set(MONITORING_DEFAULTS) - {"alarm_emails"}
+        if unknown:
+            raise ValueError(
+                f"monitoring has unknown key(s): {', '.join(sorted(unknown))}"
+            )
+
+        thresholds: dict[str, float] = {}
+        for key, default in MONITORING_DEFAULTS.items():
+            threshold = value.get(key, default)
+            if (
+                not isinstance(threshold, (int, float))
+                or isinstance(threshold, bool)
+                or threshold <= 0
+            ):
+                raise ValueError(f"monitoring.{key} must be a positive number")
+            if key.endswith("_percent") and threshold > 100:
+                raise ValueError(f"monitoring.{key} must be at most 100")
+            thresholds[key] = threshold
+
+        alarm_emails = value.get("alarm_emails", [])
+        if not isinstance(alarm_emails, list) or not all(
+            isinstance(email, str) and "@" in email for email in alarm_emails
+        ):
+            raise TypeError("monitoring.alarm_emails must be a list of email addresses")
+
+        return cls(**thresholds, alarm_emails=tuple(alarm_emails))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the config back into a plain dictionary for downstream consumers."""
+        payload: dict[str, Any] = {
+            key: getattr(self, key) for key in MONITORING_DEFAULTS
+        }
+        payload["alarm_emails"] = list(self.alarm_emails)
+        return payload
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticProbeConfig:
+    """Regions and schedule of the synthetic TTFB probe."""
+
+    regions: tuple[str, ...]
+    schedule_minutes: int = 5
+    probe_backup: bool = False
+    paths: tuple[str, ...] = SYNTHETIC_PROBE_DEFAULT_PATHS
+
+    @classmethod
+    def from_context(cls, value: Any) -> "SyntheticProbeConfig":
+        """Build probe config from CDK context data."""
+        if not isinstance(value, Mapping):
+            raise TypeError("synthetic_probe must be a mapping")
+
+        unknown = set(value) - {"regions", "schedule_minutes", "probe_backup", "paths"}
+        if unknown:
+            raise ValueError(
+                f"synthetic_probe has unknown key(s): {', '.join(sorted(unknown))}"
+            )
+
+        regions = value.get("regions")
+        if (
+            not isinstance(regions, list)
+            or not regions
+            or not all(isinstance(region, str) for region in regions)
+        ):
+            raise TypeError(
+                "synthetic_probe.regions must be a non-empty list of regions"
+            )
+
+        schedule_minutes = value.get("schedule_minutes", 5)
+        if (
+            not isinstance(schedule_minutes, int)
+            or isinstance(schedule_minutes, bool)
+            or schedule_minutes < 1
+        ):
+            raise ValueError(
+                "synthetic_probe.schedule_minutes must be a positive integer"
+            )
+
+        probe_backup = value.get("probe_backup", False)
+        if not isinstance(probe_backup, bool):
+            raise ValueError("synthetic_probe.probe_backup must be a boolean")
+
+        paths = value.get("paths", list(SYNTHETIC_PROBE_DEFAULT_PATHS))
+        if (
+            not isinstance(paths, list)
+            or not paths
+            or not all(
+                isinstance(path, str) and (path.startswith("/") or path == "{bundle}")
+                for path in paths
+            )
+        ):
+            raise ValueError(
+                "synthetic_probe.paths must be a non-empty list of paths starting "
+                "with / or {bundle}"
+            )
+
+        return cls(
+            regions=tuple(dict.fromkeys(regions)),
+            schedule_minutes=schedule_minutes,
+            probe_backup=probe_backup,
+            paths=tuple(paths),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """The probe settings shared by every region, for downstream consumers."""
+        return {
+            "paths": list(self.paths),
+            "schedule_minutes": self.schedule_minutes,
+            "probe_backup": self.probe_backup,
+        }
+
+
 @dataclass(frozen=True, slots=True)
 class EnvironmentConfig:
     """Typed model for a single deployment environment."""
@@ -62,11 +291,24 @@ class EnvironmentConfig:
     domain_name: str
     file_path: str
     cloudfront_region: str
-    replication_target_region: str
+    replication_target_regions: tuple[str, ...]
     cloudfront_price_class: Literal["PRICE_CLASS_100"]
     acm_ssm_params: Mapping[str, str]
     backup_website_bucket_ssm_params: Mapping[str, str]
     geo_restrictions: GeoRestrictionsConfig
+    asset_deployment_mode: Literal["incremental", "releases", "bucket_deployment"] = (
+        "incremental"
+    )
+    max_invalidation_paths: int = 20
+    precompressed_encodings: bool = False
+    backup_sync: Literal["deployment", "replication"] = "deployment"
+    active_release: str | None = None
+    retain_releases: int | None = None
+    edge_routes: Mapping[str, EdgeRouteConfig] | None = None
+    access_logs: bool = False
+    access_log_retention_days: int = 90
+    monitoring: MonitoringConfig | None = None
+    synthetic_probe: SyntheticProbeConfig | None = None
 
     @classmethod
     def from_context(cls, value: Mapping[str, Any]) -> "EnvironmentConfig":
@@ -83,9 +325,7 @@ class EnvironmentConfig:
             value, "backup_website_bucket_ssm_params"
         )
         cloudfront_region = str(value.get("cloudfront_region", "us-east-1"))
-        replication_target_region = str(
-            value.get("replication_target_region", "us-east-2")
-        )
+        replication_target_regions = _parse_replication_target_regions(value)
 
         cloudfront_price_class = str(
             value.get("cloudfront_price_class", "PRICE_CLASS_100")
@@ -97,18 +337,179 @@ class EnvironmentConfig:
             value.get("geo_restrictions")
         )
 
+        asset_deployment_mode = str(value.get("asset_deployment_mode", "incremental"))
+        if asset_deployment_mode not in {
+            "incremental",
+            "releases",
+            "bucket_deployment",
+        }:
+            raise ValueError(
+                "asset_deployment_mode must be one of: "
+                "incremental, releases, bucket_deployment"
+            )
+
+        max_invalidation_paths = value.get("max_invalidation_paths", 20)
+        if (
+            not isinstance(max_invalidation_paths, int)
+            or isinstance(max_invalidation_paths, bool)
+            or max_invalidation_paths < 1
+        ):
+            raise ValueError("max_invalidation_paths must be a positive integer")
+
+        precompressed_encodings = value.get("precompressed_encodings", False)
+        if not isinstance(precompressed_encodings, bool):
+            raise ValueError("precompressed_encodings must be a boolean")
+        if precompressed_encodings and asset_deployment_mode == "bucket_deployment":
+            raise ValueError(
+                "precompressed_encodings requires asset_deployment_mode "
+                "incremental or releases"
+            )
+
+        backup_sync = str(value.get("backup_sync", "deployment"))
+        if backup_sync not in {"deployment", "replication"}:
+            raise ValueError("backup_sync must be one of: deployment, replication")
+
+        active_release = value.get("active_release")
+        if active_release is not None:
+            if asset_deployment_mode != "releases":
+                raise ValueError(
+                    "active_release requires asset_deployment_mode releases"
+                )
+            if not isinstance(active_release, str) or not re.fullmatch(
+                r"[0-9a-f]{16}", active_release
+            ):
+                raise ValueError(
+                    "active_release must be a 16-character release id "
+                    "(a key under releases/ in the website bucket)"
+                )
+
+        retain_releases = value.get("retain_releases")
+        if retain_releases is not None:
+            if asset_deployment_mode != "releases":
+                raise ValueError(
+                    "retain_releases requires asset_deployment_mode releases"
+                )
+            if (
+                not isinstance(retain_releases, int)
+                or isinstance(retain_releases, bool)
+                or retain_releases < 1
+            ):
+                raise ValueError("retain_releases must be a positive integer")
+
+        edge_routes = _parse_edge_routes(value)
+
+        access_logs = value.get("access_logs", False)
+        if not isinstance(access_logs, bool):
+            raise ValueError("access_logs must be a boolean")
+
+        access_log_retention_days = value.get("access_log_retention_days", 90)
+        if (
+            not isinstance(access_log_retention_days, int)
+            or isinstance(access_log_retention_days, bool)
+            or access_log_retention_days < 1
+        ):
+            raise ValueError("access_log_retention_days must be a positive integer")
+
+        monitoring = (
+            MonitoringConfig.from_context(value["monitoring"])
+            if value.get("monitoring") is not None
+            else None
+        )
+        synthetic_probe = (
+            SyntheticProbeConfig.from_context(value["synthetic_probe"])
+            if value.get("synthetic_probe") is not None
+            else None
+        )
+
         return cls(
             account_id=str(value["account_id"]),
             region=str(value["region"]),
             domain_name=str(value["domain_name"]),
             file_path=str(value["file_path"]),
             cloudfront_region=cloudfront_region,
-            replication_target_region=replication_target_region,
+            replication_target_regions=replication_target_regions,
             cloudfront_price_class=cloudfront_price_class,
             acm_ssm_params=acm_ssm_params,
             backup_website_bucket_ssm_params=backup_params,
             geo_restrictions=geo_restrictions,
+            asset_deployment_mode=asset_deployment_mode,
+            max_invalidation_paths=max_invalidation_paths,
+            precompressed_encodings=precompressed_encodings,
+            backup_sync=backup_sync,
+            active_release=active_release,
+            retain_releases=retain_releases,
+            edge_routes=edge_routes,
+            access_logs=access_logs,
+            access_log_retention_days=access_log_retention_days,
+            monitoring=monitoring,
+            synthetic_probe=synthetic_probe,
+        )
+
+
+def _parse_replication_target_regions(value: Mapping[str, Any]) -> tuple[str, ...]:
+    """Read the SSM replication target regions from context data.
+
+    Accepts the `replication_target_regions` list, falling back to the single
+    `replication_target_region` key and finally to `us-east-2`.
+    """
+    if "replication_target_regions" not in value:
+        return (str(value.get("replication_target_region", "us-east-2")),)
+
+    raw = value["replication_target_regions"]
+    if not isinstance(raw, list) or not raw:
+        raise TypeError(
+            "replication_target_regions must be a non-empty list of regions"
+        )
+    if not all(isinstance(region, str) for region in raw):
+        raise TypeError("replication_target_regions must contain only strings")
+    return tuple(dict.fromkeys(raw))
+
+
+def _parse_edge_routes(
+    value: Mapping[str, Any],
+) -> dict[str, EdgeRouteConfig] | None:
+    """Read the edge route table from context data.
+
+    Returns None when `edge_routes` is absent, leaving the distribution's
+    default routes in place. Rewrite targets may not be routed themselves, so
+    every request needs a single lookup.
+    """
+    if "edge_routes" not in value:
+        return None
+
+    raw = value["edge_routes"]
+    if not isinstance(raw, Mapping):
+        raise TypeError("edge_routes must be a mapping of viewer paths to routes")
+
+    routes: dict[str, EdgeRouteConfig] = {}
+    for path, route in raw.items():
+        if (
+            not isinstance(path, str)
+            or not path.startswith("/")
+            or any(char.isspace() or char in "?#" for char in path)
+        ):
+            raise ValueError(
+                f"edge_routes key {path!r} must be a path starting with / "
+                "without whitespace, a query string or a fragment"
+            )
+        if len(path.encode("utf-8")) > EDGE_ROUTE_MAX_PATH_BYTES:
+            raise ValueError(
+                f"edge_routes key {path!r} must be at most "
+                f"{EDGE_ROUTE_MAX_PATH_BYTES} bytes"
+            )
+        routes[path] = EdgeRouteConfig.from_context(path, route)
+
+    chained = sorted(
+        path
+        for path, route in routes.items()
+        if route.action == "rewrite" and route.target in routes
+    )
+    if chained:
+        raise ValueError(
+            "edge_routes rewrites must target an object, not another route: "
+            + ", ".join(chained)
         )
+    return routes
 
 
 def _require_string_mapping(value: Mapping[str, Any], key: str) -> dict[str, str]:
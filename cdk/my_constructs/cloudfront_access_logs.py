@@ -0,0 +1,168 @@
+"""CloudFront standard logging (v2) construct.
+
+Delivers a distribution's access logs to a dedicated S3 bucket in Parquet
+through CloudWatch Logs vended log delivery.
+"""
+
+from aws_cdk import (
+    ArnFormat,
+    aws_cloudfront as cloudfront,
+    aws_iam as iam,
+    aws_logs as logs,
+    aws_s3 as s3,
+    Duration,
+    RemovalPolicy,
+    Stack,
+    Token,
+)
+from constructs import Construct
+from typing import Sequence
+
+# CloudFront delivers standard logs (v2) only through a delivery source in
+# us-east-1.
+ACCESS_LOG_DELIVERY_REGION = "us-east-1"
+
+# Fields delivered for each request: enough for cache efficiency and latency
+# analysis (see benchmarks/access_log_report.py), without viewer IPs, user
+# agents, cookies or query strings.
+ACCESS_LOG_FIELDS = (
+    "timestamp",
+    "DistributionId",
+    "x-edge-location",
+    "cs-method",
+    "cs-uri-stem",
+    "cs-protocol-version",
+    "sc-status",
+    "sc-bytes",
+    "sc-content-type",
+    "x-edge-result-type",
+    "x-edge-response-result-type",
+    "x-edge-detailed-result-type",
+    "time-taken",
+    "time-to-first-byte",
+    "origin-fbl",
+    "origin-lbl",
+    "cache-behavior-path-pattern",
+)
+
+# Hive-style partitions, so Athena and offline tools can prune by hour.
+ACCESS_LOG_SUFFIX_PATH = "{DistributionId}/{yyyy}/{MM}/{dd}/{HH}"
+
+
+class CloudFrontAccessLogs(Construct):
+    """Standard logging (v2) for a CloudFront distribution.
+
+    Features:
+    - Dedicated, encrypted, TLS-only log bucket with public access blocked
+    - Logs expire after `retention_days`
+    - Parquet output partitioned by distribution and hour
+    - Only the fields in ACCESS_LOG_FIELDS are delivered
+
+    Attributes:
+        log_bucket (s3.Bucket): Bucket the logs are delivered to
+        delivery (logs.CfnDelivery): The log delivery
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        distribution: cloudfront.IDistribution,
+        retention_days: int = 90,
+        record_fields: Sequence[str] = ACCESS_LOG_FIELDS,
+        **kwargs,
+    ) -> None:
+        """Initialize the CloudFrontAccessLogs construct.
+
+        Args:
+            scope: The scope/parent construct. Its stack must be in us-east-1
+            id: The logical ID of the construct
+            distribution: The distribution to log, from any stack
+            retention_days: Days log objects are kept before they expire
+            record_fields: Log fields to deliver, in column order
+            **kwargs: Additional keyword arguments passed to the parent Construct
+        """
+        super().__init__(scope, id, **kwargs)
+
+        stack = Stack.of(self)
+        if (
+            not Token.is_unresolved(stack.region)
+            and stack.region != ACCESS_LOG_DELIVERY_REGION
+        ):
+            raise ValueError(
+                "CloudFront access log delivery must be created in "
+                f"{ACCESS_LOG_DELIVERY_REGION}, not {stack.region}"
+            )
+
+        self.log_bucket = s3.Bucket(
+            self,
+            "LogBucket",
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            enforce_ssl=True,
+            # Log objects are written once, so versioning only keeps expired
+            # logs around briefly as noncurrent versions.
+            versioned=True,
+            removal_policy=RemovalPolicy.DESTROY,
+            lifecycle_rules=[
+                s3.LifecycleRule(
+                    expiration=Duration.days(retention_days),
+                    noncurrent_version_expiration=Duration.days(1),
+                    abort_incomplete_multipart_upload_after=Duration.days(1),
+                    enabled=True,
+                ),
+                # S3 rejects this in a rule that also sets expiration days.
+                s3.LifecycleRule(expired_object_delete_marker=True, enabled=True),
+            ],
+        )
+
+        source = logs.CfnDeliverySource(
+            self,
+            "DeliverySource",
+            name=f"{stack.stack_name}-cloudfront-access-logs",
+            log_type="ACCESS_LOGS",
+            resource_arn=distribution.distribution_arn,
+        )
+        # Vended log delivery writes with its service principal; only
+        # delivery sources in this account may use it.
+        self.log_bucket.add_to_resource_policy(
+            iam.PolicyStatement(
+                sid="AllowCloudFrontLogDelivery",
+                principals=[iam.ServicePrincipal("delivery.logs.amazonaws.com")],
+                actions=["s3:PutObject"],
+                resources=[self.log_bucket.arn_for_objects("*")],
+                conditions={
+                    "StringEquals": {
+                        "s3:x-amz-acl": "bucket-owner-full-control",
+                        "aws:SourceAccount": stack.account,
+                    },
+                    "ArnLike": {
+                        "aws:SourceArn": stack.format_arn(
+                            service="logs",
+                            resource="delivery-source",
+                            resource_name="*",
+                            arn_format=ArnFormat.COLON_RESOURCE_NAME,
+                        )
+                    },
+                },
+            )
+        )
+        destination = logs.CfnDeliveryDestination(
+            self,
+            "DeliveryDestination",
+            name=f"{stack.stack_name}-cloudfront-access-logs-s3",
+            destination_resource_arn=self.log_bucket.bucket_arn,
+            output_format="parquet",
+        )
+        self.delivery = logs.CfnDelivery(
+            self,
+            "Delivery",
+            delivery_source_name=source.name,
+            delivery_destination_arn=destination.attr_arn,
+            record_fields=list(record_fields),
+            s3_suffix_path=ACCESS_LOG_SUFFIX_PATH,
+            s3_enable_hive_compatible_path=True,
+        )
+        self.delivery.add_dependency(source)
+        # The bucket policy must exist before the first delivery is written.
+        self.delivery.node.add_dependency(self.log_bucket.policy)
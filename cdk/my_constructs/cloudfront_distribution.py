@@ -10,11 +10,82 @@ from aws_cdk import (
     aws_certificatemanager as acm,
     RemovalPolicy,
     Duration,
+    Names,
 )
 from aws_cdk.aws_cloudfront_origins import S3BucketOrigin, OriginGroup
 from aws_cdk.aws_cloudfront import HeadersFrameOption, HeadersReferrerPolicy
 from constructs import Construct
-from typing import Optional
+import hashlib
+import json
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional
+
+# Clean URLs rewritten by the viewer-request function, mapped to the object
+# they serve. Used as the edge routes when none are configured. Deployments
+# also invalidate these aliases when the object changes.
+CLEAN_URL_REWRITES = {
+    "/resume": "/resume.pdf",
+    "/resume/": "/resume.pdf",
+}
+
+# Status codes an edge route can redirect with, and their reason phrases.
+REDIRECT_STATUS_CODES = {
+    301: "Moved Permanently",
+    302: "Found",
+    307: "Temporary Redirect",
+    308: "Permanent Redirect",
+}
+
+# Encodings the frontend build precompresses every file with one of
+# PRECOMPRESSED_EXTENSIONS into, in order of preference, with the suffix of the
+# variant. Keep PRECOMPRESSED_EXTENSIONS in sync with COMPRESSIBLE_EXTENSIONS in
+# frontend/scripts/precompress.mjs.
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+PRECOMPRESSED_EXTENSIONS = (
+    ".css",
+    ".html",
+    ".ico",
+    ".js",
+    ".json",
+    ".map",
+    ".mjs",
+    ".svg",
+    ".txt",
+    ".webmanifest",
+    ".xml",
+)
+
+# Edge TTLs per cache tier. Origin Cache-Control headers are honoured within
+# [min_ttl, max_ttl]; default_ttl applies to objects without one. `compress`
+# is off where viewers fetch byte ranges, so every range request is served
+# from a single identity-encoded cache entry.
+CACHE_POLICY_TIERS = {
+    "immutable": {
+        "default_ttl": Duration.days(365),
+        "max_ttl": Duration.days(365),
+        "compress": True,
+    },
+    "short": {
+        "default_ttl": Duration.minutes(5),
+        "max_ttl": Duration.hours(1),
+        "compress": True,
+    },
+    "medium": {
+        "default_ttl": Duration.days(1),
+        "max_ttl": Duration.days(7),
+        "compress": False,
+    },
+}
+
+# Path pattern to cache tier, in precedence order. Everything else uses the
+# default behavior and `WebsiteCachePolicy`. `/resume*` also covers the clean
+# URLs rewritten to the PDF, since behaviors match the URI before rewriting.
+DEFAULT_ADDITIONAL_BEHAVIORS = {
+    "/assets/*": "immutable",
+    "/index.html": "short",
+    "/": "short",
+    "/resume*": "medium",
+}
 
 
 class CloudFrontDistribution(Construct):
@@ -24,8 +95,12 @@ class CloudFrontDistribution(Construct):
     - S3 origin with Origin Access Control (OAC) for secure access
     - Automatic failover to backup bucket on 5xx errors
     - Custom cache policy optimized for static assets (30-day default TTL)
+    - Path-specific behaviors with their own cache policies (long-lived
+      fingerprinted bundles, short-lived HTML, medium-lived resume PDF)
     - Strong security headers (CSP, HSTS, X-Frame-Options, etc.)
-    - CloudFront Functions for URL rewriting (e.g., /resume → /resume.pdf)
+    - A CloudFront Function that rewrites and redirects URLs from a
+      KeyValueStore route table (e.g., /resume → /resume.pdf) and serves
+      build-time Brotli/gzip variants chosen by Accept-Encoding
     - Configurable geographic restrictions
     - GZIP/Brotli compression enabled
     - Error page customization for 4xx/5xx responses
@@ -33,7 +108,11 @@ class CloudFrontDistribution(Construct):
     Attributes:
         cf_distribution (cloudfront.Distribution): The CloudFront distribution
         website_cache_policy (cloudfront.CachePolicy): Custom cache policy
+        cache_policies (dict): Cache tier name to the policy of its behaviors
         response_headers_policy (cloudfront.ResponseHeadersPolicy): Security headers policy
+        edge_routes_store (cloudfront.KeyValueStore): Route table read by the
+            viewer-request function
+        clean_url_aliases (dict): Object key to the clean URLs rewritten to it
     """
 
     def __init__(
@@ -46,6 +125,10 @@ class CloudFrontDistribution(Construct):
         website_s3_bucket: s3.IBucket,
         geo_restrictions: Optional[dict] = None,
         price_class: str = "PRICE_CLASS_100",
+        additional_behaviors: Optional[Dict[str, str]] = None,
+        precompressed_encodings: bool = False,
+        origin_path: Optional[str] = None,
+        edge_routes: Optional[Dict[str, Dict[str, Any]]] = None,
         **kwargs,
     ) -> None:
         """Initialize the CloudFrontDistribution construct.
@@ -61,6 +144,20 @@ class CloudFrontDistribution(Construct):
                 - restriction_type: 'none', 'blacklist', or 'whitelist'
                 - locations: List of ISO 3166-1 country codes (e.g., ['RU', 'KP'])
             price_class: CloudFront price class name (e.g., PRICE_CLASS_100)
+            additional_behaviors: Optional dict of path pattern to a cache
+                tier in CACHE_POLICY_TIERS ('immutable', 'short' or 'medium'),
+                in precedence order. Defaults to DEFAULT_ADDITIONAL_BEHAVIORS
+            precompressed_encodings: Serve the `.br`/`.gz` variants the
+                frontend build writes next to every file with one of
+                PRECOMPRESSED_EXTENSIONS, picked from the viewer's
+                Accept-Encoding. Every such file must have both variants
+            origin_path: Optional key prefix (e.g., '/releases/<id>') both
+                origins serve from. Changing it switches every path to another
+                deployed release at once
+            edge_routes: Optional dict of viewer path to its route, either
+                {'rewrite': '/object'} or {'redirect': '/location',
+                'status_code': 301}. Published to the KeyValueStore the
+                viewer-request function reads. Defaults to CLEAN_URL_REWRITES
             **kwargs: Additional keyword arguments passed to the parent Construct
         """
         super().__init__(scope, id, **kwargs)
@@ -68,26 +165,60 @@ class CloudFrontDistribution(Construct):
         # Use default empty geo-restrictions if not provided
         if geo_restrictions is None:
             geo_restrictions = {"restriction_type": "none", "locations": []}
+        if additional_behaviors is None:
+            additional_behaviors = DEFAULT_ADDITIONAL_BEHAVIORS
+        if edge_routes is None:
+            edge_routes = {
+                path: {"rewrite": target} for path, target in CLEAN_URL_REWRITES.items()
+            }
+
+        unknown_tiers = set(additional_behaviors.values()) - set(CACHE_POLICY_TIERS)
+        if unknown_tiers:
+            raise ValueError(
+                f"Unknown cache tier(s) {sorted(unknown_tiers)}; expected one of: "
+                + ", ".join(CACHE_POLICY_TIERS)
+            )
 
         # Create a shared Origin Access Control for both S3 origins.
         origin_access_control = self._build_origin_access_control(domain_name)
 
         self.website_cache_policy = self._build_cache_policy()
-        self.response_headers_policy = self._build_response_headers_policy(domain_name)
+        self.cache_policies = {
+            tier: self._build_tier_cache_policy(tier)
+            for tier in CACHE_POLICY_TIERS
+            if tier in additional_behaviors.values()
+        }
+        self.response_headers_policy = self._build_response_headers_policy(
+            domain_name, precompressed_encodings
+        )
         origin_group = self._build_origin_group(
             website_s3_bucket,
             backup_bucket_name,
             origin_access_control,
+            origin_path,
+        )
+        self.edge_routes_store = self._build_edge_routes_store(edge_routes)
+        edge_routing_function = self._build_edge_routing_function(
+            precompressed_encodings
+        )
+        self.clean_url_aliases = clean_url_aliases(
+            {
+                path: route["rewrite"]
+                for path, route in edge_routes.items()
+                if "rewrite" in route
+            }
         )
-        resume_redirect_function = self._build_resume_redirect_function()
 
         distribution_kwargs = self._build_distribution_kwargs(
             domain_name=domain_name,
             certificate=certificate,
             origin_group=origin_group,
-            resume_redirect_function=resume_redirect_function,
+            edge_routing_function=edge_routing_function,
+            edge_routes=edge_routes,
             geo_restrictions=geo_restrictions,
             price_class=price_class,
+            additional_behaviors=additional_behaviors,
+            precompressed_encodings=precompressed_encodings,
         )
 
         self.cf_distribution = cloudfront.Distribution(
@@ -124,14 +255,43 @@ class CloudFrontDistribution(Construct):
             enable_accept_encoding_gzip=True,
         )
 
+    def _build_tier_cache_policy(self, tier: str) -> cloudfront.CachePolicy:
+        """Create the cache policy for the behaviors of one CACHE_POLICY_TIERS tier."""
+        settings = CACHE_POLICY_TIERS[tier]
+        return cloudfront.CachePolicy(
+            self,
+            f"{tier.capitalize()}CachePolicy",
+            comment=f"Cache policy for {tier} website paths",
+            default_ttl=settings["default_ttl"],
+            max_ttl=settings["max_ttl"],
+            min_ttl=Duration.seconds(0),
+            cookie_behavior=cloudfront.CacheCookieBehavior.none(),
+            header_behavior=cloudfront.CacheHeaderBehavior.none(),
+            query_string_behavior=cloudfront.CacheQueryStringBehavior.none(),
+            enable_accept_encoding_brotli=settings["compress"],
+            enable_accept_encoding_gzip=settings["compress"],
+        )
+
     def _build_response_headers_policy(
-        self, domain_name: str
+        self, domain_name: str, precompressed_encodings: bool
     ) -> cloudfront.ResponseHeadersPolicy:
         """Create the response headers policy with security controls."""
+        custom_headers_behavior = None
+        if precompressed_encodings:
+            # The representation behind a URL now depends on Accept-Encoding,
+            # so shared caches downstream must key on it too.
+            custom_headers_behavior = cloudfront.ResponseCustomHeadersBehavior(
+                custom_headers=[
+                    cloudfront.ResponseCustomHeader(
+                        header="Vary", value="Accept-Encoding", override=False
+                    )
+                ]
+            )
         return cloudfront.ResponseHeadersPolicy(
             self,
             "ResponseHeadersPolicy",
             comment=f"Response headers policy for {domain_name}",
+            custom_headers_behavior=custom_headers_behavior,
             cors_behavior=cloudfront.ResponseHeadersCorsBehavior(
                 access_control_allow_credentials=False,
                 access_control_allow_headers=["*"],
@@ -186,41 +346,65 @@ class CloudFrontDistribution(Construct):
         website_s3_bucket: s3.IBucket,
         backup_bucket_name: str,
         origin_access_control: cloudfront.IOriginAccessControl,
+        origin_path: Optional[str] = None,
     ) -> OriginGroup:
         """Build the origin group that fails over to the backup bucket."""
         return OriginGroup(
             primary_origin=S3BucketOrigin.with_origin_access_control(
                 website_s3_bucket,
                 origin_access_control=origin_access_control,
+                origin_path=origin_path,
             ),
             fallback_origin=S3BucketOrigin.with_origin_access_control(
                 s3.Bucket.from_bucket_name(
                     self, "BackupWebsiteBucketOrigin", backup_bucket_name
                 ),
                 origin_access_control=origin_access_control,
+                origin_path=origin_path,
             ),
             fallback_status_codes=[500, 502, 503, 504],
         )
 
-    def _build_resume_redirect_function(self) -> cloudfront.Function:
-        """Create the CloudFront Function that rewrites /resume URLs."""
-        return cloudfront.Function(
+    def _build_edge_routes_store(
+        self, edge_routes: Dict[str, Dict[str, Any]]
+    ) -> cloudfront.KeyValueStore:
+        """Create the KeyValueStore holding the edge route table.
+
+        A store only imports its data when it is created, so the name carries
+        a hash of the routes: a changed table is published as a new store and
+        the function is re-associated with it, without touching the
+        distribution.
+        """
+        data = json.dumps({"data": edge_route_entries(edge_routes)}, sort_keys=True)
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+        return cloudfront.KeyValueStore(
             self,
-            "ResumeRewriteFunction",
-            code=cloudfront.FunctionCode.from_inline("""
-                function handler(event) {
-                    var request = event.request;
-                    var uri = request.uri;
+            "EdgeRoutesStore",
+            key_value_store_name=(
+                f"{Names.unique_resource_name(self, max_length=47, separator='-')}"
+                f"-{digest}"
+            ),
+            comment="Edge URL rewrites and redirects",
+            source=cloudfront.ImportSource.from_inline(data),
+        )
 
-                    // Handle /resume → rewrite
-                    if (uri === "/resume" || uri === "/resume/") {
-                        request.uri = "/resume.pdf";
-                        return request;
-                    }
+    def _build_edge_routing_function(
+        self, precompressed_encodings: bool
+    ) -> cloudfront.Function:
+        """Create the viewer-request CloudFront Function.
 
-                    return request;
-                    }
-                """),
+        It applies the rewrite or redirect stored for the request URI in the
+        edge routes store and, with `precompressed_encodings`, picks the
+        precompressed variant to serve.
+        """
+        return cloudfront.Function(
+            self,
+            "EdgeRoutingFunction",
+            code=cloudfront.FunctionCode.from_inline(
+                viewer_request_function_code(precompressed_encodings)
+            ),
+            runtime=cloudfront.FunctionRuntime.JS_2_0,
+            key_value_store=self.edge_routes_store,
         )
 
     def _build_distribution_kwargs(
@@ -229,26 +413,36 @@ class CloudFrontDistribution(Construct):
         domain_name: str,
         certificate: acm.ICertificate,
         origin_group: OriginGroup,
-        resume_redirect_function: cloudfront.Function,
+        edge_routing_function: cloudfront.Function,
+        edge_routes: Dict[str, Dict[str, Any]],
         geo_restrictions: Optional[dict],
         price_class: str,
+        additional_behaviors: Dict[str, str],
+        precompressed_encodings: bool,
     ) -> dict:
         """Assemble the CloudFront distribution keyword arguments."""
         distribution_kwargs = {
-            "default_behavior": cloudfront.BehaviorOptions(
-                origin=origin_group,
-                viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
-                allowed_methods=cloudfront.AllowedMethods.ALLOW_GET_HEAD,
-                cached_methods=cloudfront.CachedMethods.CACHE_GET_HEAD,
+            "default_behavior": self._build_behavior(
+                origin_group=origin_group,
                 cache_policy=self.website_cache_policy,
-                response_headers_policy=self.response_headers_policy,
-                function_associations=[
-                    cloudfront.FunctionAssociation(
-                        event_type=cloudfront.FunctionEventType.VIEWER_REQUEST,
-                        function=resume_redirect_function,
-                    )
-                ],
+                rewrite_function=edge_routing_function,
             ),
+            "additional_behaviors": {
+                path_pattern: self._build_behavior(
+                    origin_group=origin_group,
+                    cache_policy=self.cache_policies[tier],
+                    compress=CACHE_POLICY_TIERS[tier]["compress"],
+                    # Without encoding negotiation, only behaviors that can
+                    # see a routed URL pay for the viewer-request function.
+                    rewrite_function=(
+                        edge_routing_function
+                        if precompressed_encodings
+                        or any(fnmatchcase(path, path_pattern) for path in edge_routes)
+                        else None
+                    ),
+                )
+                for path_pattern, tier in additional_behaviors.items()
+            },
             "error_responses": [
                 cloudfront.ErrorResponse(
                     http_status=403, response_page_path="/error.html"
@@ -283,6 +477,34 @@ class CloudFrontDistribution(Construct):
 
         return distribution_kwargs
 
+    def _build_behavior(
+        self,
+        *,
+        origin_group: OriginGroup,
+        cache_policy: cloudfront.ICachePolicy,
+        rewrite_function: Optional[cloudfront.Function],
+        compress: bool = True,
+    ) -> cloudfront.BehaviorOptions:
+        """Build a GET/HEAD behavior served from the origin group."""
+        function_associations = []
+        if rewrite_function is not None:
+            function_associations.append(
+                cloudfront.FunctionAssociation(
+                    event_type=cloudfront.FunctionEventType.VIEWER_REQUEST,
+                    function=rewrite_function,
+                )
+            )
+        return cloudfront.BehaviorOptions(
+            origin=origin_group,
+            viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+            allowed_methods=cloudfront.AllowedMethods.ALLOW_GET_HEAD,
+            cached_methods=cloudfront.CachedMethods.CACHE_GET_HEAD,
+            cache_policy=cache_policy,
+            response_headers_policy=self.response_headers_policy,
+            compress=compress,
+            function_associations=function_associations or None,
+        )
+
     def _resolve_price_class(self, price_class: str) -> cloudfront.PriceClass:
         """Map config value to CloudFront PriceClass enum."""
         mapping = {
@@ -322,3 +544,117 @@ class CloudFrontDistribution(Construct):
         # No geo restrictions configured means CloudFront should not receive
         # a GeoRestriction block at all.
         return None
+
+
+def viewer_request_function_code(precompressed_encodings: bool = False) -> str:
+    """Return the JavaScript of the viewer-request CloudFront Function.
+
+    The function looks the request URI up in its associated KeyValueStore,
+    whose values are encoded by `edge_route_entries`.
+    """
+    precompressed_declarations = ""
+    precompressed_handler = ""
+    if precompressed_encodings:
+        precompressed = {extension: True for extension in PRECOMPRESSED_EXTENSIONS}
+        precompressed_declarations = f"""
+                var encodings = {json.dumps([list(e) for e in PRECOMPRESSED_ENCODINGS])};
+                var precompressed = {json.dumps(precompressed, sort_keys=True)};
+
+                // True when an Accept-Encoding value lists `coding` without q=0.
+                function accepts(header, coding) {{
+                    var codings = header.split(",");
+                    for (var i = 0; i < codings.length; i++) {{
+                        var params = codings[i].split(";");
+                        if (params[0].trim().toLowerCase() !== coding) {{
+                            continue;
+                        }}
+                        for (var j = 1; j < params.length; j++) {{
+                            var param = params[j].trim().toLowerCase();
+                            if (param.indexOf("q=") === 0 && parseFloat(param.substring(2)) === 0) {{
+                                return false;
+                            }}
+                        }}
+                        return true;
+                    }}
+                    return false;
+                }}
+"""
+        precompressed_handler = """
+                    // Serve the build's precompressed variant the viewer
+                    // accepts; the rewritten URI is also the cache key.
+                    var uri = request.uri === "/" ? "/index.html" : request.uri;
+                    var dot = uri.lastIndexOf(".");
+                    var header = request.headers["accept-encoding"];
+                    if (header && dot > uri.lastIndexOf("/") && precompressed[uri.substring(dot).toLowerCase()]) {
+                        for (var i = 0; i < encodings.length; i++) {
+                            if (accepts(header.value, encodings[i][0])) {
+                                request.uri = uri + encodings[i][1];
+                                break;
+                            }
+                        }
+                    }
+"""
+    status_descriptions = {
+        str(code): reason for code, reason in REDIRECT_STATUS_CODES.items()
+    }
+    return f"""import cf from 'cloudfront';
+
+                var routes = cf.kvs();
+                var statusDescriptions = {json.dumps(status_descriptions, sort_keys=True)};
+{precompressed_declarations}
+                // The route stored for `uri`, or null when it has none.
+                async function lookup(uri) {{
+                    try {{
+                        return await routes.get(uri);
+                    }} catch (err) {{
+                        return null;
+                    }}
+                }}
+
+                async function handler(event) {{
+                    var request = event.request;
+
+                    // Routes are "rewrite <uri>" (e.g., /resume → /resume.pdf)
+                    // or "<status code> <location>" for redirects.
+                    var route = await lookup(request.uri);
+                    if (route) {{
+                        var space = route.indexOf(" ");
+                        var action = route.substring(0, space);
+                        var target = route.substring(space + 1);
+                        if (action !== "rewrite") {{
+                            return {{
+                                statusCode: parseInt(action, 10),
+                                statusDescription: statusDescriptions[action],
+                                headers: {{ location: {{ value: target }} }},
+                            }};
+                        }}
+                        request.uri = target;
+                    }}
+{precompressed_handler}
+                    return request;
+                }}
+                """
+
+
+def edge_route_entries(edge_routes: Dict[str, Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Encode edge routes as KeyValueStore import entries.
+
+    A rewrite is stored as "rewrite <uri>" and a redirect as
+    "<status code> <location>", keyed by the viewer path.
+    """
+    entries = []
+    for path, route in sorted(edge_routes.items()):
+        if "rewrite" in route:
+            value = f"rewrite {route['rewrite']}"
+        else:
+            value = f"{route.get('status_code', 301)} {route['redirect']}"
+        entries.append({"key": path, "value": value})
+    return entries
+
+
+def clean_url_aliases(rewrites: Dict[str, str]) -> Dict[str, List[str]]:
+    """Invert a clean URL rewrite map into object key to alias URLs."""
+    aliases: Dict[str, List[str]] = {}
+    for alias, target in sorted(rewrites.items()):
+        aliases.setdefault(target.lstrip("/"), []).append(alias)
+    return aliases
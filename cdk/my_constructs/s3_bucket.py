@@ -5,6 +5,7 @@ Provides a secure, versioned S3 bucket configured for:
 - Public access blocking
 - Versioning with configurable retention
 - TLS-only access enforcement
+- Optional replication to another bucket
 """
 
 from aws_cdk import (
@@ -24,21 +25,44 @@ class S3Bucket(Construct):
     - Automatic versioning with noncurrent version expiration
     - Public access blocking at the bucket level
     - Deny policy for non-TLS (non-HTTPS) access
+    - Optional replication of every write and delete to another bucket
 
     Attributes:
         bucket (s3.Bucket): The underlying S3 bucket resource
     """
 
-    def __init__(self, scope: Construct, id: str, **kwargs) -> None:
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        replication_destination: s3.IBucket | None = None,
+        **kwargs,
+    ) -> None:
         """Initialize the S3Bucket construct.
 
         Args:
             scope: The scope/parent construct
             id: The logical ID of the construct
+            replication_destination: Optional versioned bucket, in any region,
+                that S3 Replication keeps in sync with this one. New objects,
+                metadata and delete markers are replicated; objects written
+                before replication was enabled are not
             **kwargs: Additional keyword arguments passed to the parent Construct
         """
         super().__init__(scope, id, **kwargs)
 
+        replication_rules = None
+        if replication_destination is not None:
+            replication_rules = [
+                s3.ReplicationRule(
+                    destination=replication_destination,
+                    priority=0,
+                    # Pruned objects must disappear from the copy too.
+                    delete_marker_replication=True,
+                    filter=s3.Filter(prefix=""),
+                )
+            ]
+
         # Create the S3 bucket with security best practices
         self.bucket = s3.Bucket(
             self,
@@ -52,6 +76,7 @@ class S3Bucket(Construct):
                 restrict_public_buckets=True,
                 ignore_public_acls=True,
             ),
+            replication_rules=replication_rules,
         )
 
         # Add bucket lifecycle rule to manage old versions
@@ -1,32 +1,48 @@
 """SSM Parameter replication construct for cross-region disaster recovery.
 
 Uses a Lambda function to replicate SSM parameters from a source region to
-a target region. Useful for replicating certificates, configuration, and
+one or more target regions. Useful for replicating certificates, configuration, and
 other parameters needed for failover infrastructure.
 """
 
 from aws_cdk import (
     Duration,
-    aws_lambda as _lambda,
+    Stack,
+    Token,
+    aws_events as events,
+    aws_events_targets as targets,
     aws_iam as iam,
-    aws_logs as logs,
-    custom_resources as cr,
+    aws_lambda as _lambda,
+    aws_sqs as sqs,
     CustomResource,
 )
 from constructs import Construct
 import json
-from typing import List, Dict, Sequence
+from typing import List, Dict, Literal, Mapping, Sequence
+
+from my_constructs.ssm_replication_provider import SSMReplicationProvider
+
+# Construct id of the provider shared by replicators in the same stack.
+DEFAULT_PROVIDER_ID = "SSMReplicationProvider"
+
+# How long the event source mapping gathers change events before invoking
+# the event handler, so bursts of changes are written in one batch.
+DEFAULT_EVENT_BATCH_WINDOW = Duration.seconds(10)
+
+# Messages are retried this many times before moving to the dead-letter queue.
+EVENT_MAX_RECEIVE_COUNT = 5
 
 
 class SSMParameterReplicator(Construct):
     """Replicates AWS Systems Manager parameters across AWS regions.
 
     Uses a Lambda function triggered by a CloudFormation custom resource to
-    replicate specified SSM parameters from a source region to a target region.
-    This is essential for disaster recovery and cross-region failover scenarios.
+    replicate specified SSM parameters from a source region to one or more
+    target regions in parallel. This is essential for disaster recovery and cross-region failover scenarios.
 
-    The Lambda function has least-privilege IAM permissions scoped to specific
-    parameter paths.
+    The Lambda function and provider come from an `SSMReplicationProvider`
+    that several replicators can share; each replicator registers its
+    parameter paths so the shared role keeps least-privilege IAM permissions.
 
     Exposes the replication custom resource as `replication_custom_resource`
     so callers can attach dependencies only to that resource.
@@ -37,10 +53,31 @@ class SSMParameterReplicator(Construct):
         scope: Construct,
         id: str,
         source_region: str,
-        target_region: str,
-        parameters: List[Dict[str, str]],
+        parameters: List[Dict[str, str]] | None = None,
+        target_region: str | None = None,
+        target_regions: Sequence[str] | None = None,
         param_path_prefix: str = "",
-        update_triggers: Sequence[str] | str | None = None,
+        source_path: str | None = None,
+        target_path: str | None = None,
+        update_triggers: (
+            Mapping[str, Sequence[str] | str] | Sequence[str] | str | None
+        ) = None,
+        full_resync: bool = False,
+        fail_on_error: bool = True,
+        async_completion: bool = False,
+        provider: SSMReplicationProvider | None = None,
+        event_driven: bool = False,
+        event_batch_window: Duration | None = None,
+        event_batch_size: int = 100,
+        write_concurrency: int | None = None,
+        write_rate_limit: float | None = None,
+        query_interval: Duration | None = None,
+        total_timeout: Duration | None = None,
+        packaging: Literal["zip", "docker"] | None = None,
+        architecture: _lambda.Architecture | None = None,
+        memory_size: int | None = None,
+        tracing: bool | None = None,
+        metric_namespace: str | None = None,
         **kwargs,
     ) -> None:
         """Initialize the SSMParameterReplicator construct.
@@ -49,89 +86,205 @@ class SSMParameterReplicator(Construct):
             scope: The scope/parent construct
             id: The logical ID of the construct
             source_region: AWS region to read parameters from
-            target_region: AWS region to write parameters to
-            parameters: List of dicts with 'source' and 'target' parameter names
+            parameters: Optional list of dicts with 'source' and 'target'
+                       parameter names
                        Example: [{'source': '/param1', 'target': '/param1'}]
+            target_region: AWS region to write parameters to
+            target_regions: AWS regions to write parameters to. A single
+                invocation replicates to all of them in parallel. Combined
+                with `target_region` when both are given
             param_path_prefix: Optional path prefix for IAM permission scoping
+            source_path: Optional SSM path whose whole hierarchy is replicated.
+                Parameters are streamed page by page with a recursive
+                GetParametersByPath instead of being listed up front
+            target_path: Path that `source_path` is re-rooted under in the
+                target regions. Defaults to `source_path`
             update_triggers: Optional value or list of values that should trigger
-                replication when they change (for example certificate ARN)
+                replication when they change (for example certificate ARN).
+                A mapping of source parameter name to value(s) makes the
+                triggers per-parameter: an update then replicates only the
+                parameters whose triggers or mapping changed
+            full_resync: Replicate every parameter on each update instead of
+                only the changed ones
+            fail_on_error: Whether a failed target write fails the deployment.
+                When False, failures are reported as `FailedCount` in the
+                custom resource data instead
+            async_completion: Use the provider's isComplete polling so large
+                jobs resume across invocations instead of failing when one
+                60-second invocation runs out of time
+            provider: Shared `SSMReplicationProvider` to run on, possibly from
+                another stack in the same account/region. When omitted, the
+                replicator uses its stack's default provider, or a dedicated
+                one when any of the provider options below are given
+            event_driven: Also replicate out-of-band changes. An EventBridge
+                rule in the source region matches "Parameter Store Change"
+                events for the configured parameters or `source_path` and
+                queues them for the provider's event Lambda, which replicates
+                just the changed parameters. The stack must be deployed to
+                `source_region`. Deletions are not replicated
+            event_batch_window: How long change events are gathered before
+                they are replicated together. Defaults to 10 seconds
+            event_batch_size: Maximum number of change events replicated in
+                one invocation
+            write_concurrency: Maximum number of concurrent PutParameter calls
+            write_rate_limit: Starting PutParameter rate (requests/second); the
+                Lambda halves it on throttling and recovers gradually
+            query_interval: How often the provider polls for completion when
+                `async_completion` is enabled. Defaults to 10 seconds
+            total_timeout: Maximum time the provider keeps polling when
+                `async_completion` is enabled. Defaults to 30 minutes
+            packaging: "zip" deploys the handler module as a plain Python zip
+                function (no Docker build at synth, faster cold starts);
+                "docker" builds the container image from the asset directory
+            architecture: Lambda instruction set architecture. Defaults to
+                Graviton (ARM_64)
+            memory_size: Lambda memory in MB. Defaults to the Lambda default
+                (128 MB)
+            tracing: Enable X-Ray active tracing, with a subsegment per SSM
+                call. Requires "docker" packaging
+            metric_namespace: CloudWatch namespace for the handler's EMF
+                metrics. Defaults to "SSMParameterReplicator"
             **kwargs: Additional keyword arguments passed to the parent Construct
+
+        The provider options (`write_concurrency` through `metric_namespace`)
+        configure the Lambda itself, so they cannot be combined with a shared
+        `provider`; set them on the `SSMReplicationProvider` instead.
         """
         super().__init__(scope, id, **kwargs)
 
-        # Create CloudWatch log group for Lambda execution logs
-        replicate_ssm_log_group = logs.LogGroup(
-            self, "SSMParamReplicatorLogGroup", retention=logs.RetentionDays.ONE_YEAR
-        )
-
-        # Docker-based Lambda function that performs the replication
-        # Using Docker image allows us to include custom dependencies if needed
-        replicate_ssm_lambda = _lambda.DockerImageFunction(
-            self,
-            "SSMParamReplicatorLambda",
-            code=_lambda.DockerImageCode.from_image_asset(
-                "assets/lambdas/ssm_param_replicator/"
-            ),
-            timeout=Duration.seconds(60),
-            architecture=_lambda.Architecture.X86_64,
-            log_group=replicate_ssm_log_group,
+        normalized_target_regions = list(
+            dict.fromkeys(
+                ([target_region] if target_region else []) + list(target_regions or [])
+            )
         )
-
-        # Add IAM permissions following least-privilege principle
-        # Permissions are scoped to specific parameter path prefix if provided
-        # SSM ARNs do not include a leading slash, but wildcard suffix is required
-        # for prefix matching (e.g., parameter/ACMCertificates/*)
-        if param_path_prefix:
-            prefix = param_path_prefix.lstrip("/")
-            src_resource = (
-                f"arn:aws:ssm:{source_region}:{scope.account}:parameter/{prefix}/*"
+        if not normalized_target_regions:
+            raise ValueError("At least one target region is required for replication")
+        if not parameters and not source_path:
+            raise ValueError("Either parameters or source_path must be provided")
+        if target_path and not source_path:
+            raise ValueError("target_path requires source_path")
+        if event_batch_window is not None and not event_driven:
+            raise ValueError("event_batch_window requires event_driven")
+        stack_region = Stack.of(self).region
+        if (
+            event_driven
+            and not Token.is_unresolved(stack_region)
+            and stack_region != source_region
+        ):
+            raise ValueError(
+                "event_driven requires the replicator's stack to be deployed to "
+                f"source_region ({source_region}); EventBridge rules only see "
+                "changes in their own region"
             )
-            dst_resource = (
-                f"arn:aws:ssm:{target_region}:{scope.account}:parameter/{prefix}/*"
+
+        provider_options = {
+            key: value
+            for key, value in {
+                "write_concurrency": write_concurrency,
+                "write_rate_limit": write_rate_limit,
+                "query_interval": query_interval,
+                "total_timeout": total_timeout,
+                "packaging": packaging,
+                "architecture": architecture,
+                "memory_size": memory_size,
+                "tracing": tracing,
+                "metric_namespace": metric_namespace,
+            }.items()
+            if value is not None
+        }
+        if provider is not None:
+            if provider_options:
+                raise ValueError(
+                    f"{', '.join(provider_options)} cannot be set with a shared "
+                    "provider; configure the SSMReplicationProvider instead"
+                )
+            if async_completion and not provider.async_completion:
+                raise ValueError(
+                    "async_completion requires a provider created with "
+                    "async_completion=True"
+                )
+        elif provider_options or async_completion:
+            provider = SSMReplicationProvider(
+                self,
+                "Provider",
+                async_completion=async_completion,
+                **provider_options,
             )
         else:
-            src_resource = f"arn:aws:ssm:{source_region}:{scope.account}:parameter/*"
-            dst_resource = f"arn:aws:ssm:{target_region}:{scope.account}:parameter/*"
-
-        # Allow reading from source region SSM
-        replicate_ssm_lambda.add_to_role_policy(
-            iam.PolicyStatement(
-                actions=["ssm:GetParameter"],
-                resources=[src_resource],
-            )
-        )
+            provider = _default_provider(Stack.of(self))
 
-        # Allow writing to target region SSM
-        replicate_ssm_lambda.add_to_role_policy(
-            iam.PolicyStatement(
-                actions=["ssm:PutParameter"],
-                resources=[dst_resource],
-            )
-        )
+        # Register the paths this resource touches with the provider's role,
+        # following least-privilege principle. Permissions are scoped to the
+        # parameter path prefix if provided. SSM ARNs do not include a leading
+        # slash, but wildcard suffix is required for prefix matching
+        # (e.g., parameter/ACMCertificates/*)
+        src_paths: List[str] = []
+        dst_paths: List[str] = []
+        if parameters:
+            if param_path_prefix:
+                prefix_path = f"{param_path_prefix.lstrip('/')}/*"
+            else:
+                prefix_path = "*"
+            src_paths.append(prefix_path)
+            dst_paths.append(prefix_path)
+        if source_path:
+            dst_paths.append(f"{(target_path or source_path).strip('/')}/*")
+            if event_driven:
+                # Changed parameters are read individually with GetParameters.
+                src_paths.append(f"{source_path.strip('/')}/*")
 
-        # Create CloudFormation custom resource provider
-        # This wraps the Lambda in a CloudFormation-compatible interface
-        provider = cr.Provider(
-            self,
-            "ReplicateSSMProvider",
-            on_event_handler=replicate_ssm_lambda,
+        provider.grant_replication(
+            source_region=source_region,
+            target_regions=normalized_target_regions,
+            source_paths=src_paths,
+            # GetParametersByPath is authorized against the path itself; a
+            # recursive call then covers everything below it.
+            source_hierarchies=[source_path.strip("/")] if source_path else [],
+            target_paths=dst_paths,
         )
+        self.provider = provider
 
+        parameter_triggers: Dict[str, List[str]] = {}
         if update_triggers is None:
             normalized_update_triggers: List[str] = []
         elif isinstance(update_triggers, str):
             normalized_update_triggers = [update_triggers]
+        elif isinstance(update_triggers, Mapping):
+            normalized_update_triggers = []
+            sources = {param["source"] for param in parameters or []}
+            unknown = sorted(set(update_triggers) - sources)
+            if unknown:
+                raise ValueError(
+                    "update_triggers keys must be source names from parameters: "
+                    f"{', '.join(unknown)}"
+                )
+            parameter_triggers = {
+                source: [value] if isinstance(value, str) else list(value)
+                for source, value in update_triggers.items()
+            }
         else:
             normalized_update_triggers = list(update_triggers)
 
         # Include trigger values as custom resource properties so CloudFormation
         # will send Update events when source values change.
         resource_properties = {
-            "Parameters": json.dumps(parameters, sort_keys=True),
+            "Parameters": json.dumps(parameters or [], sort_keys=True),
             "SourceRegion": source_region,
-            "TargetRegion": target_region,
+            "TargetRegions": normalized_target_regions,
             "UpdateTriggers": normalized_update_triggers,
+            "FailOnError": "true" if fail_on_error else "false",
         }
+        if parameter_triggers:
+            # The handler hashes each parameter with its triggers and diffs
+            # against OldResourceProperties to replicate only what changed.
+            resource_properties["ParameterTriggers"] = parameter_triggers
+        if full_resync:
+            resource_properties["FullResync"] = "true"
+        if async_completion:
+            resource_properties["AsyncCompletion"] = "true"
+        if source_path:
+            resource_properties["SourcePath"] = source_path
+            resource_properties["TargetPath"] = target_path or source_path
 
         # Create the custom resource that triggers replication during stack creation
         self.replication_custom_resource = CustomResource(
@@ -140,3 +293,123 @@ class SSMParameterReplicator(Construct):
             service_token=provider.service_token,
             properties=resource_properties,
         )
+
+        if event_driven:
+            self._add_change_events(
+                provider,
+                parameters or [],
+                source_path,
+                replication={
+                    key: resource_properties[key]
+                    for key in (
+                        "Parameters",
+                        "SourceRegion",
+                        "TargetRegions",
+                        "SourcePath",
+                        "TargetPath",
+                    )
+                    if key in resource_properties
+                },
+                batch_window=event_batch_window or DEFAULT_EVENT_BATCH_WINDOW,
+                batch_size=event_batch_size,
+            )
+
+    def _add_change_events(
+        self,
+        provider: SSMReplicationProvider,
+        parameters: List[Dict[str, str]],
+        source_path: str | None,
+        replication: Dict,
+        batch_window: Duration,
+        batch_size: int,
+    ) -> None:
+        """Route Parameter Store change events through SQS to the event Lambda."""
+        names = [param["source"] for param in parameters]
+        if source_path:
+            names.append({"prefix": f"{source_path.rstrip('/')}/"})
+
+        dead_letter_queue = sqs.Queue(
+            self,
+            "ParameterChangeDeadLetterQueue",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+        )
+        self.change_queue = sqs.Queue(
+            self,
+            "ParameterChangeQueue",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+            # Lambda recommends six times the function timeout so messages
+            # are not redelivered while a batch is still being processed.
+            visibility_timeout=Duration.seconds(
+                provider.event_function.timeout.to_seconds() * 6
+            ),
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=EVENT_MAX_RECEIVE_COUNT, queue=dead_letter_queue
+            ),
+        )
+
+        # Each message carries this replicator's settings, so one event
+        # Lambda can serve every replicator on the provider.
+        self.change_rule = events.Rule(
+            self,
+            "ParameterChangeRule",
+            event_pattern=events.EventPattern(
+                source=["aws.ssm"],
+                detail_type=["Parameter Store Change"],
+                detail={
+                    "name": names,
+                    "operation": ["Create", "Update"],
+                    "type": ["String"],
+                },
+            ),
+            targets=[
+                targets.SqsQueue(
+                    self.change_queue,
+                    message=events.RuleTargetInput.from_object(
+                        {
+                            "Name": events.EventField.from_path("$.detail.name"),
+                            "Replication": replication,
+                        }
+                    ),
+                )
+            ],
+        )
+
+        # The policy and mapping live in this stack, next to the queue, so a
+        # provider in another stack never references this one.
+        consume_policy = iam.Policy(
+            self,
+            "ParameterChangeConsumePolicy",
+            roles=[provider.event_function.role],
+            statements=[
+                iam.PolicyStatement(
+                    actions=[
+                        "sqs:ReceiveMessage",
+                        "sqs:DeleteMessage",
+                        "sqs:ChangeMessageVisibility",
+                        "sqs:GetQueueAttributes",
+                        "sqs:GetQueueUrl",
+                    ],
+                    resources=[self.change_queue.queue_arn],
+                )
+            ],
+        )
+        event_source_mapping = _lambda.EventSourceMapping(
+            self,
+            "ParameterChangeEventSource",
+            target=provider.event_function,
+            event_source_arn=self.change_queue.queue_arn,
+            batch_size=batch_size,
+            max_batching_window=batch_window,
+            report_batch_item_failures=True,
+        )
+        event_source_mapping.node.add_dependency(consume_policy)
+
+
+def _default_provider(stack: Stack) -> SSMReplicationProvider:
+    """Return the stack's default replication provider, creating it once."""
+    existing = stack.node.try_find_child(DEFAULT_PROVIDER_ID)
+    if existing is not None:
+        return existing
+    return SSMReplicationProvider(stack, DEFAULT_PROVIDER_ID)
@@ -0,0 +1,300 @@
+"""Shared Lambda and custom resource provider for SSM parameter replication.
+
+One `SSMReplicationProvider` can back any number of `SSMParameterReplicator`
+custom resources, in its own stack or in other stacks of the same
+account/region. Each replicator registers the parameter paths it reads and
+writes, and the provider's role is scoped to the union of them.
+"""
+
+from aws_cdk import (
+    Duration,
+    Stack,
+    aws_ecr_assets as ecr_assets,
+    aws_lambda as _lambda,
+    aws_iam as iam,
+    aws_logs as logs,
+    custom_resources as cr,
+)
+from constructs import Construct
+from typing import Dict, List, Literal, Sequence
+
+REPLICATOR_ASSET_PATH = "assets/lambdas/ssm_param_replicator/"
+
+# Per-invocation timeout. With async completion each poll gets a fresh
+# budget, so this bounds a single invocation rather than the whole job.
+REPLICATOR_TIMEOUT = Duration.seconds(60)
+
+# Runtime for zip packaging; matches the Docker base image.
+REPLICATOR_RUNTIME = _lambda.Runtime.PYTHON_3_14
+
+# Files in the asset directory that only the Docker build uses.
+ZIP_ASSET_EXCLUDES = [
+    "Dockerfile",
+    ".dockerignore",
+    "requirements.txt",
+    "__pycache__",
+    "*.pyc",
+]
+
+
+class SSMReplicationProvider(Construct):
+    """Replication Lambda(s) and `cr.Provider` shared by replicator resources.
+
+    Pass the instance to `SSMParameterReplicator(provider=...)`. Use
+    `service_token` for the custom resources and `grant_replication` to add
+    the SSM paths each of them needs.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        write_concurrency: int = 4,
+        write_rate_limit: float = 10,
+        async_completion: bool = False,
+        query_interval: Duration | None = None,
+        total_timeout: Duration | None = None,
+        packaging: Literal["zip", "docker"] = "zip",
+        architecture: _lambda.Architecture = _lambda.Architecture.ARM_64,
+        memory_size: int | None = None,
+        tracing: bool = False,
+        metric_namespace: str = "SSMParameterReplicator",
+        **kwargs,
+    ) -> None:
+        """Initialize the SSMReplicationProvider construct.
+
+        Args:
+            scope: The scope/parent construct
+            id: The logical ID of the construct
+            write_concurrency: Maximum number of concurrent PutParameter calls
+            write_rate_limit: Starting PutParameter rate (requests/second); the
+                Lambda halves it on throttling and recovers gradually
+            async_completion: Add an isComplete handler so replicators that
+                opt into async completion can resume across invocations
+            query_interval: How often the provider polls for completion when
+                `async_completion` is enabled. Defaults to 10 seconds
+            total_timeout: Maximum time the provider keeps polling when
+                `async_completion` is enabled. Defaults to 30 minutes
+            packaging: "zip" deploys the handler module as a plain Python zip
+                function (no Docker build at synth, faster cold starts);
+                "docker" builds the container image from the asset directory
+            architecture: Lambda instruction set architecture. Defaults to
+                Graviton (ARM_64)
+            memory_size: Lambda memory in MB. Defaults to the Lambda default
+                (128 MB)
+            tracing: Enable X-Ray active tracing with a subsegment per SSM
+                call. Requires "docker" packaging, whose image installs the
+                X-Ray SDK from requirements.txt; the zip has only boto3
+            metric_namespace: CloudWatch namespace for the handler's embedded
+                metric format (EMF) metrics
+            **kwargs: Additional keyword arguments passed to the parent Construct
+        """
+        super().__init__(scope, id, **kwargs)
+
+        if write_concurrency < 1:
+            raise ValueError("write_concurrency must be at least 1")
+        if write_rate_limit <= 0:
+            raise ValueError("write_rate_limit must be greater than 0")
+        if packaging not in ("zip", "docker"):
+            raise ValueError("packaging must be one of: zip, docker")
+        if tracing and packaging == "zip":
+            raise ValueError(
+                'tracing requires packaging="docker"; the zip package does not '
+                "include the X-Ray SDK"
+            )
+
+        self.async_completion = async_completion
+        self._packaging = packaging
+        self._architecture = architecture
+        self._memory_size = memory_size
+        self._tracing = _lambda.Tracing.ACTIVE if tracing else None
+        self._statements: Dict[str, iam.PolicyStatement] = {}
+        self._granted_resources: Dict[str, set] = {}
+        self._event_function: _lambda.Function | None = None
+
+        # Create CloudWatch log group for Lambda execution logs
+        log_group = logs.LogGroup(
+            self, "SSMParamReplicatorLogGroup", retention=logs.RetentionDays.ONE_YEAR
+        )
+        self._log_group = log_group
+
+        environment = {
+            "WRITE_CONCURRENCY": str(write_concurrency),
+            "WRITE_RATE_LIMIT": str(write_rate_limit),
+            "METRIC_NAMESPACE": metric_namespace,
+            "TRACING_ENABLED": "true" if tracing else "false",
+        }
+        self._environment = environment
+
+        # Lambda function that performs the replication
+        self.on_event_function = self._create_function(
+            "SSMParamReplicatorLambda",
+            "lambda_handler",
+            log_group=log_group,
+            environment=environment,
+        )
+
+        # Create CloudFormation custom resource provider
+        # This wraps the Lambda in a CloudFormation-compatible interface
+        if async_completion:
+            # Same code and role, different entry point: the provider polls
+            # this handler until the remaining parameters are replicated.
+            is_complete_function = self._create_function(
+                "SSMParamReplicatorIsCompleteLambda",
+                "is_complete_handler",
+                log_group=log_group,
+                environment=environment,
+                role=self.on_event_function.role,
+            )
+            self.provider = cr.Provider(
+                self,
+                "ReplicateSSMProvider",
+                on_event_handler=self.on_event_function,
+                is_complete_handler=is_complete_function,
+                query_interval=query_interval or Duration.seconds(10),
+                total_timeout=total_timeout or Duration.minutes(30),
+            )
+        else:
+            self.provider = cr.Provider(
+                self,
+                "ReplicateSSMProvider",
+                on_event_handler=self.on_event_function,
+            )
+
+    @property
+    def service_token(self) -> str:
+        """Service token for replicator custom resources."""
+        return self.provider.service_token
+
+    @property
+    def event_function(self) -> _lambda.Function:
+        """Lambda that replicates parameter change events, created on first use.
+
+        Event-driven replicators attach their SQS queues to it. It shares the
+        replication role, so `grant_replication` covers it too.
+        """
+        if self._event_function is None:
+            self._event_function = self._create_function(
+                "SSMParamReplicatorEventLambda",
+                "event_handler",
+                log_group=self._log_group,
+                environment=self._environment,
+                role=self.on_event_function.role,
+            )
+        return self._event_function
+
+    def grant_replication(
+        self,
+        source_region: str,
+        target_regions: Sequence[str],
+        source_paths: Sequence[str] = (),
+        source_hierarchies: Sequence[str] = (),
+        target_paths: Sequence[str] = (),
+    ) -> None:
+        """Allow the replication Lambda to read and write the given SSM paths.
+
+        Paths are SSM ARN resource suffixes without a leading slash, for
+        example `ACMCertificates/*`. Registrations accumulate: each action's
+        single policy statement covers every registered resource.
+
+        Args:
+            source_region: Region the parameters are read from
+            target_regions: Regions the parameters are written to
+            source_paths: Paths read with GetParameters
+            source_hierarchies: Paths read with a recursive GetParametersByPath,
+                which is authorized against the path itself
+            target_paths: Paths diffed and written in every target region
+        """
+        account = Stack.of(self).account
+
+        # Allow reading explicitly listed parameters from source region SSM
+        self._add_resources(
+            ["ssm:GetParameters"],
+            [
+                f"arn:aws:ssm:{source_region}:{account}:parameter/{path}"
+                for path in source_paths
+            ],
+        )
+        self._add_resources(
+            ["ssm:GetParametersByPath"],
+            [
+                f"arn:aws:ssm:{source_region}:{account}:parameter/{path}"
+                for path in source_hierarchies
+            ],
+        )
+        # Allow diffing against and writing to every target region's SSM
+        self._add_resources(
+            ["ssm:GetParameters", "ssm:PutParameter"],
+            [
+                f"arn:aws:ssm:{region}:{account}:parameter/{path}"
+                for region in target_regions
+                for path in target_paths
+            ],
+        )
+
+    def _add_resources(self, actions: List[str], resources: List[str]) -> None:
+        """Add `resources` to the statement for `actions`, creating it once."""
+        key = ",".join(actions)
+        granted = self._granted_resources.setdefault(key, set())
+        new_resources = [
+            resource for resource in dict.fromkeys(resources) if resource not in granted
+        ]
+        if not new_resources:
+            return
+        granted.update(new_resources)
+
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = iam.PolicyStatement(actions=actions, resources=new_resources)
+            self._statements[key] = statement
+            self.on_event_function.add_to_role_policy(statement)
+        else:
+            statement.add_resources(*new_resources)
+
+    def _create_function(
+        self,
+        id: str,
+        handler: str,
+        log_group: logs.ILogGroup,
+        environment: Dict[str, str],
+        role: iam.IRole | None = None,
+    ) -> _lambda.Function:
+        """Create a replicator Lambda for `handler` in the configured packaging."""
+        common = {
+            "timeout": REPLICATOR_TIMEOUT,
+            "architecture": self._architecture,
+            "memory_size": self._memory_size,
+            "tracing": self._tracing,
+            "log_group": log_group,
+            "environment": environment,
+            "role": role,
+        }
+        if self._packaging == "docker":
+            # Image assets build for the host platform unless told otherwise.
+            platform = (
+                ecr_assets.Platform.LINUX_ARM64
+                if self._architecture == _lambda.Architecture.ARM_64
+                else ecr_assets.Platform.LINUX_AMD64
+            )
+            return _lambda.DockerImageFunction(
+                self,
+                id,
+                code=_lambda.DockerImageCode.from_image_asset(
+                    REPLICATOR_ASSET_PATH,
+                    cmd=[f"ssm_param_replicator.{handler}"],
+                    platform=platform,
+                ),
+                **common,
+            )
+
+        # The handler only needs boto3, which the Python runtime provides.
+        return _lambda.Function(
+            self,
+            id,
+            runtime=REPLICATOR_RUNTIME,
+            handler=f"ssm_param_replicator.{handler}",
+            code=_lambda.Code.from_asset(
+                REPLICATOR_ASSET_PATH, exclude=ZIP_ASSET_EXCLUDES
+            ),
+            **common,
+        )
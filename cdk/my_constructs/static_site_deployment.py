@@ -0,0 +1,382 @@
+"""Incremental static site deployment construct.
+
+Deploys a built site directory to an S3 bucket through a Lambda-backed
+custom resource that uploads only the files whose content hash changed since
+the previous release and prunes the files that were removed, instead of
+re-uploading the whole tree on every deploy. Every object is uploaded with an
+explicit Content-Type and the Cache-Control header its path is mapped to.
+
+For atomic releases each build is deployed under its own `releases/<id>/`
+prefix, CloudFront's origin path selects the active one, and
+`StaticSiteReleaseInvalidation` refreshes the release's mutable paths once
+the distribution has switched.
+"""
+
+from aws_cdk import (
+    CustomResource,
+    Duration,
+    FileSystem,
+    Stack,
+    Tags,
+    aws_cloudfront as cloudfront,
+    aws_iam as iam,
+    aws_lambda as _lambda,
+    aws_logs as logs,
+    aws_s3 as s3,
+    aws_s3_assets as s3_assets,
+    custom_resources as cr,
+)
+from constructs import Construct
+from typing import Mapping, Sequence
+
+DEPLOYER_ASSET_PATH = "assets/lambdas/static_site_deployer/"
+
+# One invocation downloads the site zip and uploads the changed files.
+DEPLOYER_TIMEOUT = Duration.minutes(5)
+
+DEPLOYER_RUNTIME = _lambda.Runtime.PYTHON_3_14
+
+# Construct id of the provider shared by deployments in the same stack.
+DEFAULT_PROVIDER_ID = "StaticSiteDeploymentProvider"
+
+# Object that records the content hash of every deployed file.
+MANIFEST_KEY = ".deploy-manifest.json"
+
+# BucketDeployment leaves a bucket's objects in place on delete while the
+# bucket carries a tag with this prefix, so tagging the buckets we deploy to
+# lets a BucketDeployment be replaced by a StaticSiteDeployment safely.
+CUSTOM_RESOURCE_OWNER_TAG = "aws-cdk:cr-owned"
+
+# Releases are deployed under `RELEASES_PREFIX/<release id>/`.
+RELEASES_PREFIX = "releases"
+RELEASE_ID_LENGTH = 16
+
+
+class StaticSiteDeploymentProvider(Construct):
+    """Deployer Lambda and `cr.Provider` shared by `StaticSiteDeployment`s.
+
+    Each deployment grants the Lambda read access to its source asset and
+    read/write access to its destination bucket.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        upload_concurrency: int = 8,
+        memory_size: int = 512,
+        **kwargs,
+    ) -> None:
+        """Initialize the StaticSiteDeploymentProvider construct.
+
+        Args:
+            scope: The scope/parent construct
+            id: The logical ID of the construct
+            upload_concurrency: Maximum number of concurrent PutObject calls
+            memory_size: Lambda memory in MB. Files are read from the site
+                zip one per upload worker
+            **kwargs: Additional keyword arguments passed to the parent Construct
+        """
+        super().__init__(scope, id, **kwargs)
+
+        if upload_concurrency < 1:
+            raise ValueError("upload_concurrency must be at least 1")
+
+        log_group = logs.LogGroup(
+            self, "StaticSiteDeployerLogGroup", retention=logs.RetentionDays.ONE_YEAR
+        )
+
+        self.function = _lambda.Function(
+            self,
+            "StaticSiteDeployerLambda",
+            runtime=DEPLOYER_RUNTIME,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="static_site_deployer.lambda_handler",
+            code=_lambda.Code.from_asset(
+                DEPLOYER_ASSET_PATH, exclude=["__pycache__", "*.pyc"]
+            ),
+            timeout=DEPLOYER_TIMEOUT,
+            memory_size=memory_size,
+            log_group=log_group,
+            environment={"UPLOAD_CONCURRENCY": str(upload_concurrency)},
+        )
+
+        self.provider = cr.Provider(
+            self,
+            "StaticSiteDeploymentProvider",
+            on_event_handler=self.function,
+        )
+
+    @property
+    def service_token(self) -> str:
+        """Service token for deployment custom resources."""
+        return self.provider.service_token
+
+
+class StaticSiteDeployment(Construct):
+    """Deploys a site directory to S3, uploading only what changed.
+
+    At deploy time the Lambda hashes every file in the site asset, diffs the
+    hashes against the manifest stored with the previous release and uploads
+    only new or changed files in parallel. Files that disappeared from the
+    site are deleted, and the new manifest is written last.
+
+    When `destination_key_prefix` changes (a new release), files that are
+    unchanged from the previous prefix are copied server-side instead of
+    being uploaded. With `retain_releases`, older releases beyond that many
+    are removed after each deploy.
+
+    Exposes the custom resource as `deployment_resource` so callers can read
+    `UploadedCount`, `CopiedCount`, `DeletedCount`, `UnchangedCount` and
+    `PrunedReleaseCount` from it.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        source_path: str,
+        destination_bucket: s3.IBucket,
+        destination_key_prefix: str = "",
+        prune: bool = True,
+        retain_on_delete: bool = False,
+        retain_releases: int | None = None,
+        live_key_prefix: str | None = None,
+        cache_control: Mapping[str, str] | None = None,
+        default_cache_control: str | None = None,
+        distribution: cloudfront.IDistribution | None = None,
+        invalidation_aliases: Mapping[str, Sequence[str]] | None = None,
+        max_invalidation_paths: int = 20,
+        provider: StaticSiteDeploymentProvider | None = None,
+        **kwargs,
+    ) -> None:
+        """Initialize the StaticSiteDeployment construct.
+
+        Args:
+            scope: The scope/parent construct
+            id: The logical ID of the construct
+            source_path: Local directory with the built site (for example
+                `../frontend/dist`)
+            destination_bucket: Bucket to deploy the site to
+            destination_key_prefix: Optional key prefix the site is deployed
+                under
+            prune: Delete objects whose files were removed from the site.
+                Only objects recorded in the previous manifest are deleted
+            retain_on_delete: Keep the deployed objects when the resource is
+                deleted. Otherwise the objects in the manifest are removed
+            retain_releases: Keep only this many of the most recently
+                deployed releases under `releases/`, removing the objects
+                each older release's manifest lists. Requires a
+                `destination_key_prefix` from `release_prefix`. When the
+                destination bucket replicates delete markers (see `S3Bucket`
+                `replication_destination`), pruned releases are deleted from
+                the replica bucket as well
+            live_key_prefix: Prefix of the release CloudFront serves, which
+                is never removed. The previous deploy's destination and live
+                prefixes are kept too, so a rollback still finds them
+            cache_control: Glob (matched against the path relative to the
+                site root, where `*` also matches `/`) to the Cache-Control
+                header of the objects it matches. The first matching glob
+                in insertion order wins
+            default_cache_control: Cache-Control for objects no glob matches.
+                Defaults to none, leaving caching to the CloudFront policy
+            distribution: CloudFront distribution to invalidate after a
+                deploy that changed any object. Only the changed and removed
+                objects' paths are invalidated; unchanged releases skip the
+                invalidation
+            invalidation_aliases: Object key to the extra viewer paths that
+                serve it, invalidated along with the object (for example
+                `{"resume.pdf": ["/resume"]}`)
+            max_invalidation_paths: Invalidate `/*` instead once a deploy
+                changes more than this many paths
+            provider: Shared `StaticSiteDeploymentProvider`. Defaults to one
+                created once per stack
+            **kwargs: Additional keyword arguments passed to the parent Construct
+        """
+        super().__init__(scope, id, **kwargs)
+
+        if max_invalidation_paths < 1:
+            raise ValueError("max_invalidation_paths must be at least 1")
+        if retain_releases is not None:
+            if retain_releases < 1:
+                raise ValueError("retain_releases must be at least 1")
+            if not destination_key_prefix.startswith(f"{RELEASES_PREFIX}/"):
+                raise ValueError(
+                    f"retain_releases requires a destination_key_prefix under "
+                    f"{RELEASES_PREFIX}/"
+                )
+
+        provider = provider or _default_provider(Stack.of(self))
+
+        # CDK hashes the directory, so an unchanged site is neither re-zipped
+        # nor re-uploaded to the asset bucket.
+        source = s3_assets.Asset(self, "Source", path=source_path)
+        source.grant_read(provider.function)
+        destination_bucket.grant_read_write(provider.function)
+
+        mark_bucket_managed(destination_bucket, self.node.addr[:8])
+
+        properties = {
+            "SourceBucket": source.s3_bucket_name,
+            "SourceKey": source.s3_object_key,
+            "DestinationBucket": destination_bucket.bucket_name,
+            "DestinationKeyPrefix": destination_key_prefix,
+            "ManifestKey": MANIFEST_KEY,
+            "Prune": "true" if prune else "false",
+            "RetainOnDelete": "true" if retain_on_delete else "false",
+        }
+        if cache_control:
+            properties["CacheControl"] = [
+                {"Pattern": pattern, "Value": header}
+                for pattern, header in cache_control.items()
+            ]
+        if default_cache_control:
+            properties["DefaultCacheControl"] = default_cache_control
+        if retain_releases is not None:
+            properties["RetainReleases"] = str(retain_releases)
+            if live_key_prefix:
+                properties["LiveKeyPrefix"] = live_key_prefix
+        if distribution is not None:
+            distribution.grant_create_invalidation(provider.function)
+            properties["DistributionId"] = distribution.distribution_id
+            properties["MaxInvalidationPaths"] = str(max_invalidation_paths)
+            if invalidation_aliases:
+                properties["InvalidationAliases"] = {
+                    key.lstrip("/"): list(aliases)
+                    for key, aliases in invalidation_aliases.items()
+                }
+
+        self.deployment_resource = CustomResource(
+            self,
+            "StaticSiteDeploymentResource",
+            service_token=provider.service_token,
+            resource_type="Custom::StaticSiteDeployment",
+            properties=properties,
+        )
+
+
+class StaticSiteReleaseInvalidation(Construct):
+    """Invalidates the mutable paths of the release a distribution serves.
+
+    Create it once the distribution's origin path points at the release:
+    it depends on the distribution, so it runs after CloudFront finished
+    switching, on the first deploy of a release and on a rollback alike.
+    Paths matching `immutable_patterns` are skipped; everything else is
+    invalidated with a trailing `*` that also covers its precompressed
+    variants.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        bucket: s3.IBucket,
+        release_id: str,
+        distribution: cloudfront.IDistribution,
+        immutable_patterns: Sequence[str] = (),
+        invalidation_aliases: Mapping[str, Sequence[str]] | None = None,
+        max_invalidation_paths: int = 20,
+        provider: StaticSiteDeploymentProvider | None = None,
+        **kwargs,
+    ) -> None:
+        """Initialize the StaticSiteReleaseInvalidation construct.
+
+        Args:
+            scope: The scope/parent construct
+            id: The logical ID of the construct
+            bucket: Bucket holding the release and its manifest
+            release_id: Id of the release now served (see `release_prefix`)
+            distribution: Distribution serving the release
+            immutable_patterns: Globs of fingerprinted paths that never need
+                invalidating (for example `assets/*`)
+            invalidation_aliases: Object key to the extra viewer paths that
+                serve it, invalidated along with the object
+            max_invalidation_paths: Invalidate `/*` instead past this many
+                paths
+            provider: Shared `StaticSiteDeploymentProvider`. Defaults to one
+                created once per stack
+            **kwargs: Additional keyword arguments passed to the parent Construct
+        """
+        super().__init__(scope, id, **kwargs)
+
+        provider = provider or _default_provider(Stack.of(self))
+
+        # A separate policy, so the deployer's role (which deployments the
+        # distribution waits on) does not itself depend on the distribution.
+        policy = iam.Policy(
+            self,
+            "InvalidationPolicy",
+            statements=[
+                iam.PolicyStatement(
+                    actions=["cloudfront:CreateInvalidation"],
+                    resources=[
+                        Stack.of(self).format_arn(
+                            service="cloudfront",
+                            region="",
+                            resource="distribution",
+                            resource_name=distribution.distribution_id,
+                        )
+                    ],
+                ),
+                iam.PolicyStatement(
+                    actions=["s3:GetObject"],
+                    resources=[bucket.arn_for_objects(f"{RELEASES_PREFIX}/*")],
+                ),
+            ],
+        )
+        policy.attach_to_role(provider.function.role)
+
+        properties = {
+            "DistributionId": distribution.distribution_id,
+            "Bucket": bucket.bucket_name,
+            "ReleaseKeyPrefix": release_prefix(release_id),
+            "ManifestKey": MANIFEST_KEY,
+            "ImmutablePatterns": list(immutable_patterns),
+            "MaxInvalidationPaths": str(max_invalidation_paths),
+        }
+        if invalidation_aliases:
+            properties["InvalidationAliases"] = {
+                key.lstrip("/"): list(aliases)
+                for key, aliases in invalidation_aliases.items()
+            }
+
+        self.invalidation_resource = CustomResource(
+            self,
+            "StaticSiteReleaseInvalidationResource",
+            service_token=provider.service_token,
+            resource_type="Custom::StaticSiteReleaseInvalidation",
+            properties=properties,
+        )
+        self.invalidation_resource.node.add_dependency(policy)
+
+
+def release_prefix(release_id: str) -> str:
+    """Return the key prefix a release is deployed under."""
+    return f"{RELEASES_PREFIX}/{release_id}/"
+
+
+def release_id_for(source_path: str) -> str:
+    """Return the release id of the site build in `source_path`.
+
+    The id is a fingerprint of the directory's contents, so rebuilding the
+    same site yields the same release.
+    """
+    return FileSystem.fingerprint(source_path)[:RELEASE_ID_LENGTH]
+
+
+def mark_bucket_managed(bucket: s3.IBucket, owner_id: str) -> None:
+    """Tag `bucket` as owned by a deployment custom resource.
+
+    Imported buckets cannot be tagged here; tag them in the stack that
+    defines them instead.
+    """
+    if isinstance(bucket.node.default_child, s3.CfnBucket):
+        Tags.of(bucket).add(f"{CUSTOM_RESOURCE_OWNER_TAG}:{owner_id}", "true")
+
+
+def _default_provider(stack: Stack) -> StaticSiteDeploymentProvider:
+    """Return the stack's default deployment provider, creating it once."""
+    existing = stack.node.try_find_child(DEFAULT_PROVIDER_ID)
+    if existing is not None:
+        return existing
+    return StaticSiteDeploymentProvider(stack, DEFAULT_PROVIDER_ID)
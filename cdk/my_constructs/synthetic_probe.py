@@ -0,0 +1,164 @@
+"""Scheduled synthetic TTFB probe construct.
+
+Runs the `ttfb_probe` Lambda on a schedule in the construct's region,
+fetching website pages through CloudFront (and optionally straight from the
+backup origin) and publishing DNS/connect/TLS/TTFB/total timings as custom
+metrics.
+"""
+
+from aws_cdk import (
+    Duration,
+    Stack,
+    aws_events as events,
+    aws_events_targets as targets,
+    aws_iam as iam,
+    aws_lambda as _lambda,
+    aws_logs as logs,
+)
+from constructs import Construct
+from typing import Mapping, Sequence
+import json
+
+PROBE_ASSET_PATH = "assets/lambdas/ttfb_probe/"
+
+PROBE_RUNTIME = _lambda.Runtime.PYTHON_3_14
+
+# Namespace of the probe's EMF metrics.
+PROBE_METRIC_NAMESPACE = "WebsiteProbe"
+
+# `{bundle}` is replaced by the first fingerprinted script on `/`.
+DEFAULT_PROBE_PATHS = ("/", "{bundle}", "/resume")
+
+
+class SyntheticProbe(Construct):
+    """Scheduled Lambda that probes the website from this region.
+
+    Features:
+    - Fetches `paths` from `https://<domain_name>` every `schedule_minutes`
+      over new connections, so every request pays DNS, TCP and TLS
+    - Publishes `DnsTime`, `ConnectTime`, `TlsTime`, `TimeToFirstByte`,
+      `TotalTime` and `Success` per region, origin and path as EMF metrics
+    - With `backup_bucket_param`, can also fetch each page from the backup
+      bucket through presigned URLs, timing the failover origin directly
+
+    Attributes:
+        function (lambda.Function): The probe Lambda
+        rule (events.Rule): The schedule
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        domain_name: str,
+        paths: Sequence[str] = DEFAULT_PROBE_PATHS,
+        schedule_minutes: int = 5,
+        probe_backup: bool = False,
+        backup_bucket_param: str | None = None,
+        backup_bucket_name_pattern: str | None = None,
+        backup_bucket_region: str = "us-east-1",
+        backup_origin_path: str | None = None,
+        backup_rewrites: Mapping[str, str] | None = None,
+        **kwargs,
+    ) -> None:
+        """Initialize the SyntheticProbe construct.
+
+        Args:
+            scope: The scope/parent construct
+            id: The logical ID of the construct
+            domain_name: Domain the website is served from
+            paths: Viewer paths to fetch; `{bundle}` is the first hashed
+                script on `/`
+            schedule_minutes: Minutes between probe runs
+            probe_backup: Probe the backup origin on every scheduled run.
+                Without it, a manual invocation with `{"probe_backup": true}`
+                still can when `backup_bucket_param` is set
+            backup_bucket_param: SSM parameter holding the backup bucket name
+            backup_bucket_name_pattern: Bucket name, or a prefix ending in
+                `*`, the probe may read objects from. Required with
+                `backup_bucket_param`, since the name is only known at run time
+            backup_bucket_region: Region of the backup bucket and parameter
+            backup_origin_path: The distribution's origin path, such as
+                `/releases/<id>`, prefixed to backup object keys
+            backup_rewrites: Viewer path to object path rewrites the edge
+                applies, such as `/resume` to `/resume.pdf`
+            **kwargs: Additional keyword arguments passed to the parent Construct
+        """
+        super().__init__(scope, id, **kwargs)
+
+        if schedule_minutes < 1:
+            raise ValueError("schedule_minutes must be at least 1")
+        if probe_backup and backup_bucket_param is None:
+            raise ValueError("probe_backup requires backup_bucket_param")
+        if backup_bucket_param is not None and not backup_bucket_name_pattern:
+            raise ValueError("backup_bucket_param requires backup_bucket_name_pattern")
+
+        log_group = logs.LogGroup(
+            self, "ProbeLogGroup", retention=logs.RetentionDays.ONE_MONTH
+        )
+        environment = {
+            "TARGET_URL": f"https://{domain_name}",
+            "PROBE_PATHS": json.dumps(list(paths)),
+            "METRIC_NAMESPACE": PROBE_METRIC_NAMESPACE,
+            "PROBE_BACKUP": str(probe_backup).lower(),
+        }
+        if backup_bucket_param is not None:
+            environment.update(
+                {
+                    "BACKUP_BUCKET_PARAM": backup_bucket_param,
+                    "BACKUP_BUCKET_REGION": backup_bucket_region,
+                    "BACKUP_ORIGIN_PATH": backup_origin_path or "",
+                    "BACKUP_REWRITES": json.dumps(dict(backup_rewrites or {})),
+                }
+            )
+
+        self.function = _lambda.Function(
+            self,
+            "ProbeLambda",
+            runtime=PROBE_RUNTIME,
+            architecture=_lambda.Architecture.ARM_64,
+            handler="ttfb_probe.lambda_handler",
+            code=_lambda.Code.from_asset(
+                PROBE_ASSET_PATH, exclude=["__pycache__", "*.pyc"]
+            ),
+            # Every path is fetched sequentially with a 10 second timeout.
+            timeout=Duration.minutes(1),
+            memory_size=256,
+            log_group=log_group,
+            environment=environment,
+        )
+
+        if backup_bucket_param is not None:
+            stack = Stack.of(self)
+            self.function.add_to_role_policy(
+                iam.PolicyStatement(
+                    actions=["ssm:GetParameter"],
+                    resources=[
+                        stack.format_arn(
+                            service="ssm",
+                            region=backup_bucket_region,
+                            resource="parameter",
+                            resource_name=backup_bucket_param.lstrip("/"),
+                        )
+                    ],
+                )
+            )
+            # Presigned URLs carry the role's identity. The bucket name is
+            # only read at run time, so reads are limited to buckets matching
+            # the pattern in this account.
+            self.function.add_to_role_policy(
+                iam.PolicyStatement(
+                    actions=["s3:GetObject"],
+                    resources=[
+                        f"arn:{stack.partition}:s3:::{backup_bucket_name_pattern}/*"
+                    ],
+                    conditions={"StringEquals": {"s3:ResourceAccount": stack.account}},
+                )
+            )
+
+        self.rule = events.Rule(
+            self,
+            "ProbeSchedule",
+            schedule=events.Schedule.rate(Duration.minutes(schedule_minutes)),
+            targets=[targets.LambdaFunction(self.function, retry_attempts=0)],
+        )
@@ -0,0 +1,272 @@
+"""CloudFront dashboard and alarms construct.
+
+Enables the distribution's additional metrics and watches cache efficiency,
+origin latency, error rates and egress with a CloudWatch dashboard and
+alarms that notify an SNS topic.
+"""
+
+from aws_cdk import (
+    aws_cloudfront as cloudfront,
+    aws_cloudwatch as cloudwatch,
+    aws_cloudwatch_actions as cloudwatch_actions,
+    aws_iam as iam,
+    aws_kms as kms,
+    aws_sns as sns,
+    aws_sns_subscriptions as sns_subscriptions,
+    Duration,
+    Stack,
+    Token,
+)
+from constructs import Construct
+from typing import Sequence
+
+# CloudFront publishes its metrics to CloudWatch in us-east-1 only, and an
+# alarm can only watch metrics in its own region.
+CLOUDFRONT_METRICS_REGION = "us-east-1"
+
+ALARM_PERIOD = Duration.minutes(5)
+# A breach must last this many periods in a row, so one burst of scanner
+# 404s or cold misses after a release does not page anyone.
+ALARM_EVALUATION_PERIODS = 3
+
+GIGABYTE = 1000**3
+
+
+class WebsiteMonitoring(Construct):
+    """Dashboard and alarms for a CloudFront distribution.
+
+    Features:
+    - Additional CloudFront metrics (`CacheHitRate`, `OriginLatency`)
+      enabled through a monitoring subscription
+    - Dashboard with requests, egress, cache hit rate, origin latency
+      percentiles, error rates and alarm status
+    - Alarms on low cache hit rate, high p90 origin latency, 4xx and 5xx
+      error rates and hourly `BytesDownloaded`, notifying `alarm_topic`
+
+    Attributes:
+        alarm_topic (sns.Topic): Topic every alarm notifies
+        alarm_topic_key (kms.Key): Key the alarm topic is encrypted with
+        alarms (dict[str, cloudwatch.Alarm]): Alarms keyed by metric name
+        dashboard (cloudwatch.Dashboard): The dashboard
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        distribution: cloudfront.IDistribution,
+        cache_hit_rate_min_percent: float = 80,
+        origin_latency_p90_max_ms: float = 1000,
+        error_rate_4xx_max_percent: float = 5,
+        error_rate_5xx_max_percent: float = 1,
+        bytes_downloaded_max_gb_per_hour: float = 5,
+        alarm_emails: Sequence[str] = (),
+        **kwargs,
+    ) -> None:
+        """Initialize the WebsiteMonitoring construct.
+
+        Args:
+            scope: The scope/parent construct. Its stack must be in us-east-1
+            id: The logical ID of the construct
+            distribution: The distribution to monitor, from any stack
+            cache_hit_rate_min_percent: Alarm when the cache hit rate drops below this
+            origin_latency_p90_max_ms: Alarm when p90 origin latency exceeds this
+            error_rate_4xx_max_percent: Alarm when the 4xx error rate exceeds this
+            error_rate_5xx_max_percent: Alarm when the 5xx error rate exceeds this
+            bytes_downloaded_max_gb_per_hour: Alarm when hourly egress exceeds this
+            alarm_emails: Email addresses subscribed to the alarm topic
+            **kwargs: Additional keyword arguments passed to the parent Construct
+        """
+        super().__init__(scope, id, **kwargs)
+
+        stack = Stack.of(self)
+        if (
+            not Token.is_unresolved(stack.region)
+            and stack.region != CLOUDFRONT_METRICS_REGION
+        ):
+            raise ValueError(
+                "CloudFront alarms must be created in "
+                f"{CLOUDFRONT_METRICS_REGION}, not {stack.region}"
+            )
+
+        # CacheHitRate and OriginLatency are only published with additional
+        # metrics, which are billed per distribution.
+        subscription = cloudfront.CfnMonitoringSubscription(
+            self,
+            "MonitoringSubscription",
+            distribution_id=distribution.distribution_id,
+            monitoring_subscription=cloudfront.CfnMonitoringSubscription.MonitoringSubscriptionProperty(
+                realtime_metrics_subscription_config=cloudfront.CfnMonitoringSubscription.RealtimeMetricsSubscriptionConfigProperty(
+                    realtime_metrics_subscription_status="Enabled"
+                )
+            ),
+        )
+
+        def metric(
+            name: str, statistic: str, period: Duration = ALARM_PERIOD
+        ) -> cloudwatch.Metric:
+            return cloudwatch.Metric(
+                namespace="AWS/CloudFront",
+                metric_name=name,
+                dimensions_map={
+                    "DistributionId": distribution.distribution_id,
+                    "Region": "Global",
+                },
+                statistic=statistic,
+                period=period,
+            )
+
+        requests = metric("Requests", "Sum")
+        bytes_downloaded = metric("BytesDownloaded", "Sum")
+        hourly_bytes_downloaded = metric("BytesDownloaded", "Sum", Duration.hours(1))
+        cache_hit_rate = metric("CacheHitRate", "Average")
+        origin_latency = {
+            percentile: metric("OriginLatency", percentile)
+            for percentile in ("p50", "p90", "p99")
+        }
+        error_4xx_rate = metric("4xxErrorRate", "Average")
+        error_5xx_rate = metric("5xxErrorRate", "Average")
+
+        # The AWS managed SNS key cannot grant CloudWatch access, so alarms
+        # could not publish to a topic encrypted with it.
+        self.alarm_topic_key = kms.Key(
+            self,
+            "AlarmTopicKey",
+            description=f"Encrypts the {stack.stack_name} alarm topic",
+            enable_key_rotation=True,
+        )
+        self.alarm_topic_key.add_to_resource_policy(
+            iam.PolicyStatement(
+                sid="AllowCloudWatchAlarms",
+                principals=[iam.ServicePrincipal("cloudwatch.amazonaws.com")],
+                actions=["kms:Decrypt", "kms:GenerateDataKey*"],
+                resources=["*"],
+                conditions={"StringEquals": {"aws:SourceAccount": stack.account}},
+            )
+        )
+        self.alarm_topic = sns.Topic(
+            self, "AlarmTopic", master_key=self.alarm_topic_key
+        )
+        for email in alarm_emails:
+            self.alarm_topic.add_subscription(
+                sns_subscriptions.EmailSubscription(email)
+            )
+
+        alarm_specs = {
+            "CacheHitRate": (
+                cache_hit_rate,
+                cache_hit_rate_min_percent,
+                cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
+                ALARM_EVALUATION_PERIODS,
+                f"Cache hit rate below {cache_hit_rate_min_percent}%",
+            ),
+            "OriginLatency": (
+                origin_latency["p90"],
+                origin_latency_p90_max_ms,
+                cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+                ALARM_EVALUATION_PERIODS,
+                f"p90 origin latency above {origin_latency_p90_max_ms} ms",
+            ),
+            "4xxErrorRate": (
+                error_4xx_rate,
+                error_rate_4xx_max_percent,
+                cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+                ALARM_EVALUATION_PERIODS,
+                f"4xx error rate above {error_rate_4xx_max_percent}%",
+            ),
+            "5xxErrorRate": (
+                error_5xx_rate,
+                error_rate_5xx_max_percent,
+                cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+                ALARM_EVALUATION_PERIODS,
+                f"5xx error rate above {error_rate_5xx_max_percent}%",
+            ),
+            "BytesDownloaded": (
+                hourly_bytes_downloaded,
+                bytes_downloaded_max_gb_per_hour * GIGABYTE,
+                cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+                1,
+                f"More than {bytes_downloaded_max_gb_per_hour} GB downloaded in an hour",
+            ),
+        }
+        self.alarms: dict[str, cloudwatch.Alarm] = {}
+        for name, (
+            alarm_metric,
+            threshold,
+            comparison_operator,
+            evaluation_periods,
+            description,
+        ) in alarm_specs.items():
+            alarm = cloudwatch.Alarm(
+                self,
+                f"{name}Alarm",
+                metric=alarm_metric,
+                threshold=threshold,
+                comparison_operator=comparison_operator,
+                evaluation_periods=evaluation_periods,
+                # A quiet site publishes no datapoints between visits.
+                treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+                alarm_description=f"{description} on {stack.stack_name}",
+            )
+            alarm.add_alarm_action(cloudwatch_actions.SnsAction(self.alarm_topic))
+            alarm.add_ok_action(cloudwatch_actions.SnsAction(self.alarm_topic))
+            # Alarms read the additional metrics only once they are enabled.
+            alarm.node.add_dependency(subscription)
+            self.alarms[name] = alarm
+
+        def threshold_line(value: float, label: str) -> cloudwatch.HorizontalAnnotation:
+            return cloudwatch.HorizontalAnnotation(value=value, label=label)
+
+        self.dashboard = cloudwatch.Dashboard(
+            self,
+            "Dashboard",
+            default_interval=Duration.days(1),
+            widgets=[
+                [
+                    cloudwatch.AlarmStatusWidget(
+                        title="Alarms",
+                        alarms=list(self.alarms.values()),
+                        width=24,
+                        height=3,
+                    )
+                ],
+                [
+                    cloudwatch.GraphWidget(
+                        title="Requests",
+                        left=[requests],
+                        right=[bytes_downloaded],
+                        width=12,
+                    ),
+                    cloudwatch.GraphWidget(
+                        title="Cache hit rate (%)",
+                        left=[cache_hit_rate],
+                        left_y_axis=cloudwatch.YAxisProps(min=0, max=100),
+                        left_annotations=[
+                            threshold_line(cache_hit_rate_min_percent, "Alarm")
+                        ],
+                        width=12,
+                    ),
+                ],
+                [
+                    cloudwatch.GraphWidget(
+                        title="Origin latency (ms)",
+                        left=list(origin_latency.values()),
+                        left_y_axis=cloudwatch.YAxisProps(min=0),
+                        left_annotations=[
+                            threshold_line(origin_latency_p90_max_ms, "p90 alarm")
+                        ],
+                        width=12,
+                    ),
+                    cloudwatch.GraphWidget(
+                        title="Error rates (%)",
+                        left=[error_4xx_rate, error_5xx_rate],
+                        left_y_axis=cloudwatch.YAxisProps(min=0),
+                        left_annotations=[
+                            threshold_line(error_rate_4xx_max_percent, "4xx alarm"),
+                            threshold_line(error_rate_5xx_max_percent, "5xx alarm"),
+                        ],
+                        width=12,
+                    ),
+                ],
+            ],
+        )
@@ -0,0 +1,30 @@
+from aws_cdk import Stack, aws_cloudfront as cloudfront
+from constructs import Construct
+from my_constructs.cloudfront_access_logs import CloudFrontAccessLogs
+
+
+class AccessLogsStack(Stack):
+    """Delivers the website distribution's standard logs (v2) to S3.
+
+    CloudFront only delivers v2 logs through a delivery source in us-east-1,
+    so this stack lives there while the distribution stays in the website
+    stack. The distribution reaches it as a cross-region reference, which
+    needs `cross_region_references=True` on both stacks.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        distribution: cloudfront.IDistribution,
+        retention_days: int = 90,
+        **kwargs,
+    ) -> None:
+        super().__init__(scope, id, **kwargs)
+
+        self.access_logs = CloudFrontAccessLogs(
+            self,
+            "CloudFrontAccessLogs",
+            distribution=distribution,
+            retention_days=retention_days,
+        )
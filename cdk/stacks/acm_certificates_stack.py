@@ -1,8 +1,10 @@
 from aws_cdk import Stack, aws_ssm as ssm
 from constructs import Construct
+from typing import Sequence
 from my_constructs.acm_certificate import AcmCertificate
 from my_constructs.hosted_zone import lookup_hosted_zone
 from my_constructs.ssm_param_replicator import SSMParameterReplicator
+from my_constructs.ssm_replication_provider import SSMReplicationProvider
 from my_constructs.ssm_replication import build_ssm_replication_config
 
 
@@ -14,7 +16,8 @@ class ACMCertificatesStack(Stack):
         domain_name: str,
         env_region: str,
         ssm_params: dict,
-        replication_target_region: str = "us-east-2",
+        replication_target_regions: Sequence[str] = ("us-east-2",),
+        replication_provider: SSMReplicationProvider | None = None,
         **kwargs,
     ) -> None:
         super().__init__(scope, id, **kwargs)
@@ -42,19 +45,26 @@ class ACMCertificatesStack(Stack):
             string_value=self.website_certificate.certificate.certificate_arn,
         )
 
-        # Replicate SSM Parameters to a secondary region
-        replication_config = build_ssm_replication_config(
-            [ssm_params["website_cert_arn_param"]]
-        )
+        # Replicate SSM Parameters to a secondary region. The parameter is
+        # triggered by the ARN it stores, so only a rotated ARN replicates.
+        replicated_values = {
+            ssm_params["website_cert_arn_param"]: (
+                self.website_certificate.certificate.certificate_arn
+            ),
+        }
+        replication_config = build_ssm_replication_config(list(replicated_values))
 
         replicator = SSMParameterReplicator(
             self,
-            "ACMCertsSSMReplicatorV2",
+            # V3: moving to a shared provider changes the service token,
+            # which CloudFormation cannot update in place.
+            "ACMCertsSSMReplicatorV3",
             source_region=env_region,
-            target_region=replication_target_region,
+            target_regions=replication_target_regions,
+            provider=replication_provider,
             param_path_prefix=replication_config.param_path_prefix,
             parameters=replication_config.parameters,
-            update_triggers=[self.website_certificate.certificate.certificate_arn],
+            update_triggers=replicated_values,
         )
 
         # Ensure source SSM parameter exists before replication is invoked.
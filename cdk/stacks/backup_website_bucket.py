@@ -5,8 +5,11 @@ from aws_cdk import (
     aws_ssm as ssm,
 )
 from constructs import Construct
+from typing import Sequence
 from my_constructs.s3_bucket import S3Bucket
+from my_constructs.static_site_deployment import mark_bucket_managed
 from my_constructs.ssm_param_replicator import SSMParameterReplicator
+from my_constructs.ssm_replication_provider import SSMReplicationProvider
 from my_constructs.ssm_replication import build_ssm_replication_config
 
 
@@ -17,7 +20,8 @@ class BackupWebsiteBucketStack(Stack):
         id: str,
         ssm_params: dict,
         region: str,
-        replication_target_region: str = "us-east-2",
+        replication_target_regions: Sequence[str] = ("us-east-2",),
+        replication_provider: SSMReplicationProvider | None = None,
         **kwargs,
     ) -> None:
         super().__init__(scope, id, **kwargs)
@@ -25,6 +29,9 @@ class BackupWebsiteBucketStack(Stack):
         # Define your bucket
         self.backup_website_bucket = S3Bucket(self, "BackupWebsiteBucket")
         self._allow_cloudfront_read_access_to_backup_bucket()
+        # The website stack deploys into this bucket through an imported
+        # reference, which cannot be tagged there.
+        mark_bucket_managed(self.backup_website_bucket.bucket, "WebsiteFiles")
 
         bucket_name = self.backup_website_bucket.bucket.bucket_name
         bucket_arn = self.backup_website_bucket.bucket.bucket_arn
@@ -54,23 +61,27 @@ class BackupWebsiteBucketStack(Stack):
             string_value=bucket_name,
         )
 
-        # Replicate these parameters to the configured target region
-        replication_config = build_ssm_replication_config(
-            [
-                ssm_params["backup_website_bucket_arn_param"],
-                ssm_params["backup_website_bucket_domain_name_param"],
-                ssm_params["backup_website_bucket_name_param"],
-            ]
-        )
+        # Replicate these parameters to the configured target region. Each one
+        # is triggered by the value it stores, so an update only moves the
+        # parameters whose value changed.
+        replicated_values = {
+            ssm_params["backup_website_bucket_arn_param"]: bucket_arn,
+            ssm_params["backup_website_bucket_domain_name_param"]: bucket_domain_name,
+            ssm_params["backup_website_bucket_name_param"]: bucket_name,
+        }
+        replication_config = build_ssm_replication_config(list(replicated_values))
 
         replicator = SSMParameterReplicator(
             self,
-            "BackupBucketSSMReplicatorV2",
+            # V3: moving to a shared provider changes the service token,
+            # which CloudFormation cannot update in place.
+            "BackupBucketSSMReplicatorV3",
             source_region=region,
-            target_region=replication_target_region,
+            target_regions=replication_target_regions,
+            provider=replication_provider,
             param_path_prefix=replication_config.param_path_prefix,
             parameters=replication_config.parameters,
-            update_triggers=[bucket_arn, bucket_domain_name, bucket_name],
+            update_triggers=replicated_values,
         )
 
         # Ensure source SSM parameters exist before replication is invoked.
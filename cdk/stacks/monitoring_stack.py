@@ -0,0 +1,31 @@
+from aws_cdk import Stack, aws_cloudfront as cloudfront
+from constructs import Construct
+from my_constructs.website_monitoring import WebsiteMonitoring
+from typing import Any, Mapping
+
+
+class MonitoringStack(Stack):
+    """Dashboard and alarms for the website distribution.
+
+    CloudFront metrics live in us-east-1 and alarms cannot watch another
+    region, so this stack lives there while the distribution stays in the
+    website stack. The distribution reaches it as a cross-region reference,
+    which needs `cross_region_references=True` on both stacks.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        distribution: cloudfront.IDistribution,
+        thresholds: Mapping[str, Any] | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(scope, id, **kwargs)
+
+        self.monitoring = WebsiteMonitoring(
+            self,
+            "WebsiteMonitoring",
+            distribution=distribution,
+            **(thresholds or {}),
+        )
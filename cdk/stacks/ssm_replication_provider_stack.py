@@ -0,0 +1,22 @@
+from aws_cdk import Stack
+from constructs import Construct
+from my_constructs.ssm_replication_provider import SSMReplicationProvider
+
+
+class SSMReplicationProviderStack(Stack):
+    """Hosts the SSM replication Lambda and provider for one account/region.
+
+    Stacks in the same account/region pass `provider` to their
+    `SSMParameterReplicator`s so they share a single Lambda, log group and
+    provider framework function instead of deploying one each.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        **kwargs,
+    ) -> None:
+        super().__init__(scope, id, **kwargs)
+
+        self.provider = SSMReplicationProvider(self, "SSMReplicationProvider")
@@ -0,0 +1,30 @@
+from aws_cdk import Stack
+from constructs import Construct
+from my_constructs.synthetic_probe import SyntheticProbe
+from typing import Any, Mapping
+
+
+class SyntheticProbeStack(Stack):
+    """Synthetic TTFB probe for the website, one stack per probe region.
+
+    The probe reaches the site over the public internet and reads the backup
+    bucket name from SSM in the CloudFront region at run time, so this stack
+    has no references to the other stacks and can be deployed anywhere.
+    """
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        domain_name: str,
+        probe_settings: Mapping[str, Any] | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(scope, id, **kwargs)
+
+        self.probe = SyntheticProbe(
+            self,
+            "SyntheticProbe",
+            domain_name=domain_name,
+            **(probe_settings or {}),
+        )
@@ -10,12 +10,57 @@ from aws_cdk import (
     aws_ssm as ssm,
 )
 from constructs import Construct
-from my_constructs.cloudfront_distribution import CloudFrontDistribution
+from pathlib import Path
+from typing import Literal
+from my_constructs.cloudfront_distribution import (
+    PRECOMPRESSED_ENCODINGS,
+    PRECOMPRESSED_EXTENSIONS,
+    CloudFrontDistribution,
+)
 from my_constructs.hosted_zone import lookup_hosted_zone
 from my_constructs.s3_bucket import S3Bucket
+from my_constructs.static_site_deployment import (
+    StaticSiteDeployment,
+    StaticSiteReleaseInvalidation,
+    release_id_for,
+    release_prefix,
+)
 
 # from my_constructs.apigw_to_lambda import ApiGwtoLambda
 
+# Vite fingerprints everything under assets/, so a changed bundle is a new URL
+# and browsers can keep the old one forever without revalidating.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Unhashed entry points keep their URL across releases: browsers revalidate on
+# every use and the edge refetches them within five minutes, so a release shows
+# up even where a deploy's targeted invalidation does not reach.
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, s-maxage=300, must-revalidate"
+
+# The resume changes rarely and is fetched in ranges by PDF viewers: browsers
+# recheck it after five minutes while the edge keeps it for a day.
+RESUME_CACHE_CONTROL = "public, max-age=300, s-maxage=86400, must-revalidate"
+
+# Glob to Cache-Control for the built site; the first matching glob wins.
+STATIC_ASSET_CACHE_CONTROL = {
+    "assets/*": IMMUTABLE_CACHE_CONTROL,
+    "*.html": REVALIDATE_CACHE_CONTROL,
+    "robots.txt": REVALIDATE_CACHE_CONTROL,
+    "resume.pdf": RESUME_CACHE_CONTROL,
+}
+
+# Icons and other unhashed files that rarely change.
+DEFAULT_STATIC_ASSET_CACHE_CONTROL = "public, max-age=86400"
+
+# Fingerprinted paths, which never need invalidating when a release goes live.
+IMMUTABLE_ASSET_PATTERNS = tuple(
+    pattern
+    for pattern, header in STATIC_ASSET_CACHE_CONTROL.items()
+    if header == IMMUTABLE_CACHE_CONTROL
+)
+
+ASSET_DEPLOYMENT_MODES = ("incremental", "releases", "bucket_deployment")
+
 
 class WebsiteStack(Stack):
     def __init__(
@@ -28,21 +73,73 @@ class WebsiteStack(Stack):
         backup_website_bucket_ssm_params: dict,
         geo_restrictions: dict = None,
         cloudfront_price_class: str = "PRICE_CLASS_100",
+        max_invalidation_paths: int = 20,
+        asset_deployment_mode: Literal[
+            "incremental", "releases", "bucket_deployment"
+        ] = "incremental",
+        precompressed_encodings: bool = False,
+        backup_sync: Literal["deployment", "replication"] = "deployment",
+        active_release: str | None = None,
+        retain_releases: int | None = None,
+        edge_routes: dict | None = None,
         **kwargs,
     ) -> None:
         super().__init__(scope, id, **kwargs)
 
+        if asset_deployment_mode not in ASSET_DEPLOYMENT_MODES:
+            raise ValueError(
+                "asset_deployment_mode must be one of: "
+                + ", ".join(ASSET_DEPLOYMENT_MODES)
+            )
+        if backup_sync not in ("deployment", "replication"):
+            raise ValueError("backup_sync must be one of: deployment, replication")
+        if active_release is not None and asset_deployment_mode != "releases":
+            raise ValueError("active_release requires asset_deployment_mode releases")
+        if retain_releases is not None and asset_deployment_mode != "releases":
+            raise ValueError("retain_releases requires asset_deployment_mode releases")
+        if precompressed_encodings:
+            # BucketDeployment cannot set Content-Encoding per object.
+            if asset_deployment_mode == "bucket_deployment":
+                raise ValueError(
+                    "precompressed_encodings requires asset_deployment_mode "
+                    "incremental or releases"
+                )
+            self._check_precompressed_variants(source_file_path)
+
+        # Each build is its own immutable release; the origin path serves the
+        # newest one unless `active_release` pins an earlier one.
+        build_release = None
+        origin_path = None
+        if asset_deployment_mode == "releases":
+            build_release = release_id_for(source_file_path)
+            active_release = active_release or build_release
+            origin_path = "/" + release_prefix(active_release).rstrip("/")
+
         hosted_zone = lookup_hosted_zone(
             self,
             stack_id=id,
             domain_name=domain_name,
         )
         website_certificate = self._load_website_certificate(acm_ssm_params)
-        _backup_bucket_arn, backup_bucket_name = self._load_backup_bucket_data(
+        backup_bucket_arn, backup_bucket_name = self._load_backup_bucket_data(
             backup_website_bucket_ssm_params
         )
+        backup_bucket = s3.Bucket.from_bucket_attributes(
+            self,
+            "BackupBucketDeploymentRef",
+            bucket_arn=backup_bucket_arn,
+            bucket_name=backup_bucket_name,
+        )
 
-        website_bucket = S3Bucket(self, "WebsiteBucket")
+        # With replication the site is uploaded once and S3 copies every
+        # write and delete to the backup bucket server-side.
+        website_bucket = S3Bucket(
+            self,
+            "WebsiteBucket",
+            replication_destination=(
+                backup_bucket if backup_sync == "replication" else None
+            ),
+        )
 
         website_distribution = CloudFrontDistribution(
             self,
@@ -53,36 +150,96 @@ class WebsiteStack(Stack):
             backup_bucket_name=backup_bucket_name,
             geo_restrictions=geo_restrictions,
             price_class=cloudfront_price_class,
+            precompressed_encodings=precompressed_encodings,
+            origin_path=origin_path,
+            edge_routes=edge_routes,
         )
 
+        self.distribution = website_distribution.cf_distribution
+        self.origin_path = origin_path
+        self.clean_url_aliases = website_distribution.clean_url_aliases
+
         self._create_dns_alias_records(
             hosted_zone=hosted_zone,
             domain_name=domain_name,
             distribution=website_distribution.cf_distribution,
         )
 
-        website_log_group = self._create_log_group(name=f"{id}-WebsiteFilesLogGroup")
-        backup_log_group = self._create_log_group(
-            name=f"{id}-BackupWebsiteFilesLogGroupV2"
-        )
+        if asset_deployment_mode == "incremental":
+            self._deploy_changed_assets(
+                deployment_id=f"{id}-WebsiteFilesIncrementalDeployment",
+                source_file_path=source_file_path,
+                destination_bucket=website_bucket.bucket,
+                distribution=website_distribution,
+                max_invalidation_paths=max_invalidation_paths,
+            )
+            if backup_sync == "deployment":
+                # The edge cache is shared by both origins, so the primary
+                # deployment's invalidation covers the backup as well. The
+                # backup copy is retained on delete so switching to
+                # replication never empties the failover bucket.
+                self._deploy_changed_assets(
+                    deployment_id=f"{id}-BackupWebsiteFilesIncrementalDeployment",
+                    source_file_path=source_file_path,
+                    destination_bucket=backup_bucket,
+                    retain_on_delete=True,
+                )
+        elif asset_deployment_mode == "releases":
+            self._deploy_release(
+                id=id,
+                source_file_path=source_file_path,
+                build_release=build_release,
+                active_release=active_release,
+                website_bucket=website_bucket.bucket,
+                backup_bucket=backup_bucket if backup_sync == "deployment" else None,
+                distribution=website_distribution,
+                max_invalidation_paths=max_invalidation_paths,
+                retain_releases=retain_releases,
+            )
+        else:
+            website_log_group = self._create_log_group(
+                name=f"{id}-WebsiteFilesLogGroup"
+            )
 
-        self._deploy_static_assets(
-            deployment_id=f"{id}-WebsiteFilesDeployment",
-            source_file_path=source_file_path,
-            destination_bucket=website_bucket.bucket,
-            distribution=website_distribution.cf_distribution,
-            log_group=website_log_group,
-        )
+            self._deploy_static_assets(
+                deployment_id=f"{id}-WebsiteFilesDeployment",
+                source_file_path=source_file_path,
+                destination_bucket=website_bucket.bucket,
+                distribution=website_distribution.cf_distribution,
+                log_group=website_log_group,
+            )
 
-        self._deploy_static_assets(
-            deployment_id=f"{id}-BackupWebsiteFilesDeployment",
-            source_file_path=source_file_path,
-            destination_bucket=s3.Bucket.from_bucket_name(
-                self, "BackupBucketDeploymentRef", backup_bucket_name
-            ),
-            distribution=website_distribution.cf_distribution,
-            log_group=backup_log_group,
+            if backup_sync == "deployment":
+                backup_log_group = self._create_log_group(
+                    name=f"{id}-BackupWebsiteFilesLogGroupV2"
+                )
+                self._deploy_static_assets(
+                    deployment_id=f"{id}-BackupWebsiteFilesDeployment",
+                    source_file_path=source_file_path,
+                    destination_bucket=backup_bucket,
+                    distribution=website_distribution.cf_distribution,
+                    log_group=backup_log_group,
+                )
+
+    def _check_precompressed_variants(self, source_file_path: str) -> None:
+        """Fail synth when a compressible file lacks a precompressed variant.
+
+        The viewer-request function serves a variant without checking that it
+        exists, so a build without them would answer with errors.
+        """
+        missing = sorted(
+            f"{path.relative_to(source_file_path)}{suffix}"
+            for path in Path(source_file_path).rglob("*")
+            if path.suffix.lower() in PRECOMPRESSED_EXTENSIONS and path.is_file()
+            for _encoding, suffix in PRECOMPRESSED_ENCODINGS
+            if not path.with_name(path.name + suffix).is_file()
         )
+        if missing:
+            raise ValueError(
+                f"{source_file_path} is missing precompressed variants "
+                f"({', '.join(missing[:5])}{', ...' if len(missing) > 5 else ''}); "
+                "build the frontend with `npm run build`"
+            )
 
     def _load_website_certificate(self, acm_ssm_params: dict) -> acm.ICertificate:
         """Load the ACM certificate ARN from SSM and import it."""
@@ -153,14 +310,151 @@ class WebsiteStack(Stack):
         distribution: cloudfront.Distribution,
         log_group: logs.LogGroup,
     ) -> None:
-        """Deploy the built frontend assets to a bucket and invalidate CloudFront."""
-        s3deploy.BucketDeployment(
+        """Deploy the built frontend assets to a bucket and invalidate CloudFront.
+
+        BucketDeployment applies one Cache-Control per deployment, so files are
+        split into one deployment per header in `STATIC_ASSET_CACHE_CONTROL`.
+        Each prunes only the files it includes. The catch-all deployment runs
+        last and invalidates the distribution once everything is uploaded.
+        """
+        patterns_by_header: dict[str, list[str]] = {}
+        for pattern, header in STATIC_ASSET_CACHE_CONTROL.items():
+            patterns_by_header.setdefault(header, []).append(pattern)
+
+        source = s3deploy.Source.asset(source_file_path)
+        catch_all = s3deploy.BucketDeployment(
             self,
             deployment_id,
-            sources=[s3deploy.Source.asset(source_file_path)],
+            sources=[source],
             destination_bucket=destination_bucket,
+            exclude=list(STATIC_ASSET_CACHE_CONTROL),
+            cache_control=[
+                s3deploy.CacheControl.from_string(DEFAULT_STATIC_ASSET_CACHE_CONTROL)
+            ],
             distribution=distribution,
             distribution_paths=["/*"],
             log_group=log_group,
             retain_on_delete=False,
         )
+        for index, (header, patterns) in enumerate(patterns_by_header.items()):
+            group = s3deploy.BucketDeployment(
+                self,
+                f"{deployment_id}-CacheGroup{index}",
+                sources=[source],
+                destination_bucket=destination_bucket,
+                exclude=["*"],
+                include=patterns,
+                cache_control=[s3deploy.CacheControl.from_string(header)],
+                log_group=log_group,
+                retain_on_delete=False,
+            )
+            # Order the custom resources only: the deployments share one
+            # handler and CLI layer, so a construct-level dependency cycles.
+            catch_all.node.find_child("CustomResource").node.add_dependency(
+                group.node.find_child("CustomResource")
+            )
+
+    def _deploy_changed_assets(
+        self,
+        *,
+        deployment_id: str,
+        source_file_path: str,
+        destination_bucket: s3.IBucket,
+        destination_key_prefix: str = "",
+        distribution: CloudFrontDistribution | None = None,
+        max_invalidation_paths: int = 20,
+        retain_on_delete: bool = False,
+        retain_releases: int | None = None,
+        live_key_prefix: str | None = None,
+    ) -> StaticSiteDeployment:
+        """Upload only the frontend files whose content or metadata changed.
+
+        Objects get their Cache-Control from `STATIC_ASSET_CACHE_CONTROL`.
+        With a `distribution`, CloudFront invalidates just the changed paths
+        and the clean URLs that serve them, falling back to `/*` past
+        `max_invalidation_paths`.
+        """
+        invalidation = {}
+        if distribution is not None:
+            invalidation = {
+                "distribution": distribution.cf_distribution,
+                "invalidation_aliases": distribution.clean_url_aliases,
+                "max_invalidation_paths": max_invalidation_paths,
+            }
+        return StaticSiteDeployment(
+            self,
+            deployment_id,
+            source_path=source_file_path,
+            destination_bucket=destination_bucket,
+            destination_key_prefix=destination_key_prefix,
+            retain_on_delete=retain_on_delete,
+            retain_releases=retain_releases,
+            live_key_prefix=live_key_prefix,
+            cache_control=STATIC_ASSET_CACHE_CONTROL,
+            default_cache_control=DEFAULT_STATIC_ASSET_CACHE_CONTROL,
+            **invalidation,
+        )
+
+    def _deploy_release(
+        self,
+        *,
+        id: str,
+        source_file_path: str,
+        build_release: str,
+        active_release: str,
+        website_bucket: s3.IBucket,
+        backup_bucket: s3.IBucket | None,
+        distribution: CloudFrontDistribution,
+        max_invalidation_paths: int,
+        retain_releases: int | None = None,
+    ) -> None:
+        """Deploy the build as an immutable release and invalidate the active one.
+
+        Releases are retained on delete, so earlier ones stay available for
+        rollback; `retain_releases` caps how many are kept, never removing
+        the active one. With replication the backup bucket has no deployment
+        of its own, so releases pruned from the website bucket leave the
+        backup bucket through delete-marker replication. CloudFront switches origin path only after the
+        release is uploaded, then the active release's mutable paths are
+        invalidated.
+        """
+        retention = {
+            "retain_releases": retain_releases,
+            "live_key_prefix": release_prefix(active_release),
+        }
+        deployments = [
+            self._deploy_changed_assets(
+                deployment_id=f"{id}-WebsiteFilesReleaseDeployment",
+                source_file_path=source_file_path,
+                destination_bucket=website_bucket,
+                destination_key_prefix=release_prefix(build_release),
+                retain_on_delete=True,
+                **retention,
+            )
+        ]
+        if backup_bucket is not None:
+            deployments.append(
+                self._deploy_changed_assets(
+                    deployment_id=f"{id}-BackupWebsiteFilesReleaseDeployment",
+                    source_file_path=source_file_path,
+                    destination_bucket=backup_bucket,
+                    destination_key_prefix=release_prefix(build_release),
+                    retain_on_delete=True,
+                    **retention,
+                )
+            )
+        for deployment in deployments:
+            distribution.cf_distribution.node.add_dependency(
+                deployment.deployment_resource
+            )
+
+        StaticSiteReleaseInvalidation(
+            self,
+            f"{id}-ReleaseInvalidation",
+            bucket=website_bucket,
+            release_id=active_release,
+            distribution=distribution.cf_distribution,
+            immutable_patterns=IMMUTABLE_ASSET_PATTERNS,
+            invalidation_aliases=distribution.clean_url_aliases,
+            max_invalidation_paths=max_invalidation_paths,
+        )
@@ -4,14 +4,20 @@ from pathlib import Path
 import sys
 
 import pytest
-from aws_cdk import App, Environment
+from aws_cdk import App, Environment, Stack, aws_cloudfront as cloudfront
 
 ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+REPLICATOR_LAMBDA_DIR = ROOT / "assets" / "lambdas" / "ssm_param_replicator"
+DEPLOYER_LAMBDA_DIR = ROOT / "assets" / "lambdas" / "static_site_deployer"
+PROBE_LAMBDA_DIR = ROOT / "assets" / "lambdas" / "ttfb_probe"
+for path in (ROOT, REPLICATOR_LAMBDA_DIR, DEPLOYER_LAMBDA_DIR, PROBE_LAMBDA_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
 from stacks.acm_certificates_stack import ACMCertificatesStack
 from stacks.backup_website_bucket import BackupWebsiteBucketStack
+from config import MonitoringConfig
+from stacks.monitoring_stack import MonitoringStack
 from stacks.website_stack import WebsiteStack
 
 
@@ -112,3 +118,30 @@ def stacks(
     website_stack: WebsiteStack,
 ):
     return backup_stack, acm_stack, website_stack
+
+
+@pytest.fixture()
+def monitoring_stack(test_env: Environment) -> MonitoringStack:
+    # An imported distribution keeps this snapshot independent of the
+    # website stack's template.
+    app = App()
+    distribution = cloudfront.Distribution.from_distribution_attributes(
+        Stack(app, "TestDistribution", env=test_env),
+        "Distribution",
+        distribution_id="E2EXAMPLE123",
+        domain_name="d111111abcdef8.cloudfront.net",
+    )
+    thresholds = MonitoringConfig.from_context(
+        {
+            "cache_hit_rate_min_percent": 85,
+            "origin_latency_p90_max_ms": 750,
+            "alarm_emails": ["ops@example.com"],
+        }
+    )
+    return MonitoringStack(
+        scope=app,
+        id="TestMonitoring",
+        distribution=distribution,
+        thresholds=thresholds.to_dict(),
+        env=test_env,
+    )
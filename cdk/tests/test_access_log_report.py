@@ -0,0 +1,120 @@
+import gzip
+import json
+import sys
+
+import pytest
+
+from benchmarks.access_log_report import (
+    LatencyHistogram,
+    TopCounter,
+    build_report,
+    main,
+)
+
+W3C_HEADER = (
+    "#Version: 1.0\n"
+    "#Fields: date time x-edge-result-type cs-uri-stem time-taken"
+    " time-to-first-byte\n"
+)
+
+
+def _w3c_line(result_type, path, time_taken, ttfb="-"):
+    return f"2026-01-01\t00:00:00\t{result_type}\t{path}\t{time_taken}\t{ttfb}\n"
+
+
+def test_reads_gzipped_w3c_and_json_lines_from_a_directory(tmp_path):
+    logs = tmp_path / "logs" / "2026" / "01"
+    logs.mkdir(parents=True)
+    with gzip.open(logs / "a.gz", "wt") as log:
+        log.write(W3C_HEADER)
+        log.write(_w3c_line("Hit", "/index.html", "0.010", "0.008"))
+        log.write(_w3c_line("Miss", "/resume.pdf", "0.200", "0.150"))
+        log.write(_w3c_line("RefreshHit", "/index.html", "0.050"))
+    (logs / "b.json").write_text(
+        "\n".join(
+            json.dumps(record)
+            for record in (
+                {"x-edge-result-type": "Miss", "cs-uri-stem": "/resume.pdf"},
+                {"x-edge-result-type": "Error", "cs-uri-stem": "/x"},
+                {"x-edge-result-type": "Redirect", "cs-uri-stem": "/cv"},
+            )
+        )
+    )
+    (logs / ".DS_Store").write_text("ignored")
+
+    summary = build_report([tmp_path / "logs"]).summary()
+
+    assert summary["requests"] == 6
+    assert summary["hit_ratio"] == pytest.approx(2 / 6, abs=1e-4)
+    assert summary["miss_ratio"] == pytest.approx(2 / 6, abs=1e-4)
+    assert summary["error_ratio"] == pytest.approx(1 / 6, abs=1e-4)
+    assert summary["other_ratio"] == pytest.approx(1 / 6, abs=1e-4)
+    # Misses and refresh hits both go to the origin.
+    assert summary["origin_fetch_ratio"] == pytest.approx(3 / 6, abs=1e-4)
+    assert summary["top_missed_paths"] == [{"path": "/resume.pdf", "misses": 2}]
+    assert not summary["top_missed_paths_approximate"]
+    assert summary["time_taken"]["p50_ms"] == pytest.approx(50, rel=0.01)
+    assert summary["time_to_first_byte"]["p99_ms"] == pytest.approx(150, rel=0.01)
+
+
+def test_w3c_rows_need_a_fields_header(tmp_path):
+    log = tmp_path / "log.txt"
+    log.write_text(_w3c_line("Hit", "/", "0.1"))
+
+    with pytest.raises(ValueError, match="#Fields"):
+        build_report([log])
+
+
+def test_histogram_percentiles_are_within_one_percent():
+    histogram = LatencyHistogram()
+    for milliseconds in range(1, 10_001):
+        histogram.add(milliseconds / 1000)
+
+    assert histogram.count == 10_000
+    assert histogram.percentile(0.50) == pytest.approx(5000, rel=0.01)
+    assert histogram.percentile(0.95) == pytest.approx(9500, rel=0.01)
+    assert histogram.percentile(0.99) == pytest.approx(9900, rel=0.01)
+    assert LatencyHistogram().percentile(0.5) is None
+
+
+def test_top_counter_stays_bounded_and_keeps_frequent_keys():
+    counter = TopCounter(capacity=5)
+    for index in range(1000):
+        counter.add("/hot")
+        counter.add(f"/cold-{index}")
+
+    assert len(counter._counts) <= 10
+    assert counter.most_common(1) == [("/hot", 1000)]
+    assert counter.approximate
+
+
+def test_parquet_logs_are_read_in_batches(tmp_path, capsys):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {
+            "timestamp": ["2026-01-01T00:00:00Z"] * 3,
+            "x-edge-result-type": ["Hit", "Miss", "Miss"],
+            "cs-uri-stem": ["/", "/a.js", "/a.js"],
+            "time-taken": [0.001, 0.1, 0.2],
+            "time-to-first-byte": [0.001, 0.05, 0.1],
+        }
+    )
+    pq.write_table(table, tmp_path / "part-0.parquet")
+    output = tmp_path / "report.json"
+
+    assert main([str(tmp_path), "--chunk-size", "2", "--output", str(output)]) == 0
+
+    summary = json.loads(output.read_text())
+    assert summary["requests"] == 3
+    assert summary["top_missed_paths"] == [{"path": "/a.js", "misses": 2}]
+    assert "top missed paths" in capsys.readouterr().out
+
+
+def test_parquet_without_pyarrow_explains_how_to_install_it(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    log = tmp_path / "part-0.parquet"
+    log.write_bytes(b"PAR1")
+
+    with pytest.raises(RuntimeError, match="pip install pyarrow"):
+        build_report([log])
@@ -0,0 +1,84 @@
+import pytest
+from aws_cdk import App, Environment
+from aws_cdk.assertions import Match, Template
+
+from my_constructs.cloudfront_access_logs import ACCESS_LOG_FIELDS
+from stacks.access_logs_stack import AccessLogsStack
+
+
+@pytest.fixture()
+def access_logs_template(website_stack, test_app, test_account_id):
+    stack = AccessLogsStack(
+        scope=test_app,
+        id="TestAccessLogs",
+        distribution=website_stack.distribution,
+        retention_days=30,
+        env=Environment(account=test_account_id, region="us-east-1"),
+    )
+    return Template.from_stack(stack)
+
+
+def test_logs_are_delivered_as_parquet(access_logs_template):
+    access_logs_template.has_resource_properties(
+        "AWS::Logs::DeliverySource", {"LogType": "ACCESS_LOGS"}
+    )
+    access_logs_template.has_resource_properties(
+        "AWS::Logs::DeliveryDestination", {"OutputFormat": "parquet"}
+    )
+    access_logs_template.has_resource_properties(
+        "AWS::Logs::Delivery",
+        {
+            "RecordFields": list(ACCESS_LOG_FIELDS),
+            "S3EnableHiveCompatiblePath": True,
+        },
+    )
+
+
+def test_log_bucket_expires_logs_and_allows_log_delivery(access_logs_template):
+    access_logs_template.has_resource_properties(
+        "AWS::S3::Bucket",
+        {
+            "VersioningConfiguration": {"Status": "Enabled"},
+            "LifecycleConfiguration": {
+                "Rules": Match.array_with(
+                    [
+                        Match.object_like(
+                            {
+                                "ExpirationInDays": 30,
+                                "NoncurrentVersionExpiration": {"NoncurrentDays": 1},
+                            }
+                        ),
+                        Match.object_like({"ExpiredObjectDeleteMarker": True}),
+                    ]
+                )
+            },
+        },
+    )
+    access_logs_template.has_resource_properties(
+        "AWS::S3::BucketPolicy",
+        {
+            "PolicyDocument": {
+                "Statement": Match.array_with(
+                    [
+                        Match.object_like(
+                            {
+                                "Sid": "AllowCloudFrontLogDelivery",
+                                "Action": "s3:PutObject",
+                                "Principal": {"Service": "delivery.logs.amazonaws.com"},
+                            }
+                        )
+                    ]
+                )
+            }
+        },
+    )
+
+
+def test_access_logs_must_be_in_us_east_1(website_stack, test_account_id):
+    with pytest.raises(ValueError, match="us-east-1"):
+        AccessLogsStack(
+            scope=App(),
+            id="TestAccessLogs",
+            distribution=website_stack.distribution,
+            env=Environment(account=test_account_id, region="us-east-2"),
+        )
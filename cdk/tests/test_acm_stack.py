@@ -1,4 +1,4 @@
-from aws_cdk.assertions import Template
+from aws_cdk.assertions import Match, Template
 
 from tests.helpers import collect_allowed_actions, collect_ssm_resources
 
@@ -27,23 +27,39 @@ def test_ssm_parameters_created(acm_stack):
 
 def test_replicator_lambda_exists(acm_stack):
     """
-    Ensure that the SSM Parameter Replicator Lambda functions are created.
+    Ensure that the shared SSM replication provider's Lambda is created and
+    that the regions reach it through the custom resource, not its environment.
     """
     template = Template.from_stack(acm_stack)
 
-    # At least one Lambda function should exist for replication
-    assert len(template.find_resources("AWS::Lambda::Function")) >= 1
-
-    # Ensure it has the right environment variables
     template.has_resource_properties(
         "AWS::Lambda::Function",
         {
+            "Handler": "ssm_param_replicator.lambda_handler",
+            "Architectures": ["arm64"],
+            "PackageType": Match.absent(),
             "Environment": {
-                "Variables": {
-                    "SOURCE_REGION": "us-east-1",
-                    "TARGET_REGION": "us-east-2",
-                }
-            }
+                "Variables": Match.object_like(
+                    {
+                        "SOURCE_REGION": Match.absent(),
+                        "TARGET_REGION": Match.absent(),
+                    }
+                )
+            },
+        },
+    )
+
+    template.has_resource_properties(
+        "AWS::CloudFormation::CustomResource",
+        {
+            "ServiceToken": {
+                "Fn::GetAtt": [
+                    Match.string_like_regexp("^SSMReplicationProvider"),
+                    "Arn",
+                ]
+            },
+            "SourceRegion": "us-east-1",
+            "TargetRegions": ["us-east-2"],
         },
     )
 
@@ -56,7 +72,7 @@ def test_replicator_lambda_has_ssm_permissions(acm_stack):
 
     all_actions = collect_allowed_actions(template)
 
-    assert "ssm:GetParameter" in all_actions
+    assert "ssm:GetParameters" in all_actions
     assert "ssm:PutParameter" in all_actions
 
 
@@ -1,4 +1,4 @@
-from aws_cdk.assertions import Template
+from aws_cdk.assertions import Match, Template
 
 from tests.helpers import collect_allowed_actions, collect_ssm_resources
 
@@ -72,23 +72,42 @@ def test_replicator_lambda_configuration(backup_stack):
     # Ensure Lambda functions exist (the replicator handlers)
     template.resource_count_is("AWS::Lambda::Function", 2)
 
-    # Ensure environment variables are present
+    # The shared provider's Lambda is an ARM64 zip function; the regions
+    # come from the custom resource, not its environment
     template.has_resource_properties(
         "AWS::Lambda::Function",
         {
+            "Handler": "ssm_param_replicator.lambda_handler",
+            "Architectures": ["arm64"],
+            "PackageType": Match.absent(),
             "Environment": {
-                "Variables": {
-                    "SOURCE_REGION": "us-east-1",
-                    "TARGET_REGION": "us-east-2",
-                }
-            }
+                "Variables": Match.object_like(
+                    {
+                        "SOURCE_REGION": Match.absent(),
+                        "TARGET_REGION": Match.absent(),
+                    }
+                )
+            },
+        },
+    )
+    template.has_resource_properties(
+        "AWS::CloudFormation::CustomResource",
+        {
+            "ServiceToken": {
+                "Fn::GetAtt": [
+                    Match.string_like_regexp("^SSMReplicationProvider"),
+                    "Arn",
+                ]
+            },
+            "SourceRegion": "us-east-1",
+            "TargetRegions": ["us-east-2"],
         },
     )
 
     actions = collect_allowed_actions(template)
 
     # Assert the critical actions exist
-    assert "ssm:GetParameter" in actions
+    assert "ssm:GetParameters" in actions
     assert "ssm:PutParameter" in actions
 
 
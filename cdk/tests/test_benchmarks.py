@@ -0,0 +1,76 @@
+import boto3
+import pytest
+
+from benchmarks import throughput
+from benchmarks.ssm_stub import SSMStandIn
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+
+def test_stand_in_pages_parameters_by_path():
+    stand_in = SSMStandIn()
+    for index in range(25):
+        stand_in.put("us-east-1", f"/App/param-{index:02d}", str(index))
+    stand_in.put("us-east-1", "/App/nested/param", "nested")
+    stand_in.put("us-east-1", "/Other/param", "other")
+    client = boto3.client("ssm", region_name="us-east-1")
+    stand_in.attach(client)
+
+    pages = list(
+        client.get_paginator("get_parameters_by_path").paginate(
+            Path="/App", Recursive=False, PaginationConfig={"PageSize": 10}
+        )
+    )
+
+    names = [parameter["Name"] for page in pages for parameter in page["Parameters"]]
+    assert [len(page["Parameters"]) for page in pages] == [10, 10, 5]
+    assert names == [f"/App/param-{index:02d}" for index in range(25)]
+
+
+def test_smallest_scenario_replicates_every_parameter():
+    result = throughput.run_scenario(throughput.Scenario("tiny", 12))
+
+    assert result["parameters"] == 12
+    assert result["calls"] > 0
+    assert result["throttles"] == 0
+
+
+def _metrics(throughput_per_s, p50_ms, p99_ms, memory_mb, calls=5000):
+    return {
+        "throughput": throughput_per_s,
+        "call_p50_ms": p50_ms,
+        "call_p99_ms": p99_ms,
+        "calls": calls,
+        "peak_memory_mb": memory_mb,
+    }
+
+
+def test_find_regressions_flags_each_metric_past_tolerance():
+    baseline = _metrics(100.0, 1.0, 2.0, 1.0)
+    within = _metrics(80.0, 2.0, 3.0, 1.2)
+    regressed = _metrics(60.0, 3.0, 4.0, 1.4)
+
+    assert throughput.find_regressions({"s": within}, {"s": baseline}, 0.25) == []
+    assert (
+        len(throughput.find_regressions({"s": regressed}, {"s": baseline}, 0.25)) == 4
+    )
+    assert throughput.find_regressions({"new": regressed}, {"s": baseline}, 0.25) == []
+
+
+def test_p99_is_not_compared_for_runs_with_few_calls():
+    baseline = _metrics(100.0, 1.0, 2.0, 1.0, calls=3)
+    # One slow call out of three is the p99 of a tiny run.
+    noisy = _metrics(100.0, 1.0, 40.0, 1.0, calls=3)
+
+    assert throughput.find_regressions({"s": noisy}, {"s": baseline}, 0.25) == []
+
+
+def test_median_result_ignores_one_outlier_run():
+    runs = [_metrics(100.0, 1.0, 2.0, 1.0), _metrics(10.0, 9.0, 90.0, 9.0)]
+    runs.append(_metrics(90.0, 1.1, 2.1, 1.1))
+
+    assert throughput.median_result(runs) == _metrics(90.0, 1.1, 2.1, 1.1)
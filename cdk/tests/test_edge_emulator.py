@@ -0,0 +1,115 @@
+import shutil
+
+import pytest
+from aws_cdk import App
+
+from benchmarks import edge_load
+from benchmarks.edge_emulator import EdgeEmulator, OriginFault
+from stacks.website_stack import WebsiteStack
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="node is required to run the function"
+)
+
+
+@pytest.fixture()
+def template(tmp_path, test_env, acm_ssm_params, backup_ssm_params):
+    app = App(outdir=str(tmp_path / "cdk.out"))
+    WebsiteStack(
+        scope=app,
+        id="TestWebsite",
+        domain_name="example.com",
+        source_file_path="tests/assets",
+        acm_ssm_params=acm_ssm_params,
+        backup_website_bucket_ssm_params=backup_ssm_params,
+        edge_routes={
+            "/resume": {"rewrite": "/resume.pdf"},
+            "/cv": {"redirect": "/resume", "status_code": 301},
+        },
+        env=test_env,
+    )
+    app.synth()
+    return tmp_path / "cdk.out" / "TestWebsite.template.json"
+
+
+def _bucket(root, name):
+    bucket = root / name
+    (bucket / "assets").mkdir(parents=True)
+    (bucket / "index.html").write_text(f"<h1>{name}</h1>")
+    (bucket / "error.html").write_text("<h1>error</h1>")
+    (bucket / "resume.pdf").write_bytes(b"%PDF")
+    (bucket / "assets" / "app-1.js").write_text("console.log(1)")
+    return bucket
+
+
+@pytest.fixture()
+def buckets(tmp_path):
+    return _bucket(tmp_path, "primary"), _bucket(tmp_path, "backup")
+
+
+def test_serves_the_default_root_object_with_policy_headers(template, buckets):
+    with EdgeEmulator(template, *buckets, function_workers=1) as emulator:
+        response = emulator.handle("/")
+
+    assert response.status == 200
+    assert response.body == b"<h1>primary</h1>"
+    assert response.origin == "primary"
+    assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+    assert response.headers["Cache-Control"] == (
+        "public, max-age=0, s-maxage=300, must-revalidate"
+    )
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert "max-age=31536000" in response.headers["Strict-Transport-Security"]
+
+
+def test_function_routes_come_from_the_key_value_store(template, buckets):
+    with EdgeEmulator(template, *buckets, function_workers=1) as emulator:
+        rewritten = emulator.handle("/resume")
+        redirected = emulator.handle("/cv")
+
+    assert rewritten.body == b"%PDF"
+    assert rewritten.headers["Content-Type"] == "application/pdf"
+    assert redirected.status == 301
+    assert redirected.headers == {"location": "/resume"}
+    assert redirected.origin is None
+
+
+def test_fails_over_to_the_backup_origin(template, buckets):
+    faults = {"primary": OriginFault(503)}
+    with EdgeEmulator(template, *buckets, faults=faults) as emulator:
+        response = emulator.handle("/index.html")
+
+    assert response.status == 200
+    assert response.body == b"<h1>backup</h1>"
+    assert response.failed_over
+
+
+def test_errors_are_served_with_the_error_page(template, buckets):
+    faults = {"primary": OriginFault(503), "backup": OriginFault(502)}
+    with EdgeEmulator(template, *buckets, function_workers=1) as emulator:
+        missing = emulator.handle("/missing")
+    with EdgeEmulator(template, *buckets, faults=faults) as emulator:
+        down = emulator.handle("/index.html")
+
+    assert missing.status == 403
+    assert missing.body == b"<h1>error</h1>"
+    # The error page itself is fetched through the failing origin group.
+    assert down.status == 502
+    assert down.body == b""
+
+
+def test_load_generator_reports_failovers(template, buckets):
+    primary, backup = buckets
+    result = edge_load.run_scenario(
+        edge_load.Scenario("flaky", primary=OriginFault(503, probability=0.5)),
+        template=template,
+        primary=primary,
+        backup=backup,
+        requests=40,
+        concurrency=2,
+    )
+
+    assert result["requests"] == 40
+    assert result["requests_per_second"] > 0
+    assert 0 < result["failovers"] < 40
+    assert result["errors_5xx"] == 0
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+from aws_cdk import App, Environment, Stack, aws_cloudfront as cloudfront
+from aws_cdk.assertions import Match, Template
+
+from config import MonitoringConfig
+from stacks.monitoring_stack import MonitoringStack
+
+
+def test_additional_metrics_are_enabled(monitoring_stack):
+    Template.from_stack(monitoring_stack).has_resource_properties(
+        "AWS::CloudFront::MonitoringSubscription",
+        {
+            "DistributionId": "E2EXAMPLE123",
+            "MonitoringSubscription": {
+                "RealtimeMetricsSubscriptionConfig": {
+                    "RealtimeMetricsSubscriptionStatus": "Enabled"
+                }
+            },
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "metric_name,statistic,threshold,operator",
+    [
+        ("CacheHitRate", "Average", 85, "LessThanThreshold"),
+        ("4xxErrorRate", "Average", 5, "GreaterThanThreshold"),
+        ("5xxErrorRate", "Average", 1, "GreaterThanThreshold"),
+        ("BytesDownloaded", "Sum", 5 * 1000**3, "GreaterThanThreshold"),
+    ],
+)
+def test_alarm_thresholds_come_from_the_environment_config(
+    monitoring_stack, metric_name, statistic, threshold, operator
+):
+    Template.from_stack(monitoring_stack).has_resource_properties(
+        "AWS::CloudWatch::Alarm",
+        {
+            "Namespace": "AWS/CloudFront",
+            "MetricName": metric_name,
+            "Statistic": statistic,
+            "Threshold": threshold,
+            "ComparisonOperator": operator,
+            "Dimensions": Match.array_with(
+                [{"Name": "DistributionId", "Value": "E2EXAMPLE123"}]
+            ),
+            "TreatMissingData": "notBreaching",
+            "AlarmActions": [{"Ref": Match.string_like_regexp("AlarmTopic")}],
+        },
+    )
+
+
+def test_origin_latency_alarm_uses_p90(monitoring_stack):
+    Template.from_stack(monitoring_stack).has_resource_properties(
+        "AWS::CloudWatch::Alarm",
+        {
+            "MetricName": "OriginLatency",
+            "ExtendedStatistic": "p90",
+            "Threshold": 750,
+        },
+    )
+
+
+def test_alarm_emails_subscribe_to_the_topic(monitoring_stack):
+    template = Template.from_stack(monitoring_stack)
+
+    template.resource_count_is("AWS::CloudWatch::Alarm", 5)
+    template.has_resource_properties(
+        "AWS::SNS::Subscription",
+        {"Protocol": "email", "Endpoint": "ops@example.com"},
+    )
+
+
+def test_alarm_topic_is_encrypted_with_a_key_cloudwatch_can_use(monitoring_stack):
+    template = Template.from_stack(monitoring_stack)
+
+    template.has_resource_properties(
+        "AWS::SNS::Topic",
+        {
+            "KmsMasterKeyId": {
+                "Fn::GetAtt": [Match.string_like_regexp("AlarmTopicKey"), "Arn"]
+            }
+        },
+    )
+    template.has_resource_properties(
+        "AWS::KMS::Key",
+        {
+            "EnableKeyRotation": True,
+            "KeyPolicy": {
+                "Statement": Match.array_with(
+                    [
+                        Match.object_like(
+                            {
+                                "Sid": "AllowCloudWatchAlarms",
+                                "Principal": {"Service": "cloudwatch.amazonaws.com"},
+                                "Action": ["kms:Decrypt", "kms:GenerateDataKey*"],
+                            }
+                        )
+                    ]
+                )
+            },
+        },
+    )
+
+
+def test_dashboard_graphs_every_alarmed_metric(monitoring_stack):
+    dashboards = Template.from_stack(monitoring_stack).find_resources(
+        "AWS::CloudWatch::Dashboard"
+    )
+    (dashboard,) = dashboards.values()
+    body = json.dumps(dashboard["Properties"]["DashboardBody"])
+
+    for metric_name in (
+        "Requests",
+        "BytesDownloaded",
+        "CacheHitRate",
+        "OriginLatency",
+        "4xxErrorRate",
+        "5xxErrorRate",
+    ):
+        assert metric_name in body
+
+
+def test_monitoring_must_be_in_us_east_1(test_account_id):
+    app = App()
+    env = Environment(account=test_account_id, region="us-east-2")
+    distribution = cloudfront.Distribution.from_distribution_attributes(
+        Stack(app, "TestDistribution", env=env),
+        "Distribution",
+        distribution_id="E2EXAMPLE123",
+        domain_name="d111111abcdef8.cloudfront.net",
+    )
+
+    with pytest.raises(ValueError, match="us-east-1"):
+        MonitoringStack(
+            scope=app, id="TestMonitoring", distribution=distribution, env=env
+        )
+
+
+@pytest.mark.parametrize(
+    "value,message",
+    [
+        ({"cache_hit_rate_min_percent": 120}, "at most 100"),
+        ({"origin_latency_p90_max_ms": 0}, "positive number"),
+        ({"cache_hit_rate": 80}, "unknown key"),
+        ({"alarm_emails": "ops@example.com"}, "email addresses"),
+    ],
+)
+def test_monitoring_config_is_validated(value, message):
+    with pytest.raises((TypeError, ValueError), match=message):
+        MonitoringConfig.from_context(value)
@@ -18,3 +18,11 @@ def test_templates_snapshot(snapshot, stacks):
     snapshot.assert_match(backup_template, "backup_bucket_snapshot")
     snapshot.assert_match(acm_template, "acm_certificate_snapshot")
     snapshot.assert_match(website_template, "website_snapshot")
+
+
+def test_monitoring_snapshot(snapshot, monitoring_stack):
+    monitoring_template = json.dumps(
+        Template.from_stack(monitoring_stack).to_json(), indent=2, sort_keys=True
+    )
+
+    snapshot.assert_match(monitoring_template, "monitoring_snapshot")
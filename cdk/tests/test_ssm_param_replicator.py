@@ -0,0 +1,705 @@
+import json
+import threading
+import time
+
+import boto3
+import pytest
+from botocore.config import Config
+from botocore.exceptions import EndpointConnectionError
+from botocore.stub import Stubber
+
+import ssm_param_replicator
+
+
+@pytest.fixture()
+def ssm_clients(monkeypatch):
+    """Stubbed source/target SSM clients primed into the client cache."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    # Stubber responses are consumed in order, so serialize writes here.
+    monkeypatch.setattr(ssm_param_replicator, "WRITE_CONCURRENCY", 1)
+    monkeypatch.setattr(ssm_param_replicator.time, "sleep", lambda seconds: None)
+
+    clients = {
+        region: boto3.client("ssm", region_name=region)
+        for region in ("us-east-1", "us-east-2", "us-west-2")
+    }
+    stubbers = {region: Stubber(client) for region, client in clients.items()}
+
+    monkeypatch.setattr(ssm_param_replicator, "_ssm_clients", dict(clients))
+    monkeypatch.setattr(ssm_param_replicator, "_ssm_write_clients", dict(clients))
+
+    for stubber in stubbers.values():
+        stubber.activate()
+    yield stubbers
+    for stubber in stubbers.values():
+        stubber.deactivate()
+
+
+def _event(names, request_type="Create", **extra_properties):
+    return {
+        "RequestType": request_type,
+        "ResourceProperties": {
+            "SourceRegion": "us-east-1",
+            "TargetRegions": ["us-east-2"],
+            "Parameters": json.dumps(
+                [{"source": name, "target": name} for name in names]
+            ),
+            **extra_properties,
+        },
+    }
+
+
+def _parameter(name, value):
+    return {"Name": name, "Value": value, "Type": "String"}
+
+
+def _stub_get_parameters(stubber, names, values):
+    """Queue batched GetParameters responses; names absent from values are invalid."""
+    for batch in ssm_param_replicator.chunked(names, 10):
+        response = {
+            "Parameters": [
+                _parameter(name, values[name]) for name in batch if name in values
+            ]
+        }
+        invalid = [name for name in batch if name not in values]
+        if invalid:
+            response["InvalidParameters"] = invalid
+        stubber.add_response("get_parameters", response, {"Names": batch})
+
+
+def _stub_put_parameter(stubber, name, value):
+    stubber.add_response(
+        "put_parameter",
+        {"Version": 1},
+        {"Name": name, "Value": value, "Type": "String", "Overwrite": True},
+    )
+
+
+def test_source_reads_are_batched(ssm_clients):
+    """25 parameters should be read with three GetParameters calls, not 25."""
+    names = [f"/dummy/param-{index:02d}" for index in range(25)]
+    values = {name: f"{name}-value" for name in names}
+
+    _stub_get_parameters(ssm_clients["us-east-1"], names, values)
+    _stub_get_parameters(ssm_clients["us-east-2"], names, {})
+    for name in names:
+        _stub_put_parameter(ssm_clients["us-east-2"], name, values[name])
+
+    response = ssm_param_replicator.lambda_handler(_event(names), None)
+
+    assert response["Data"]["ReplicatedCount"] == 25
+    ssm_clients["us-east-1"].assert_no_pending_responses()
+    ssm_clients["us-east-2"].assert_no_pending_responses()
+
+
+def test_missing_source_parameters_are_reported_together(ssm_clients):
+    names = ["/dummy/present", "/dummy/missing-a", "/dummy/missing-b"]
+    ssm_clients["us-east-1"].add_response(
+        "get_parameters",
+        {
+            "Parameters": [_parameter("/dummy/present", "value")],
+            "InvalidParameters": ["/dummy/missing-b", "/dummy/missing-a"],
+        },
+        {"Names": names},
+    )
+
+    with pytest.raises(ValueError, match="/dummy/missing-a, /dummy/missing-b"):
+        ssm_param_replicator.lambda_handler(_event(names), None)
+
+    # Nothing is written when any source is missing.
+    ssm_clients["us-east-2"].assert_no_pending_responses()
+
+
+def test_delete_is_a_no_op(ssm_clients):
+    response = ssm_param_replicator.lambda_handler(
+        _event(["/dummy/param"], request_type="Delete"), None
+    )
+
+    assert response["Data"] == {"Message": "Delete - nothing to do"}
+
+
+def test_throttled_writes_are_retried(ssm_clients):
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/dummy/param"], {"/dummy/param": "value"}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], ["/dummy/param"], {})
+    ssm_clients["us-east-2"].add_client_error(
+        "put_parameter", service_error_code="ThrottlingException"
+    )
+    ssm_clients["us-east-2"].add_response("put_parameter", {"Version": 2})
+
+    response = ssm_param_replicator.lambda_handler(_event(["/dummy/param"]), None)
+
+    assert response["Data"]["ReplicatedCount"] == 1
+    ssm_clients["us-east-2"].assert_no_pending_responses()
+
+
+def test_non_throttling_write_errors_fail_the_request(ssm_clients):
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/dummy/param"], {"/dummy/param": "value"}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], ["/dummy/param"], {})
+    ssm_clients["us-east-2"].add_client_error(
+        "put_parameter", service_error_code="AccessDeniedException"
+    )
+
+    with pytest.raises(RuntimeError, match="/dummy/param"):
+        ssm_param_replicator.lambda_handler(_event(["/dummy/param"]), None)
+
+
+def test_unchanged_targets_are_skipped(ssm_clients):
+    names = ["/dummy/same", "/dummy/stale", "/dummy/new"]
+    source_values = {name: f"{name}-value" for name in names}
+    _stub_get_parameters(ssm_clients["us-east-1"], names, source_values)
+    _stub_get_parameters(
+        ssm_clients["us-east-2"],
+        names,
+        {"/dummy/same": "/dummy/same-value", "/dummy/stale": "old"},
+    )
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dummy/stale", "/dummy/stale-value")
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dummy/new", "/dummy/new-value")
+
+    response = ssm_param_replicator.lambda_handler(_event(names), None)
+
+    assert response["Data"]["ReplicatedCount"] == 2
+    assert response["Data"]["SkippedCount"] == 1
+    assert response["Data"]["FailedCount"] == 0
+    ssm_clients["us-east-2"].assert_no_pending_responses()
+
+
+def test_failures_are_counted_when_fail_on_error_is_disabled(ssm_clients):
+    names = ["/dummy/ok", "/dummy/denied"]
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], names, {name: "value" for name in names}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], names, {})
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dummy/ok", "value")
+    ssm_clients["us-east-2"].add_client_error(
+        "put_parameter", service_error_code="AccessDeniedException"
+    )
+
+    response = ssm_param_replicator.lambda_handler(
+        _event(names, FailOnError="false"), None
+    )
+
+    assert response["Data"]["ReplicatedCount"] == 1
+    assert response["Data"]["FailedCount"] == 1
+
+
+class _SlowWriteClient:
+    """Minimal thread-safe SSM client that records write concurrency."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.written = {}
+
+    def put_parameter(self, Name, Value, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+            self.written[Name] = Value
+        return {"Version": 1}
+
+
+def test_writes_respect_worker_pool_size(monkeypatch):
+    monkeypatch.setattr(ssm_param_replicator, "WRITE_CONCURRENCY", 3)
+    monkeypatch.setattr(ssm_param_replicator, "WRITE_RATE_LIMIT", 1000)
+    client = _SlowWriteClient()
+    values = {f"/dummy/param-{index}": str(index) for index in range(12)}
+
+    ssm_param_replicator.write_parameters(client, values)
+
+    assert client.written == values
+    assert client.max_in_flight == 3
+
+
+def test_token_bucket_halves_rate_on_throttle():
+    bucket = ssm_param_replicator.TokenBucket(8)
+
+    bucket.throttled()
+    bucket.throttled()
+    assert bucket.rate == 2
+
+    bucket.succeeded()
+    assert bucket.rate == pytest.approx(2.8)
+
+
+def test_replicates_to_every_target_region(ssm_clients):
+    names = ["/dummy/param"]
+    _stub_get_parameters(ssm_clients["us-east-1"], names, {"/dummy/param": "value"})
+    _stub_get_parameters(ssm_clients["us-east-2"], names, {"/dummy/param": "value"})
+    _stub_get_parameters(ssm_clients["us-west-2"], names, {})
+    _stub_put_parameter(ssm_clients["us-west-2"], "/dummy/param", "value")
+
+    response = ssm_param_replicator.lambda_handler(
+        _event(names, TargetRegions=["us-east-2", "us-west-2"]), None
+    )
+
+    data = response["Data"]
+    assert data["ReplicatedCount"] == 1
+    assert data["SkippedCount"] == 1
+    assert data["us-east-2.SkippedCount"] == 1
+    assert data["us-west-2.ReplicatedCount"] == 1
+    assert response["PhysicalResourceId"] == (
+        "ssm-param-replicator-us-east-1-to-us-east-2-us-west-2"
+    )
+    for region in ("us-east-2", "us-west-2"):
+        ssm_clients[region].assert_no_pending_responses()
+
+
+def test_legacy_single_target_region_property_is_supported():
+    assert ssm_param_replicator.get_target_regions({"TargetRegion": "us-east-2"}) == [
+        "us-east-2"
+    ]
+
+
+def test_path_mode_streams_pages_into_the_target_path(ssm_clients):
+    source = ssm_clients["us-east-1"]
+    target = ssm_clients["us-east-2"]
+    path_filter = [{"Key": "Type", "Option": "Equals", "Values": ["String"]}]
+
+    source.add_response(
+        "get_parameters_by_path",
+        {"Parameters": [_parameter("/Source/a", "1")], "NextToken": "page-2"},
+        {
+            "Path": "/Source",
+            "Recursive": True,
+            "ParameterFilters": path_filter,
+            "MaxResults": 10,
+        },
+    )
+    _stub_get_parameters(target, ["/Target/a"], {})
+    _stub_put_parameter(target, "/Target/a", "1")
+
+    source.add_response(
+        "get_parameters_by_path",
+        {"Parameters": [_parameter("/Source/nested/b", "2")]},
+        {
+            "Path": "/Source",
+            "Recursive": True,
+            "ParameterFilters": path_filter,
+            "MaxResults": 10,
+            "NextToken": "page-2",
+        },
+    )
+    _stub_get_parameters(target, ["/Target/nested/b"], {"/Target/nested/b": "2"})
+
+    response = ssm_param_replicator.lambda_handler(
+        _event([], SourcePath="/Source", TargetPath="/Target"), None
+    )
+
+    assert response["Data"]["ReplicatedCount"] == 1
+    assert response["Data"]["SkippedCount"] == 1
+    source.assert_no_pending_responses()
+    target.assert_no_pending_responses()
+
+
+def test_map_to_target_path_rejects_names_outside_the_path():
+    with pytest.raises(ValueError):
+        ssm_param_replicator.map_to_target_path("/Other/a", "/Source", "/Target")
+
+
+class _LambdaContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def _stub_pending_write(ssm_clients):
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/dummy/param"], {"/dummy/param": "value"}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], ["/dummy/param"], {})
+
+
+def test_sync_mode_fails_cleanly_when_the_deadline_passes(ssm_clients):
+    _stub_pending_write(ssm_clients)
+
+    with pytest.raises(TimeoutError, match="1 parameter"):
+        ssm_param_replicator.lambda_handler(
+            _event(["/dummy/param"]), _LambdaContext(remaining_ms=1000)
+        )
+
+
+def _expire_after_put_parameter(client, context):
+    def expire(**kwargs):
+        context.remaining_ms = 1000
+
+    client.meta.events.register("after-call.ssm.PutParameter", expire)
+
+
+def test_deadline_passing_after_the_final_batch_completes_the_run(ssm_clients):
+    context = _LambdaContext(remaining_ms=900_000)
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/dummy/param"], {"/dummy/param": "value"}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], ["/dummy/param"], {})
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dummy/param", "value")
+    _expire_after_put_parameter(ssm_clients["us-east-2"].client, context)
+
+    response = ssm_param_replicator.lambda_handler(_event(["/dummy/param"]), context)
+
+    assert context.remaining_ms == 1000
+    assert response["Data"]["ReplicatedCount"] == 1
+    assert response["Data"]["PendingCount"] == 0
+
+
+def test_deadline_passing_with_pages_unread_fails_the_run(ssm_clients):
+    context = _LambdaContext(remaining_ms=900_000)
+    source = ssm_clients["us-east-1"]
+    target = ssm_clients["us-east-2"]
+    source.add_response(
+        "get_parameters_by_path",
+        {"Parameters": [_parameter("/Source/a", "1")], "NextToken": "page-2"},
+    )
+    _stub_get_parameters(target, ["/Target/a"], {})
+    _stub_put_parameter(target, "/Target/a", "1")
+    _expire_after_put_parameter(target.client, context)
+
+    with pytest.raises(TimeoutError):
+        ssm_param_replicator.lambda_handler(
+            _event([], SourcePath="/Source", TargetPath="/Target"), context
+        )
+    # The second page is never requested once the deadline has passed.
+    source.assert_no_pending_responses()
+
+
+def test_async_mode_defers_pending_writes_to_is_complete(ssm_clients):
+    _stub_pending_write(ssm_clients)
+
+    response = ssm_param_replicator.lambda_handler(
+        _event(["/dummy/param"], AsyncCompletion="true"),
+        _LambdaContext(remaining_ms=1000),
+    )
+
+    assert response["Data"]["Message"] == "Replication in progress"
+    assert response["Data"]["PendingCount"] == 1
+
+    # A poll that is also out of time reports the job as unfinished ...
+    _stub_pending_write(ssm_clients)
+    poll = ssm_param_replicator.is_complete_handler(
+        _event(["/dummy/param"], AsyncCompletion="true"),
+        _LambdaContext(remaining_ms=1000),
+    )
+    assert poll == {"IsComplete": False}
+
+    # ... and a poll with time to spare resumes and finishes it.
+    _stub_pending_write(ssm_clients)
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dummy/param", "value")
+    poll = ssm_param_replicator.is_complete_handler(
+        _event(["/dummy/param"], AsyncCompletion="true"),
+        _LambdaContext(remaining_ms=60000),
+    )
+    assert poll["IsComplete"] is True
+    assert poll["Data"]["ReplicatedCount"] == 1
+    ssm_clients["us-east-2"].assert_no_pending_responses()
+
+
+def test_is_complete_handler_completes_deletes_immediately():
+    event = _event(["/dummy/param"], request_type="Delete")
+
+    assert ssm_param_replicator.is_complete_handler(event, None) == {"IsComplete": True}
+
+
+def test_clients_are_cached_per_region(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(ssm_param_replicator, "_ssm_clients", {})
+    monkeypatch.setattr(ssm_param_replicator, "_ssm_write_clients", {})
+
+    first = ssm_param_replicator.get_ssm_client("us-east-1")
+    writer = ssm_param_replicator.get_ssm_write_client("us-east-1")
+
+    assert ssm_param_replicator.get_ssm_client("us-east-1") is first
+    assert ssm_param_replicator.get_ssm_client("us-east-2") is not first
+    assert first.meta.config.max_pool_connections == max(
+        ssm_param_replicator.WRITE_CONCURRENCY, 1
+    )
+    assert first.meta.config.retries["mode"] == "adaptive"
+    # Throttled writes are retried by the replicator alone.
+    assert ssm_param_replicator.get_ssm_write_client("us-east-1") is writer
+    assert writer is not first
+    assert writer.meta.config.retries["total_max_attempts"] == 1
+    assert writer.meta.config.max_pool_connections == (
+        first.meta.config.max_pool_connections
+    )
+
+
+def _delta_event(old_triggers, new_triggers, **extra_properties):
+    names = ["/dummy/cert-arn", "/dummy/bucket-name"]
+    event = _event(
+        names, request_type="Update", ParameterTriggers=new_triggers, **extra_properties
+    )
+    event["PhysicalResourceId"] = "replicator"
+    event["OldResourceProperties"] = {
+        **_event(names)["ResourceProperties"],
+        "ParameterTriggers": old_triggers,
+    }
+    return event
+
+
+def test_update_replicates_only_parameters_whose_trigger_changed(ssm_clients):
+    event = _delta_event(
+        old_triggers={"/dummy/cert-arn": ["arn-1"], "/dummy/bucket-name": ["b"]},
+        new_triggers={"/dummy/cert-arn": ["arn-2"], "/dummy/bucket-name": ["b"]},
+    )
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/dummy/cert-arn"], {"/dummy/cert-arn": "arn-2"}
+    )
+    _stub_get_parameters(
+        ssm_clients["us-east-2"], ["/dummy/cert-arn"], {"/dummy/cert-arn": "arn-1"}
+    )
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dummy/cert-arn", "arn-2")
+
+    response = ssm_param_replicator.lambda_handler(event, None)
+
+    assert response["Data"]["ReplicatedCount"] == 1
+    assert response["Data"]["UnchangedCount"] == 1
+    ssm_clients["us-east-1"].assert_no_pending_responses()
+    ssm_clients["us-east-2"].assert_no_pending_responses()
+
+
+def test_update_without_changes_makes_no_ssm_calls(ssm_clients):
+    triggers = {"/dummy/cert-arn": ["arn-1"], "/dummy/bucket-name": ["b"]}
+
+    response = ssm_param_replicator.lambda_handler(
+        _delta_event(triggers, triggers), None
+    )
+
+    assert response["Data"]["ReplicatedCount"] == 0
+    assert response["Data"]["UnchangedCount"] == 2
+
+
+@pytest.mark.parametrize(
+    "extra_properties",
+    [{"FullResync": "true"}, {"TargetRegions": ["us-east-2", "us-west-2"]}],
+)
+def test_full_resync_and_region_changes_replicate_everything(
+    ssm_clients, extra_properties
+):
+    names = ["/dummy/cert-arn", "/dummy/bucket-name"]
+    values = {name: "value" for name in names}
+    triggers = {name: ["unchanged"] for name in names}
+    event = _delta_event(triggers, triggers, **extra_properties)
+    _stub_get_parameters(ssm_clients["us-east-1"], names, values)
+    for region in event["ResourceProperties"]["TargetRegions"]:
+        _stub_get_parameters(ssm_clients[region], names, values)
+
+    response = ssm_param_replicator.lambda_handler(event, None)
+
+    assert response["Data"]["SkippedCount"] == len(
+        event["ResourceProperties"]["TargetRegions"]
+    ) * len(names)
+    assert response["Data"]["UnchangedCount"] == 0
+
+
+def _emf_records(output):
+    records = []
+    for line in output.splitlines():
+        if line.startswith("{") and '"_aws"' in line:
+            records.append(json.loads(line))
+    return records
+
+
+def test_ssm_calls_are_emitted_as_emf_metrics(ssm_clients, capsys):
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/dummy/param"], {"/dummy/param": "value"}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], ["/dummy/param"], {})
+    ssm_clients["us-east-2"].add_client_error(
+        "put_parameter", service_error_code="ThrottlingException"
+    )
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dummy/param", "value")
+    capsys.readouterr()
+
+    ssm_param_replicator.lambda_handler(_event(["/dummy/param"]), None)
+
+    records = _emf_records(capsys.readouterr().out)
+    calls = {
+        (record["Region"], record["Operation"]): record
+        for record in records
+        if "Operation" in record
+    }
+    assert set(calls) == {
+        ("us-east-1", "GetParameters"),
+        ("us-east-2", "GetParameters"),
+        ("us-east-2", "PutParameter"),
+    }
+    put = calls[("us-east-2", "PutParameter")]
+    assert put["Calls"] == 2
+    assert put["Throttles"] == 1
+    assert len(put["Latency"]) == 2
+    metric_names = {
+        metric["Name"] for metric in put["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+    }
+    assert {"Latency", "Retries", "RequestBytes", "ResponseBytes"} <= metric_names
+    assert put["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [
+        ["Region", "Operation"]
+    ]
+
+    (region_counts,) = [
+        record
+        for record in records
+        if record.get("Region") and "ReplicatedCount" in record
+    ]
+    assert region_counts["Region"] == "us-east-2"
+    assert region_counts["ReplicatedCount"] == 1
+    assert any("ReplicationDuration" in record for record in records)
+
+
+def test_transport_errors_are_recorded_and_reraised(monkeypatch, capsys):
+    """botocore sends after-call-error with only `exception` and `context`."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    client = boto3.client(
+        "ssm",
+        region_name="us-east-2",
+        # Nothing listens on port 9, so every attempt fails to connect.
+        endpoint_url="http://127.0.0.1:9",
+        config=Config(retries={"max_attempts": 1}, connect_timeout=1),
+    )
+    telemetry = ssm_param_replicator.Telemetry(namespace="Test")
+    telemetry.instrument(client)
+
+    with pytest.raises(EndpointConnectionError):
+        client.get_parameters(Names=["/dummy/param"])
+    telemetry.flush()
+
+    (record,) = _emf_records(capsys.readouterr().out)
+    assert record["Region"] == "us-east-2"
+    assert record["Operation"] == "GetParameters"
+    assert record["Calls"] == 1
+    assert record["Errors"] == 1
+
+
+class _ThreadLocalRecorder:
+    """X-Ray recorder stand-in that, like the SDK, keeps entities per thread."""
+
+    def __init__(self):
+        self.local = threading.local()
+        self.subsegment_parents = []
+
+    def get_trace_entity(self):
+        return getattr(self.local, "entity", None)
+
+    def set_trace_entity(self, entity):
+        self.local.entity = entity
+
+    def clear_trace_entities(self):
+        self.local.__dict__.clear()
+
+    def begin_subsegment(self, name, namespace):
+        self.subsegment_parents.append((name, self.get_trace_entity()))
+
+    def end_subsegment(self):
+        pass
+
+
+def test_worker_thread_calls_are_traced_under_the_invocation(ssm_clients, monkeypatch):
+    recorder = _ThreadLocalRecorder()
+    monkeypatch.setattr("telemetry.xray_recorder", recorder)
+    monkeypatch.setattr(
+        ssm_param_replicator,
+        "telemetry",
+        ssm_param_replicator.Telemetry(
+            namespace="Test", tracing_enabled=True, emit=lambda line: None
+        ),
+    )
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/dummy/param"], {"/dummy/param": "value"}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], ["/dummy/param"], {})
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dummy/param", "value")
+
+    recorder.set_trace_entity("invocation")
+    ssm_param_replicator.lambda_handler(_event(["/dummy/param"]), None)
+
+    # The target read and write run in executor threads.
+    assert recorder.subsegment_parents == [
+        ("SSM.GetParameters", "invocation"),
+        ("SSM.GetParameters", "invocation"),
+        ("SSM.PutParameter", "invocation"),
+    ]
+
+
+def _change_records(names, **replication):
+    replication = {
+        "SourceRegion": "us-east-1",
+        "TargetRegions": ["us-east-2"],
+        **replication,
+    }
+    return {
+        "Records": [
+            {
+                "messageId": f"message-{index}",
+                "body": json.dumps({"Name": name, "Replication": replication}),
+            }
+            for index, name in enumerate(names)
+        ]
+    }
+
+
+def test_change_events_are_coalesced_into_one_batch(ssm_clients):
+    """Repeated changes to a parameter are read and written once."""
+    event = _change_records(
+        ["/app/a", "/app/b", "/app/a", "/other/ignored"],
+        SourcePath="/app",
+        TargetPath="/dr/app",
+    )
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/app/a", "/app/b"], {"/app/a": "1", "/app/b": "2"}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], ["/dr/app/a", "/dr/app/b"], {})
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dr/app/a", "1")
+    _stub_put_parameter(ssm_clients["us-east-2"], "/dr/app/b", "2")
+
+    response = ssm_param_replicator.event_handler(event, None)
+
+    assert response == {"batchItemFailures": []}
+    ssm_clients["us-east-1"].assert_no_pending_responses()
+    ssm_clients["us-east-2"].assert_no_pending_responses()
+
+
+def test_change_events_skip_deleted_sources(ssm_clients):
+    event = _change_records(
+        ["/dummy/param"],
+        Parameters=json.dumps([{"source": "/dummy/param", "target": "/dummy/param"}]),
+    )
+    _stub_get_parameters(ssm_clients["us-east-1"], ["/dummy/param"], {})
+
+    response = ssm_param_replicator.event_handler(event, None)
+
+    assert response == {"batchItemFailures": []}
+    ssm_clients["us-east-2"].assert_no_pending_responses()
+
+
+def test_failed_change_events_are_reported_for_redelivery(ssm_clients):
+    event = _change_records(
+        ["/dummy/param", "/dummy/param"],
+        Parameters=json.dumps([{"source": "/dummy/param", "target": "/dummy/param"}]),
+    )
+    _stub_get_parameters(
+        ssm_clients["us-east-1"], ["/dummy/param"], {"/dummy/param": "v"}
+    )
+    _stub_get_parameters(ssm_clients["us-east-2"], ["/dummy/param"], {})
+    ssm_clients["us-east-2"].add_client_error(
+        "put_parameter", service_error_code="AccessDeniedException"
+    )
+
+    response = ssm_param_replicator.event_handler(event, None)
+
+    assert response == {
+        "batchItemFailures": [
+            {"itemIdentifier": "message-0"},
+            {"itemIdentifier": "message-1"},
+        ]
+    }
@@ -0,0 +1,212 @@
+import pytest
+from aws_cdk import App, Duration, Environment, Stack, aws_lambda as _lambda
+from aws_cdk.assertions import Match, Template
+
+from my_constructs.ssm_param_replicator import SSMParameterReplicator
+from my_constructs.ssm_replication_provider import SSMReplicationProvider
+from tests.helpers import collect_ssm_resources
+
+PARAMETERS = [{"source": "/dummy/param", "target": "/dummy/param"}]
+
+
+def _replicator_template(**replicator_kwargs) -> Template:
+    stack = Stack(
+        App(),
+        "TestReplicator",
+        env=Environment(account="111111111111", region="us-east-1"),
+    )
+    SSMParameterReplicator(
+        stack,
+        "Replicator",
+        **{
+            "source_region": "us-east-1",
+            "target_regions": ["us-east-2"],
+            "parameters": PARAMETERS,
+            **replicator_kwargs,
+        },
+    )
+    return Template.from_stack(stack)
+
+
+def test_zip_arm64_packaging_by_default():
+    template = _replicator_template(memory_size=256)
+
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Runtime": "python3.14",
+            "Handler": "ssm_param_replicator.lambda_handler",
+            "Architectures": ["arm64"],
+            "MemorySize": 256,
+        },
+    )
+
+
+def test_docker_packaging_uses_image_for_each_handler():
+    template = _replicator_template(
+        packaging="docker",
+        architecture=_lambda.Architecture.X86_64,
+        async_completion=True,
+    )
+
+    for handler in ("lambda_handler", "is_complete_handler"):
+        template.has_resource_properties(
+            "AWS::Lambda::Function",
+            {
+                "PackageType": "Image",
+                "Architectures": ["x86_64"],
+                "ImageConfig": {"Command": [f"ssm_param_replicator.{handler}"]},
+                "Runtime": Match.absent(),
+            },
+        )
+
+
+def test_shared_provider_combines_prefixes_across_stacks():
+    app = App()
+    env = Environment(account="111111111111", region="us-east-1")
+    provider_stack = Stack(app, "ProviderStack", env=env)
+    provider = SSMReplicationProvider(provider_stack, "Provider")
+
+    consumer_stacks = []
+    for name, prefix in (("Certs", "/certs"), ("Bucket", "/bucket")):
+        stack = Stack(app, f"{name}Stack", env=env)
+        SSMParameterReplicator(
+            stack,
+            "Replicator",
+            source_region="us-east-1",
+            target_regions=["us-east-2"],
+            param_path_prefix=prefix,
+            parameters=[{"source": f"{prefix}/a", "target": f"{prefix}/a"}],
+            provider=provider,
+        )
+        consumer_stacks.append(stack)
+
+    for stack in consumer_stacks:
+        template = Template.from_stack(stack)
+        template.resource_count_is("AWS::Lambda::Function", 0)
+        template.resource_count_is("AWS::CloudFormation::CustomResource", 1)
+
+    provider_template = Template.from_stack(provider_stack)
+    # The replication handler plus the provider framework's onEvent function.
+    provider_template.resource_count_is("AWS::Lambda::Function", 2)
+    resources = collect_ssm_resources(provider_template)
+    for region, prefix in (
+        ("us-east-1", "certs"),
+        ("us-east-1", "bucket"),
+        ("us-east-2", "certs"),
+        ("us-east-2", "bucket"),
+    ):
+        assert f"arn:aws:ssm:{region}:111111111111:parameter/{prefix}/*" in resources
+
+
+def test_provider_options_rejected_with_shared_provider():
+    stack = Stack(App(), "TestReplicator")
+    provider = SSMReplicationProvider(stack, "Provider")
+
+    with pytest.raises(ValueError, match="write_concurrency"):
+        SSMParameterReplicator(
+            stack,
+            "Replicator",
+            source_region="us-east-1",
+            target_regions=["us-east-2"],
+            parameters=PARAMETERS,
+            provider=provider,
+            write_concurrency=8,
+        )
+
+
+def test_per_parameter_update_triggers_are_passed_to_the_handler():
+    template = _replicator_template(
+        update_triggers={"/dummy/param": "arn-1"}, full_resync=True
+    )
+
+    template.has_resource_properties(
+        "AWS::CloudFormation::CustomResource",
+        {
+            "ParameterTriggers": {"/dummy/param": ["arn-1"]},
+            "UpdateTriggers": [],
+            "FullResync": "true",
+        },
+    )
+
+
+def test_update_trigger_keys_must_be_listed_parameters():
+    with pytest.raises(ValueError, match="/dummy/other"):
+        _replicator_template(update_triggers={"/dummy/other": "arn-1"})
+
+
+def test_tracing_and_metric_namespace_configure_the_lambda():
+    template = _replicator_template(
+        packaging="docker", tracing=True, metric_namespace="Portfolio/SSM"
+    )
+
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "TracingConfig": {"Mode": "Active"},
+            "Environment": {
+                "Variables": Match.object_like(
+                    {"METRIC_NAMESPACE": "Portfolio/SSM", "TRACING_ENABLED": "true"}
+                )
+            },
+        },
+    )
+
+
+def test_tracing_requires_docker_packaging():
+    # The zip package has no X-Ray SDK, so its subsegments would never exist.
+    with pytest.raises(ValueError, match="tracing requires"):
+        _replicator_template(tracing=True)
+
+
+def test_event_driven_mode_queues_parameter_changes_for_the_event_lambda():
+    template = _replicator_template(
+        event_driven=True, event_batch_window=Duration.seconds(30)
+    )
+
+    template.has_resource_properties(
+        "AWS::Events::Rule",
+        {
+            "EventPattern": {
+                "source": ["aws.ssm"],
+                "detail-type": ["Parameter Store Change"],
+                "detail": {
+                    "name": ["/dummy/param"],
+                    "operation": ["Create", "Update"],
+                    "type": ["String"],
+                },
+            },
+            "Targets": [
+                Match.object_like(
+                    {
+                        "InputTransformer": {
+                            "InputPathsMap": {"detail-name": "$.detail.name"},
+                            "InputTemplate": Match.string_like_regexp(
+                                '"SourceRegion":"us-east-1"'
+                            ),
+                        }
+                    }
+                )
+            ],
+        },
+    )
+    template.has_resource_properties(
+        "AWS::Lambda::EventSourceMapping",
+        {
+            "BatchSize": 100,
+            "MaximumBatchingWindowInSeconds": 30,
+            "FunctionResponseTypes": ["ReportBatchItemFailures"],
+        },
+    )
+    template.has_resource_properties(
+        "AWS::Lambda::Function", {"Handler": "ssm_param_replicator.event_handler"}
+    )
+    template.has_resource_properties(
+        "AWS::SQS::Queue",
+        {"RedrivePolicy": Match.object_like({"maxReceiveCount": 5})},
+    )
+
+
+def test_event_driven_mode_requires_the_source_region_stack():
+    with pytest.raises(ValueError, match="source_region"):
+        _replicator_template(event_driven=True, source_region="us-west-2")
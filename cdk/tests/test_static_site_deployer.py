@@ -0,0 +1,585 @@
+import hashlib
+import io
+import json
+import zipfile
+
+import boto3
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import ANY, Stubber
+
+import static_site_deployer
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _entry(data: bytes, content_type: str, cache_control: str | None = None) -> dict:
+    entry = {"sha256": _sha256(data), "content_type": content_type}
+    if cache_control:
+        entry["cache_control"] = cache_control
+    return entry
+
+
+def _body(data: bytes) -> StreamingBody:
+    return StreamingBody(io.BytesIO(data), len(data))
+
+
+@pytest.fixture()
+def clients(monkeypatch):
+    """Stubbed S3 and CloudFront clients with serialized uploads."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    # Stubber responses are consumed in order, so serialize uploads here.
+    monkeypatch.setattr(static_site_deployer, "UPLOAD_CONCURRENCY", 1)
+
+    s3 = boto3.client("s3", region_name="us-east-1")
+    cloudfront = boto3.client("cloudfront", region_name="us-east-1")
+    monkeypatch.setattr(static_site_deployer, "_s3_client", s3)
+    monkeypatch.setattr(static_site_deployer, "_cloudfront_client", cloudfront)
+
+    stubbers = {"s3": Stubber(s3), "cloudfront": Stubber(cloudfront)}
+    for stubber in stubbers.values():
+        stubber.activate()
+    yield stubbers
+    for stubber in stubbers.values():
+        stubber.deactivate()
+
+
+def _site(monkeypatch, files):
+    """Serve `files` as the site asset zip instead of downloading it."""
+
+    def download_source(s3, bucket, key, path):
+        with zipfile.ZipFile(path, "w") as archive:
+            for name, data in files.items():
+                archive.writestr(name, data)
+
+    monkeypatch.setattr(static_site_deployer, "download_source", download_source)
+
+
+def _event(request_type="Create", **properties):
+    return {
+        "RequestType": request_type,
+        "RequestId": "request-1",
+        "ResourceProperties": {
+            "SourceBucket": "assets",
+            "SourceKey": "site.zip",
+            "DestinationBucket": "website",
+            "ManifestKey": ".deploy-manifest.json",
+            **properties,
+        },
+    }
+
+
+def _stub_manifest(stubber, files):
+    document = json.dumps({"version": 2, "files": files}).encode()
+    stubber.add_response(
+        "get_object",
+        {"Body": _body(document)},
+        {"Bucket": "website", "Key": ".deploy-manifest.json"},
+    )
+
+
+def test_diff_manifests_reports_changed_and_removed_paths():
+    previous = {"index.html": "a", "app.js": "b", "old.css": "c"}
+    current = {"index.html": "a", "app.js": "B", "new.css": "d"}
+
+    changed, removed = static_site_deployer.diff_manifests(previous, current)
+
+    assert changed == ["app.js", "new.css"]
+    assert removed == ["old.css"]
+
+
+def test_invalidation_paths_include_clean_url_aliases():
+    paths = static_site_deployer.invalidation_paths(
+        ["resume.pdf", "index.html", "assets/app 1.js"],
+        aliases={"resume.pdf": ["/resume", "/resume/"]},
+    )
+
+    assert paths == [
+        "/",
+        "/assets/app%201.js",
+        "/index.html",
+        "/resume",
+        "/resume.pdf",
+        "/resume/",
+    ]
+
+
+def test_invalidation_falls_back_to_a_wildcard_past_the_path_limit():
+    changed = [f"assets/chunk-{index}.js" for index in range(5)]
+
+    assert static_site_deployer.invalidation_paths(changed, max_paths=5) == sorted(
+        f"/{path}" for path in changed
+    )
+    assert static_site_deployer.invalidation_paths(changed, max_paths=4) == ["/*"]
+
+
+def test_only_changed_objects_are_uploaded_and_removed_ones_pruned(
+    clients, monkeypatch
+):
+    _site(
+        monkeypatch,
+        {"index.html": b"<html>new</html>", "app.css": b"body{}", "new.js": b"1"},
+    )
+    _stub_manifest(
+        clients["s3"],
+        {
+            "index.html": _entry(b"<html>old</html>", "text/html; charset=utf-8"),
+            "app.css": _entry(b"body{}", "text/css; charset=utf-8"),
+            "gone.txt": _entry(b"gone", "text/plain; charset=utf-8"),
+        },
+    )
+    for key, content_type in (
+        ("index.html", "text/html; charset=utf-8"),
+        ("new.js", "text/javascript; charset=utf-8"),
+    ):
+        clients["s3"].add_response(
+            "put_object",
+            {},
+            {"Bucket": "website", "Key": key, "Body": ANY, "ContentType": content_type},
+        )
+    clients["s3"].add_response(
+        "delete_objects",
+        {},
+        {
+            "Bucket": "website",
+            "Delete": {"Objects": [{"Key": "gone.txt"}], "Quiet": True},
+        },
+    )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": ".deploy-manifest.json",
+            "Body": ANY,
+            "ContentType": "application/json",
+        },
+    )
+    paths = ["/", "/gone.txt", "/index.html", "/new.js"]
+    batch = {
+        "Paths": {"Quantity": len(paths), "Items": paths},
+        "CallerReference": "request-1",
+    }
+    clients["cloudfront"].add_response(
+        "create_invalidation",
+        {
+            "Invalidation": {
+                "Id": "I1",
+                "Status": "InProgress",
+                "CreateTime": "2026-01-01",
+                "InvalidationBatch": batch,
+            }
+        },
+        {"DistributionId": "E123", "InvalidationBatch": batch},
+    )
+
+    response = static_site_deployer.lambda_handler(_event(DistributionId="E123"), None)
+
+    assert response["Data"]["UploadedCount"] == 2
+    assert response["Data"]["DeletedCount"] == 1
+    assert response["Data"]["UnchangedCount"] == 1
+    assert response["Data"]["InvalidationId"] == "I1"
+    assert response["Data"]["InvalidatedPathCount"] == 4
+    clients["s3"].assert_no_pending_responses()
+    clients["cloudfront"].assert_no_pending_responses()
+
+
+def test_unchanged_release_skips_uploads_and_invalidation(clients, monkeypatch):
+    _site(monkeypatch, {"index.html": b"same"})
+    _stub_manifest(
+        clients["s3"], {"index.html": _entry(b"same", "text/html; charset=utf-8")}
+    )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": ".deploy-manifest.json",
+            "Body": ANY,
+            "ContentType": "application/json",
+        },
+    )
+
+    response = static_site_deployer.lambda_handler(
+        _event("Update", DistributionId="E123"), None
+    )
+
+    assert response["Data"]["UploadedCount"] == 0
+    assert "InvalidationId" not in response["Data"]
+    clients["cloudfront"].assert_no_pending_responses()
+
+
+def test_cache_control_uses_the_first_matching_rule():
+    rules = [("assets/*", "immutable"), ("*.html", "revalidate")]
+
+    assert static_site_deployer.cache_control("assets/a.html", rules) == "immutable"
+    assert static_site_deployer.cache_control("blog/post.html", rules) == "revalidate"
+    assert static_site_deployer.cache_control("favicon.ico", rules, "day") == "day"
+    assert static_site_deployer.cache_control("favicon.ico", rules) is None
+
+
+def test_content_type_adds_a_charset_to_textual_types():
+    content_type = static_site_deployer.content_type
+
+    assert content_type("index.html") == "text/html; charset=utf-8"
+    assert content_type("assets/app.js") == "text/javascript; charset=utf-8"
+    assert content_type("vite.svg") == "image/svg+xml; charset=utf-8"
+    assert content_type("resume.pdf") == "application/pdf"
+    assert content_type("favicon.ico") == "image/x-icon"
+    assert content_type("LICENSE") == "application/octet-stream"
+
+
+def test_changed_cache_control_reuploads_unchanged_content(clients, monkeypatch):
+    _site(monkeypatch, {"index.html": b"same", "assets/app-1a2b.js": b"1"})
+    _stub_manifest(
+        clients["s3"],
+        {
+            "index.html": _entry(
+                b"same", "text/html; charset=utf-8", "public, max-age=600"
+            ),
+            "assets/app-1a2b.js": _entry(
+                b"1", "text/javascript; charset=utf-8", "immutable"
+            ),
+        },
+    )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": "index.html",
+            "Body": ANY,
+            "ContentType": "text/html; charset=utf-8",
+            "CacheControl": "no-cache",
+        },
+    )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": ".deploy-manifest.json",
+            "Body": ANY,
+            "ContentType": "application/json",
+        },
+    )
+
+    response = static_site_deployer.lambda_handler(
+        _event(
+            "Update",
+            CacheControl=[
+                {"Pattern": "assets/*", "Value": "immutable"},
+                {"Pattern": "*.html", "Value": "no-cache"},
+            ],
+        ),
+        None,
+    )
+
+    assert response["Data"]["UploadedCount"] == 1
+    assert response["Data"]["UnchangedCount"] == 1
+    clients["s3"].assert_no_pending_responses()
+
+
+def test_split_encoding_recognizes_precompressed_variants():
+    split_encoding = static_site_deployer.split_encoding
+
+    assert split_encoding("assets/app.js.br") == ("assets/app.js", "br")
+    assert split_encoding("index.html.gz") == ("index.html", "gzip")
+    assert split_encoding("index.html") == ("index.html", None)
+    # A plain archive is served as the archive itself.
+    assert split_encoding("backup.gz") == ("backup.gz", None)
+
+
+def test_precompressed_variants_are_uploaded_with_their_encoding(clients, monkeypatch):
+    _site(monkeypatch, {"index.html.br": b"br", "assets/app.js.gz": b"gz"})
+    _stub_manifest(clients["s3"], {})
+    for key, content_type, encoding, cache_control in (
+        ("assets/app.js.gz", "text/javascript; charset=utf-8", "gzip", "immutable"),
+        ("index.html.br", "text/html; charset=utf-8", "br", "no-cache"),
+    ):
+        clients["s3"].add_response(
+            "put_object",
+            {},
+            {
+                "Bucket": "website",
+                "Key": key,
+                "Body": ANY,
+                "ContentType": content_type,
+                "ContentEncoding": encoding,
+                "CacheControl": cache_control,
+            },
+        )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": ".deploy-manifest.json",
+            "Body": ANY,
+            "ContentType": "application/json",
+        },
+    )
+
+    response = static_site_deployer.lambda_handler(
+        _event(
+            CacheControl=[
+                {"Pattern": "assets/*", "Value": "immutable"},
+                {"Pattern": "*.html", "Value": "no-cache"},
+            ],
+        ),
+        None,
+    )
+
+    assert response["Data"]["UploadedCount"] == 2
+    clients["s3"].assert_no_pending_responses()
+
+
+def test_new_release_copies_unchanged_files_from_the_previous_one(clients, monkeypatch):
+    _site(monkeypatch, {"index.html": b"new", "assets/app-1.js": b"1"})
+    clients["s3"].add_client_error(
+        "get_object",
+        "NoSuchKey",
+        expected_params={
+            "Bucket": "website",
+            "Key": "releases/b/.deploy-manifest.json",
+        },
+    )
+    previous = {
+        "index.html": _entry(b"old", "text/html; charset=utf-8"),
+        "assets/app-1.js": _entry(b"1", "text/javascript; charset=utf-8"),
+    }
+    clients["s3"].add_response(
+        "get_object",
+        {"Body": _body(json.dumps({"version": 2, "files": previous}).encode())},
+        {"Bucket": "website", "Key": "releases/a/.deploy-manifest.json"},
+    )
+    clients["s3"].add_response(
+        "copy_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": "releases/b/assets/app-1.js",
+            "CopySource": {"Bucket": "website", "Key": "releases/a/assets/app-1.js"},
+        },
+    )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": "releases/b/index.html",
+            "Body": ANY,
+            "ContentType": "text/html; charset=utf-8",
+        },
+    )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": "releases/b/.deploy-manifest.json",
+            "Body": ANY,
+            "ContentType": "application/json",
+        },
+    )
+    event = _event("Update", DestinationKeyPrefix="releases/b")
+    event["OldResourceProperties"] = {
+        **event["ResourceProperties"],
+        "DestinationKeyPrefix": "releases/a",
+    }
+
+    response = static_site_deployer.lambda_handler(event, None)
+
+    assert response["PhysicalResourceId"] == "static-site-website/releases/b/"
+    assert response["Data"]["UploadedCount"] == 1
+    assert response["Data"]["CopiedCount"] == 1
+    clients["s3"].assert_no_pending_responses()
+
+
+def test_release_invalidation_skips_fingerprinted_paths(clients):
+    release = {
+        "index.html": _entry(b"i", "text/html; charset=utf-8"),
+        "index.html.br": _entry(b"b", "text/html; charset=utf-8"),
+        "resume.pdf": _entry(b"r", "application/pdf"),
+        "assets/app-1.js": _entry(b"1", "text/javascript; charset=utf-8"),
+    }
+    clients["s3"].add_response(
+        "get_object",
+        {"Body": _body(json.dumps({"version": 2, "files": release}).encode())},
+        {"Bucket": "website", "Key": "releases/b/.deploy-manifest.json"},
+    )
+    paths = ["/", "/index.html*", "/resume", "/resume.pdf*"]
+    batch = {
+        "Paths": {"Quantity": len(paths), "Items": paths},
+        "CallerReference": "request-1",
+    }
+    clients["cloudfront"].add_response(
+        "create_invalidation",
+        {
+            "Invalidation": {
+                "Id": "I2",
+                "Status": "InProgress",
+                "CreateTime": "2026-01-01",
+                "InvalidationBatch": batch,
+            }
+        },
+        {"DistributionId": "E123", "InvalidationBatch": batch},
+    )
+
+    response = static_site_deployer.lambda_handler(
+        {
+            "RequestType": "Update",
+            "RequestId": "request-1",
+            "ResourceType": "Custom::StaticSiteReleaseInvalidation",
+            "ResourceProperties": {
+                "DistributionId": "E123",
+                "Bucket": "website",
+                "ReleaseKeyPrefix": "releases/b/",
+                "ManifestKey": ".deploy-manifest.json",
+                "ImmutablePatterns": ["assets/*"],
+                "InvalidationAliases": {"resume.pdf": ["/resume"]},
+            },
+        },
+        None,
+    )
+
+    assert response["Data"] == {"InvalidationId": "I2", "InvalidatedPathCount": 4}
+    clients["s3"].assert_no_pending_responses()
+    clients["cloudfront"].assert_no_pending_responses()
+
+
+def test_delete_removes_only_objects_in_the_manifest(clients):
+    _stub_manifest(clients["s3"], {"index.html": "a", "assets/app.js": "b"})
+    clients["s3"].add_response(
+        "delete_objects",
+        {},
+        {
+            "Bucket": "website",
+            "Delete": {
+                "Objects": [
+                    {"Key": "assets/app.js"},
+                    {"Key": "index.html"},
+                    {"Key": ".deploy-manifest.json"},
+                ],
+                "Quiet": True,
+            },
+        },
+    )
+
+    response = static_site_deployer.lambda_handler(_event("Delete"), None)
+
+    assert response["Data"] == {"Message": "Delete - removed 2 object(s)"}
+    clients["s3"].assert_no_pending_responses()
+
+
+def test_releases_past_the_retained_count_are_pruned(clients, monkeypatch):
+    _site(monkeypatch, {"index.html": b"d"})
+    release = {"index.html": _entry(b"d", "text/html; charset=utf-8")}
+    clients["s3"].add_response(
+        "get_object",
+        {"Body": _body(json.dumps({"version": 2, "files": release}).encode())},
+        {"Bucket": "website", "Key": "releases/d/.deploy-manifest.json"},
+    )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": "releases/d/.deploy-manifest.json",
+            "Body": ANY,
+            "ContentType": "application/json",
+        },
+    )
+    clients["s3"].add_response(
+        "list_objects_v2",
+        {
+            "CommonPrefixes": [
+                {"Prefix": f"releases/{name}/"}
+                for name in ("a", "b", "c", "d", "e", "x")
+            ]
+        },
+        {"Bucket": "website", "Prefix": "releases/", "Delimiter": "/"},
+    )
+    # `e` was deployed after `c`; `x` has no manifest, so it is not a release.
+    for name, day in (("a", 1), ("b", 2), ("c", 3), ("d", 5), ("e", 4)):
+        clients["s3"].add_response(
+            "head_object",
+            {"LastModified": f"2026-01-0{day}T00:00:00Z"},
+            {"Bucket": "website", "Key": f"releases/{name}/.deploy-manifest.json"},
+        )
+    clients["s3"].add_client_error(
+        "head_object",
+        "404",
+        http_status_code=404,
+        expected_params={
+            "Bucket": "website",
+            "Key": "releases/x/.deploy-manifest.json",
+        },
+    )
+    # `a` is live and `c` is the release this update replaces, so of the
+    # releases past the two most recent only `b` is removed.
+    clients["s3"].add_response(
+        "get_object",
+        {"Body": _body(json.dumps({"version": 2, "files": release}).encode())},
+        {"Bucket": "website", "Key": "releases/b/.deploy-manifest.json"},
+    )
+    clients["s3"].add_response(
+        "delete_objects",
+        {},
+        {
+            "Bucket": "website",
+            "Delete": {
+                "Objects": [
+                    {"Key": "releases/b/index.html"},
+                    {"Key": "releases/b/.deploy-manifest.json"},
+                ],
+                "Quiet": True,
+            },
+        },
+    )
+    event = _event(
+        "Update",
+        DestinationKeyPrefix="releases/d",
+        RetainReleases="2",
+        LiveKeyPrefix="releases/a/",
+    )
+    event["OldResourceProperties"] = {
+        **event["ResourceProperties"],
+        "DestinationKeyPrefix": "releases/c",
+        "LiveKeyPrefix": "releases/c/",
+    }
+
+    response = static_site_deployer.lambda_handler(event, None)
+
+    assert response["Data"]["PrunedReleaseCount"] == 1
+    clients["s3"].assert_no_pending_responses()
+
+
+def test_releases_are_kept_without_a_retained_count(clients, monkeypatch):
+    _site(monkeypatch, {"index.html": b"d"})
+    release = {"index.html": _entry(b"d", "text/html; charset=utf-8")}
+    clients["s3"].add_response(
+        "get_object",
+        {"Body": _body(json.dumps({"version": 2, "files": release}).encode())},
+        {"Bucket": "website", "Key": "releases/d/.deploy-manifest.json"},
+    )
+    clients["s3"].add_response(
+        "put_object",
+        {},
+        {
+            "Bucket": "website",
+            "Key": "releases/d/.deploy-manifest.json",
+            "Body": ANY,
+            "ContentType": "application/json",
+        },
+    )
+
+    response = static_site_deployer.lambda_handler(
+        _event("Create", DestinationKeyPrefix="releases/d"), None
+    )
+
+    assert "PrunedReleaseCount" not in response["Data"]
+    clients["s3"].assert_no_pending_responses()
@@ -0,0 +1,130 @@
+import json
+
+import pytest
+from aws_cdk import App, Environment
+from aws_cdk.assertions import Match, Template
+
+from config import SyntheticProbeConfig
+from stacks.synthetic_probe_stack import SyntheticProbeStack
+
+
+def _probe_template(test_env, **settings):
+    stack = SyntheticProbeStack(
+        scope=App(),
+        id="TestSyntheticProbe",
+        domain_name="example.com",
+        probe_settings=settings,
+        env=test_env,
+    )
+    return Template.from_stack(stack)
+
+
+def test_probe_runs_on_a_schedule(test_env):
+    template = _probe_template(
+        test_env,
+        **SyntheticProbeConfig.from_context({"regions": ["eu-west-1"]}).to_dict()
+    )
+
+    template.has_resource_properties(
+        "AWS::Events::Rule", {"ScheduleExpression": "rate(5 minutes)"}
+    )
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Handler": "ttfb_probe.lambda_handler",
+            "Environment": {
+                "Variables": {
+                    "TARGET_URL": "https://example.com",
+                    "PROBE_PATHS": json.dumps(["/", "{bundle}", "/resume"]),
+                    "PROBE_BACKUP": "false",
+                }
+            },
+        },
+    )
+    # Without a backup bucket the probe needs no extra permissions.
+    template.resource_count_is("AWS::IAM::Policy", 0)
+
+
+def test_backup_probe_reads_the_bucket_name_from_ssm(test_env):
+    template = _probe_template(
+        test_env,
+        probe_backup=True,
+        backup_bucket_param="/BackupWebsiteBucket/BackupWebsiteBucketName",
+        backup_bucket_name_pattern="backupwebsitebucket-*",
+        backup_origin_path="/releases/0123456789abcdef",
+        backup_rewrites={"/resume": "/resume.pdf"},
+    )
+
+    template.has_resource_properties(
+        "AWS::Lambda::Function",
+        {
+            "Environment": {
+                "Variables": Match.object_like(
+                    {
+                        "PROBE_BACKUP": "true",
+                        "BACKUP_ORIGIN_PATH": "/releases/0123456789abcdef",
+                        "BACKUP_REWRITES": json.dumps({"/resume": "/resume.pdf"}),
+                    }
+                )
+            }
+        },
+    )
+    template.has_resource_properties(
+        "AWS::IAM::Policy",
+        {
+            "PolicyDocument": {
+                "Statement": Match.array_with(
+                    [
+                        Match.object_like({"Action": "ssm:GetParameter"}),
+                        Match.object_like(
+                            {
+                                "Action": "s3:GetObject",
+                                "Resource": {
+                                    "Fn::Join": [
+                                        "",
+                                        [
+                                            "arn:",
+                                            {"Ref": "AWS::Partition"},
+                                            ":s3:::backupwebsitebucket-*/*",
+                                        ],
+                                    ]
+                                },
+                                "Condition": {
+                                    "StringEquals": {
+                                        "s3:ResourceAccount": test_env.account
+                                    }
+                                },
+                            }
+                        ),
+                    ]
+                )
+            }
+        },
+    )
+
+
+def test_backup_probe_requires_the_bucket_parameter(test_env):
+    with pytest.raises(ValueError, match="backup_bucket_param"):
+        _probe_template(test_env, probe_backup=True)
+
+
+def test_backup_bucket_reads_must_be_scoped_to_a_bucket_name(test_env):
+    with pytest.raises(ValueError, match="backup_bucket_name_pattern"):
+        _probe_template(
+            test_env,
+            backup_bucket_param="/BackupWebsiteBucket/BackupWebsiteBucketName",
+        )
+
+
+@pytest.mark.parametrize(
+    "value,message",
+    [
+        ({}, "regions"),
+        ({"regions": ["us-east-1"], "schedule_minutes": 0}, "schedule_minutes"),
+        ({"regions": ["us-east-1"], "paths": ["resume"]}, "paths"),
+        ({"regions": ["us-east-1"], "canary": True}, "unknown key"),
+    ],
+)
+def test_probe_config_is_validated(value, message):
+    with pytest.raises((TypeError, ValueError), match=message):
+        SyntheticProbeConfig.from_context(value)
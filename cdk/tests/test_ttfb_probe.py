@@ -0,0 +1,261 @@
+import gzip
+import json
+import shutil
+import ssl
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import ttfb_probe
+
+INDEX_HTML = (
+    b'<html><head><script type="module" src="/assets/index-3f9a1c.js"></script>'
+    b"</head></html>"
+)
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Serves `server.objects` like the edge: /resume rewrites to the PDF."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        time.sleep(self.server.latency)
+        key = {"/": "/index.html", "/resume": "/resume.pdf"}.get(
+            self.path.split("?")[0], self.path.split("?")[0]
+        )
+        body = self.server.objects.get(key)
+        if body is None:
+            self.send_response(404)
+            body = b"missing"
+        else:
+            self.send_response(200)
+            self.send_header("X-Cache", "Hit from cloudfront")
+            self.send_header("X-Amz-Cf-Pop", "LOCAL1-P1")
+            # Like CloudFront, serve the stored variant of a precompressed
+            # page when the viewer accepts it.
+            encoding = self.server.encodings.get(key)
+            if encoding and encoding[0] in self.headers.get("Accept-Encoding", ""):
+                self.send_header("Content-Encoding", encoding[0])
+                body = encoding[1]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    server.objects = {
+        "/index.html": INDEX_HTML,
+        "/assets/index-3f9a1c.js": b"console.log(1)",
+        "/resume.pdf": b"%PDF",
+    }
+    server.requests = []
+    server.latency = 0
+    server.encodings = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, scheme="http", host="127.0.0.1"):
+    return f"{scheme}://{host}:{server.server_address[1]}"
+
+
+def test_probe_times_every_phase(site):
+    site.latency = 0.05
+
+    result = ttfb_probe.probe(_url(site) + "/")
+
+    assert result.ok
+    assert result.status == 200
+    assert result.body == INDEX_HTML
+    assert result.bytes == len(INDEX_HTML)
+    assert result.pop == "LOCAL1-P1"
+    assert result.cache == "Hit from cloudfront"
+    assert result.dns_ms >= 0 and result.connect_ms >= 0
+    assert result.tls_ms is None
+    assert result.ttfb_ms >= 50
+    assert result.total_ms >= result.ttfb_ms
+    path, headers = site.requests[0]
+    assert headers["Accept-Encoding"] == "br, gzip"
+    assert headers["User-Agent"] == ttfb_probe.USER_AGENT
+
+
+def test_probe_records_failures_instead_of_raising(site):
+    missing = ttfb_probe.probe(_url(site) + "/missing")
+    site.shutdown()
+    site.server_close()
+    refused = ttfb_probe.probe(_url(site) + "/", timeout=1)
+
+    assert missing.status == 404 and not missing.ok
+    assert refused.status is None
+    assert refused.error.startswith("ConnectionRefusedError")
+
+
+def test_probes_resolve_the_hashed_bundle_from_the_home_page(site):
+    results = ttfb_probe.run_probes(_url(site), ["/", "{bundle}", "/resume"])
+
+    assert list(results) == [
+        ("primary", "/"),
+        ("primary", "/assets/index-3f9a1c.js"),
+        ("primary", "/resume"),
+    ]
+    assert all(result.ok for result in results.values())
+    assert results[("primary", "/resume")].body == b"%PDF"
+    # The home page is fetched once and reused for `/`.
+    assert [path for path, _ in site.requests].count("/") == 1
+
+
+def test_bundle_is_found_in_a_gzipped_home_page(site):
+    site.encodings["/index.html"] = ("gzip", gzip.compress(INDEX_HTML))
+
+    results = ttfb_probe.run_probes(_url(site), ["/", "{bundle}"])
+
+    assert results[("primary", "/")].content_encoding == "gzip"
+    assert ("primary", "/assets/index-3f9a1c.js") in results
+    # gzip is decoded locally, so `/` is fetched only once.
+    assert [path for path, _ in site.requests].count("/") == 1
+
+
+def test_brotli_home_page_is_refetched_uncompressed_for_discovery(site):
+    site.encodings["/index.html"] = ("br", b"\x1b\x00brotli-bytes")
+
+    results = ttfb_probe.run_probes(_url(site), ["/", "{bundle}"])
+
+    assert results[("primary", "/")].content_encoding == "br"
+    assert ("primary", "/assets/index-3f9a1c.js") in results
+    home_requests = [headers for path, headers in site.requests if path == "/"]
+    assert [headers["Accept-Encoding"] for headers in home_requests] == [
+        "br, gzip",
+        "identity",
+    ]
+
+
+def test_bundle_is_skipped_when_the_home_page_fails(site):
+    del site.objects["/index.html"]
+
+    results = ttfb_probe.run_probes(_url(site), ["/", "{bundle}"])
+
+    assert list(results) == [("primary", "/")]
+    assert not results[("primary", "/")].ok
+
+
+def test_backup_probes_request_the_origin_object_keys(site):
+    backup = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    backup.requests, backup.latency, backup.encodings = [], 0, {}
+    backup.objects = {
+        "/releases/abc/index.html": INDEX_HTML,
+        "/releases/abc/assets/index-3f9a1c.js": b"",
+        "/releases/abc/resume.pdf": b"%PDF",
+    }
+    threading.Thread(target=backup.serve_forever, daemon=True).start()
+    try:
+
+        def backup_url_for(path):
+            key = ttfb_probe.object_key(
+                path, {"/resume": "/resume.pdf"}, "/releases/abc"
+            )
+            return f"{_url(backup)}/{key}?X-Amz-Signature=secret"
+
+        results = ttfb_probe.run_probes(
+            _url(site), ["/", "{bundle}", "/resume"], backup_url_for=backup_url_for
+        )
+    finally:
+        backup.shutdown()
+        backup.server_close()
+
+    assert [path.split("?")[0] for path, _ in backup.requests] == [
+        "/releases/abc/index.html",
+        "/releases/abc/assets/index-3f9a1c.js",
+        "/releases/abc/resume.pdf",
+    ]
+    assert all(results[("backup", path)].ok for path in ("/", "/resume"))
+
+
+def test_handler_emits_emf_metrics(site, monkeypatch, capsys):
+    monkeypatch.setattr(ttfb_probe, "TARGET_URL", _url(site))
+    monkeypatch.setattr(ttfb_probe, "PROBE_PATHS", ["/", "/missing"])
+    monkeypatch.setenv("AWS_REGION", "eu-west-1")
+
+    response = ttfb_probe.lambda_handler({}, None)
+
+    assert response == {
+        "ProbedCount": 2,
+        "FailedCount": 1,
+        "Failures": ["primary:/missing"],
+    }
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    home = records[0]
+    (directive,) = home["_aws"]["CloudWatchMetrics"]
+    assert directive["Namespace"] == "WebsiteProbe"
+    assert directive["Dimensions"] == [["ProbeRegion", "Origin", "Path"]]
+    # Plain HTTP has no TLS phase, so no TlsTime is published.
+    assert [metric["Name"] for metric in directive["Metrics"]] == [
+        "DnsTime",
+        "ConnectTime",
+        "TimeToFirstByte",
+        "TotalTime",
+        "Success",
+    ]
+    assert home["ProbeRegion"] == "eu-west-1"
+    assert home["Path"] == "/"
+    assert home["Success"] == 1
+    assert home["TimeToFirstByte"] > 0
+    assert records[1]["Success"] == 0
+
+
+def test_emf_records_never_log_presigned_signatures():
+    result = ttfb_probe.ProbeResult(url="https://bucket/key?X-Amz-Signature=secret")
+
+    record = json.loads(ttfb_probe.emf_record("backup", "/", result, "us-east-1"))
+
+    assert record["Result"]["url"] == "https://bucket/key"
+    assert "secret" not in json.dumps(record)
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="openssl is required")
+def test_probe_times_the_tls_handshake(site, tmp_path):
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(cert, key)
+    site.socket = server_context.wrap_socket(site.socket, server_side=True)
+
+    result = ttfb_probe.probe(
+        _url(site, "https", "localhost") + "/resume",
+        ssl_context=ssl.create_default_context(cafile=str(cert)),
+    )
+
+    assert result.ok, result.error
+    assert result.body == b"%PDF"
+    assert result.tls_ms > 0
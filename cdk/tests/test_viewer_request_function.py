@@ -0,0 +1,104 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from my_constructs.cloudfront_distribution import (
+    CLEAN_URL_REWRITES,
+    edge_route_entries,
+    viewer_request_function_code,
+)
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("node") is None, reason="node is required to run the function"
+)
+
+
+DEFAULT_ROUTES = {
+    path: {"rewrite": target} for path, target in CLEAN_URL_REWRITES.items()
+}
+
+
+def _invoke(
+    uri: str, accept_encoding: str | None = None, routes=None, **options
+) -> dict:
+    """Run the viewer-request function under node against an in-memory store."""
+    headers = {}
+    if accept_encoding is not None:
+        headers["accept-encoding"] = {"value": accept_encoding}
+    event = {"request": {"uri": uri, "headers": headers}}
+    store = {
+        entry["key"]: entry["value"]
+        for entry in edge_route_entries(DEFAULT_ROUTES if routes is None else routes)
+    }
+    code = viewer_request_function_code(**options)
+    # node has no `cloudfront` module; stand in for its KeyValueStore client.
+    code = code.replace(
+        "import cf from 'cloudfront';",
+        f"""var store = {json.dumps(store)};
+        var cf = {{ kvs: function () {{ return {{ get: async function (key) {{
+            if (!(key in store)) throw new Error("Key not found");
+            return store[key];
+        }} }}; }} }};""",
+    )
+    script = (
+        code + f"\nhandler({json.dumps(event)})"
+        ".then(function (r) { console.log(JSON.stringify(r)); });"
+    )
+    result = subprocess.run(
+        ["node", "-e", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def _run(uri: str, accept_encoding: str | None = None, **options) -> str:
+    """Run the viewer-request function and return the new URI."""
+    return _invoke(uri, accept_encoding, **options)["uri"]
+
+
+def test_clean_urls_are_rewritten():
+    assert _run("/resume") == "/resume.pdf"
+    assert _run("/resume/", "br", precompressed_encodings=True) == "/resume.pdf"
+
+
+@pytest.mark.parametrize(
+    ("uri", "accept_encoding", "expected"),
+    [
+        ("/assets/app.js", "gzip, deflate, br, zstd", "/assets/app.js.br"),
+        ("/assets/app.js", "gzip", "/assets/app.js.gz"),
+        ("/assets/app.js", "br;q=0, gzip;q=0.8", "/assets/app.js.gz"),
+        ("/assets/app.js", "identity", "/assets/app.js"),
+        ("/assets/app.js", None, "/assets/app.js"),
+        ("/", "br", "/index.html.br"),
+        ("/", None, "/"),
+        ("/favicon.ICO", "gzip", "/favicon.ICO.gz"),
+        ("/apple-touch-icon.png", "br", "/apple-touch-icon.png"),
+        ("/assets.v2/app", "br", "/assets.v2/app"),
+    ],
+)
+def test_precompressed_variant_follows_accept_encoding(uri, accept_encoding, expected):
+    assert _run(uri, accept_encoding, precompressed_encodings=True) == expected
+
+
+def test_variants_are_not_served_unless_enabled():
+    assert _run("/assets/app.js", "br") == "/assets/app.js"
+
+
+def test_redirect_routes_return_a_response():
+    response = _invoke(
+        "/cv",
+        "br",
+        routes={"/cv": {"redirect": "/resume", "status_code": 308}},
+        precompressed_encodings=True,
+    )
+
+    assert response == {
+        "statusCode": 308,
+        "statusDescription": "Permanent Redirect",
+        "headers": {"location": {"value": "/resume"}},
+    }
+
+
+def test_unrouted_uris_pass_through():
+    assert _run("/resume.pdf", routes={}) == "/resume.pdf"
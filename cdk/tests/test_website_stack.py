@@ -1,4 +1,8 @@
-from aws_cdk.assertions import Template
+import pytest
+from aws_cdk.assertions import Match, Template
+
+from my_constructs.static_site_deployment import release_id_for
+from stacks.website_stack import WebsiteStack
 
 
 def test_cloudfront_distribution_settings(website_stack):
@@ -45,7 +49,26 @@ def test_route53_records_created(website_stack):
 def test_bucket_deployments_exist(website_stack):
     template = Template.from_stack(website_stack)
 
-    template.resource_count_is("Custom::CDKBucketDeployment", 2)
+    # Website and backup buckets, sharing one incremental deployer Lambda.
+    template.resource_count_is("Custom::StaticSiteDeployment", 2)
+    template.resource_count_is("Custom::CDKBucketDeployment", 0)
+    template.resource_properties_count_is(
+        "AWS::Lambda::Function",
+        {"Handler": "static_site_deployer.lambda_handler"},
+        1,
+    )
+
+
+def test_incremental_deployment_tags_the_website_bucket(website_stack):
+    template = Template.from_stack(website_stack)
+
+    buckets = template.find_resources("AWS::S3::Bucket")
+    tag_keys = [
+        tag["Key"]
+        for bucket in buckets.values()
+        for tag in bucket["Properties"].get("Tags", [])
+    ]
+    assert any(key.startswith("aws-cdk:cr-owned:") for key in tag_keys)
 
 
 def test_bucket_policy_enforces_tls(website_stack):
@@ -87,3 +110,432 @@ def test_cloudfront_uses_oac(website_stack):
             }
         },
     )
+
+
+def test_incremental_deployment_invalidates_changed_paths_with_aliases(website_stack):
+    template = Template.from_stack(website_stack)
+
+    template.has_resource_properties(
+        "Custom::StaticSiteDeployment",
+        {
+            "MaxInvalidationPaths": "20",
+            "InvalidationAliases": {"resume.pdf": ["/resume", "/resume/"]},
+        },
+    )
+
+
+def test_incremental_deployment_sets_cache_control_per_object(website_stack):
+    template = Template.from_stack(website_stack)
+
+    template.has_resource_properties(
+        "Custom::StaticSiteDeployment",
+        {
+            "CacheControl": Match.array_with(
+                [
+                    {
+                        "Pattern": "assets/*",
+                        "Value": "public, max-age=31536000, immutable",
+                    },
+                    {
+                        "Pattern": "*.html",
+                        "Value": "public, max-age=0, s-maxage=300, must-revalidate",
+                    },
+                ]
+            ),
+            "DefaultCacheControl": "public, max-age=86400",
+        },
+    )
+
+
+def test_bucket_deployment_mode_splits_deployments_by_cache_control(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    stack = WebsiteStack(
+        scope=test_app,
+        id="TestWebsiteBucketDeployment",
+        domain_name="example.com",
+        source_file_path="tests/assets",
+        acm_ssm_params=acm_ssm_params,
+        backup_website_bucket_ssm_params=backup_ssm_params,
+        asset_deployment_mode="bucket_deployment",
+        env=test_env,
+    )
+    template = Template.from_stack(stack)
+
+    # Catch-all plus immutable, revalidate and resume groups, per bucket.
+    template.resource_count_is("Custom::CDKBucketDeployment", 8)
+    template.has_resource_properties(
+        "Custom::CDKBucketDeployment",
+        {
+            "SystemMetadata": {"cache-control": "public, max-age=31536000, immutable"},
+            "Exclude": ["*"],
+            "Include": ["assets/*"],
+        },
+    )
+    template.has_resource_properties(
+        "Custom::CDKBucketDeployment",
+        {
+            "SystemMetadata": {"cache-control": "public, max-age=86400"},
+            "DistributionPaths": ["/*"],
+        },
+    )
+
+
+def test_path_specific_cache_behaviors(website_stack):
+    template = Template.from_stack(website_stack)
+
+    behaviors = {
+        behavior["PathPattern"]: behavior
+        for distribution in template.find_resources(
+            "AWS::CloudFront::Distribution"
+        ).values()
+        for behavior in distribution["Properties"]["DistributionConfig"][
+            "CacheBehaviors"
+        ]
+    }
+    assert list(behaviors) == ["/assets/*", "/index.html", "/", "/resume*"]
+    assert behaviors["/index.html"]["CachePolicyId"] == behaviors["/"]["CachePolicyId"]
+    assert behaviors["/resume*"]["Compress"] is False
+    # The clean URL rewrite only runs where a clean URL can arrive.
+    assert "FunctionAssociations" in behaviors["/resume*"]
+    assert "FunctionAssociations" not in behaviors["/assets/*"]
+
+    template.resource_count_is("AWS::CloudFront::CachePolicy", 4)
+    template.has_resource_properties(
+        "AWS::CloudFront::CachePolicy",
+        {
+            "CachePolicyConfig": Match.object_like(
+                {"DefaultTTL": 31536000, "MaxTTL": 31536000, "MinTTL": 0}
+            )
+        },
+    )
+    template.has_resource_properties(
+        "AWS::CloudFront::CachePolicy",
+        {
+            "CachePolicyConfig": Match.object_like(
+                {
+                    "DefaultTTL": 86400,
+                    "ParametersInCacheKeyAndForwardedToOrigin": Match.object_like(
+                        {"EnableAcceptEncodingGzip": False}
+                    ),
+                }
+            )
+        },
+    )
+
+
+def test_precompressed_encodings_negotiate_on_every_behavior(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    stack = WebsiteStack(
+        scope=test_app,
+        id="TestWebsitePrecompressed",
+        domain_name="example.com",
+        source_file_path="tests/assets",
+        acm_ssm_params=acm_ssm_params,
+        backup_website_bucket_ssm_params=backup_ssm_params,
+        precompressed_encodings=True,
+        env=test_env,
+    )
+    template = Template.from_stack(stack)
+
+    distribution = next(
+        iter(template.find_resources("AWS::CloudFront::Distribution").values())
+    )
+    config = distribution["Properties"]["DistributionConfig"]
+    for behavior in [config["DefaultCacheBehavior"], *config["CacheBehaviors"]]:
+        assert behavior["FunctionAssociations"]
+    template.has_resource_properties(
+        "AWS::CloudFront::ResponseHeadersPolicy",
+        {
+            "ResponseHeadersPolicyConfig": Match.object_like(
+                {
+                    "CustomHeadersConfig": {
+                        "Items": [
+                            {
+                                "Header": "Vary",
+                                "Value": "Accept-Encoding",
+                                "Override": False,
+                            }
+                        ]
+                    }
+                }
+            )
+        },
+    )
+
+
+def test_precompressed_encodings_require_variants_in_the_build(
+    test_app, test_env, acm_ssm_params, backup_ssm_params, tmp_path
+):
+    (tmp_path / "index.html").write_text("<html></html>")
+    (tmp_path / "index.html.br").write_bytes(b"br")
+
+    with pytest.raises(ValueError, match=r"index\.html\.gz"):
+        WebsiteStack(
+            scope=test_app,
+            id="TestWebsiteMissingVariants",
+            domain_name="example.com",
+            source_file_path=str(tmp_path),
+            acm_ssm_params=acm_ssm_params,
+            backup_website_bucket_ssm_params=backup_ssm_params,
+            precompressed_encodings=True,
+            env=test_env,
+        )
+
+
+def test_backup_replication_uploads_once(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    stack = WebsiteStack(
+        scope=test_app,
+        id="TestWebsiteReplicated",
+        domain_name="example.com",
+        source_file_path="tests/assets",
+        acm_ssm_params=acm_ssm_params,
+        backup_website_bucket_ssm_params=backup_ssm_params,
+        backup_sync="replication",
+        env=test_env,
+    )
+    template = Template.from_stack(stack)
+
+    template.resource_count_is("Custom::StaticSiteDeployment", 1)
+    template.has_resource_properties(
+        "AWS::S3::Bucket",
+        {
+            "ReplicationConfiguration": {
+                "Role": Match.any_value(),
+                "Rules": [
+                    Match.object_like(
+                        {
+                            "Status": "Enabled",
+                            "DeleteMarkerReplication": {"Status": "Enabled"},
+                            "Destination": Match.object_like(
+                                {"Bucket": Match.any_value()}
+                            ),
+                        }
+                    )
+                ],
+            }
+        },
+    )
+
+
+def test_backup_deployment_is_retained_and_not_invalidated(website_stack):
+    template = Template.from_stack(website_stack)
+
+    deployments = template.find_resources("Custom::StaticSiteDeployment")
+    backup = [
+        resource["Properties"]
+        for resource in deployments.values()
+        if resource["Properties"]["RetainOnDelete"] == "true"
+    ]
+    assert len(backup) == 1
+    assert "DistributionId" not in backup[0]
+
+
+def _release_stack(test_app, test_env, acm_ssm_params, backup_ssm_params, **kwargs):
+    return WebsiteStack(
+        scope=test_app,
+        id="TestWebsiteReleases",
+        domain_name="example.com",
+        source_file_path="tests/assets",
+        acm_ssm_params=acm_ssm_params,
+        backup_website_bucket_ssm_params=backup_ssm_params,
+        asset_deployment_mode="releases",
+        env=test_env,
+        **kwargs,
+    )
+
+
+def test_releases_switch_origin_path_after_upload(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    stack = _release_stack(test_app, test_env, acm_ssm_params, backup_ssm_params)
+    template = Template.from_stack(stack)
+
+    release_id = release_id_for("tests/assets")
+    deployments = template.find_resources("Custom::StaticSiteDeployment")
+    assert len(deployments) == 2
+    for resource in deployments.values():
+        assert resource["Properties"]["DestinationKeyPrefix"] == (
+            f"releases/{release_id}/"
+        )
+        assert resource["Properties"]["RetainOnDelete"] == "true"
+        assert "DistributionId" not in resource["Properties"]
+
+    distribution = next(
+        iter(template.find_resources("AWS::CloudFront::Distribution").values())
+    )
+    origins = distribution["Properties"]["DistributionConfig"]["Origins"]
+    assert {origin["OriginPath"] for origin in origins} == {f"/releases/{release_id}"}
+    assert set(distribution["DependsOn"]) >= set(deployments)
+
+    template.has_resource_properties(
+        "Custom::StaticSiteReleaseInvalidation",
+        {
+            "ReleaseKeyPrefix": f"releases/{release_id}/",
+            "ImmutablePatterns": ["assets/*"],
+        },
+    )
+
+
+def test_active_release_pins_the_origin_path(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    stack = _release_stack(
+        test_app,
+        test_env,
+        acm_ssm_params,
+        backup_ssm_params,
+        active_release="0123456789abcdef",
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource_properties(
+        "AWS::CloudFront::Distribution",
+        {
+            "DistributionConfig": Match.object_like(
+                {
+                    "Origins": Match.array_with(
+                        [
+                            Match.object_like(
+                                {"OriginPath": "/releases/0123456789abcdef"}
+                            )
+                        ]
+                    )
+                }
+            )
+        },
+    )
+    template.has_resource_properties(
+        "Custom::StaticSiteReleaseInvalidation",
+        {"ReleaseKeyPrefix": "releases/0123456789abcdef/"},
+    )
+
+
+def test_active_release_requires_releases_mode(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    with pytest.raises(ValueError, match="active_release"):
+        WebsiteStack(
+            scope=test_app,
+            id="TestWebsitePinnedIncremental",
+            domain_name="example.com",
+            source_file_path="tests/assets",
+            acm_ssm_params=acm_ssm_params,
+            backup_website_bucket_ssm_params=backup_ssm_params,
+            active_release="0123456789abcdef",
+            env=test_env,
+        )
+
+
+def test_retain_releases_never_prunes_the_active_release(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    stack = _release_stack(
+        test_app,
+        test_env,
+        acm_ssm_params,
+        backup_ssm_params,
+        active_release="0123456789abcdef",
+        retain_releases=5,
+    )
+    template = Template.from_stack(stack)
+
+    deployments = template.find_resources("Custom::StaticSiteDeployment")
+    assert len(deployments) == 2
+    for resource in deployments.values():
+        assert resource["Properties"]["RetainReleases"] == "5"
+        assert resource["Properties"]["LiveKeyPrefix"] == "releases/0123456789abcdef/"
+
+
+def test_retain_releases_with_replication_prunes_only_the_website_bucket(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    stack = _release_stack(
+        test_app,
+        test_env,
+        acm_ssm_params,
+        backup_ssm_params,
+        backup_sync="replication",
+        retain_releases=5,
+    )
+    template = Template.from_stack(stack)
+
+    # The backup bucket has no deployment to prune it; the website bucket's
+    # deletions reach it through delete-marker replication instead.
+    deployments = template.find_resources("Custom::StaticSiteDeployment")
+    assert len(deployments) == 1
+    (deployment,) = deployments.values()
+    assert deployment["Properties"]["RetainReleases"] == "5"
+    assert deployment["Properties"]["LiveKeyPrefix"] == (
+        f"releases/{release_id_for('tests/assets')}/"
+    )
+    template.has_resource_properties(
+        "AWS::S3::Bucket",
+        {
+            "ReplicationConfiguration": Match.object_like(
+                {
+                    "Rules": [
+                        Match.object_like(
+                            {"DeleteMarkerReplication": {"Status": "Enabled"}}
+                        )
+                    ]
+                }
+            )
+        },
+    )
+
+
+def test_retain_releases_requires_releases_mode(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    with pytest.raises(ValueError, match="retain_releases"):
+        WebsiteStack(
+            scope=test_app,
+            id="TestWebsiteRetainedIncremental",
+            domain_name="example.com",
+            source_file_path="tests/assets",
+            acm_ssm_params=acm_ssm_params,
+            backup_website_bucket_ssm_params=backup_ssm_params,
+            retain_releases=5,
+            env=test_env,
+        )
+
+
+def test_edge_routes_are_published_to_the_key_value_store(
+    test_app, test_env, acm_ssm_params, backup_ssm_params
+):
+    stack = WebsiteStack(
+        scope=test_app,
+        id="TestWebsiteEdgeRoutes",
+        domain_name="example.com",
+        source_file_path="tests/assets",
+        acm_ssm_params=acm_ssm_params,
+        backup_website_bucket_ssm_params=backup_ssm_params,
+        edge_routes={
+            "/resume": {"rewrite": "/resume.pdf"},
+            "/cv": {"redirect": "/resume", "status_code": 308},
+        },
+        env=test_env,
+    )
+    template = Template.from_stack(stack)
+
+    template.resource_count_is("AWS::CloudFront::KeyValueStore", 1)
+    template.has_resource_properties(
+        "AWS::CloudFront::Function",
+        {
+            "FunctionConfig": Match.object_like({"Runtime": "cloudfront-js-2.0"}),
+            "FunctionCode": Match.string_like_regexp("cf.kvs()"),
+        },
+    )
+    function_code = next(
+        iter(template.find_resources("AWS::CloudFront::Function").values())
+    )["Properties"]["FunctionCode"]
+    assert "/cv" not in function_code
+    # The invalidation aliases follow the configured rewrites.
+    template.has_resource_properties(
+        "Custom::StaticSiteDeployment",
+        {"InvalidationAliases": {"resume.pdf": ["/resume"]}},
+    )
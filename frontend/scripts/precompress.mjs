@@ -0,0 +1,67 @@
+// Writes maximum-level Brotli (.br) and gzip (.gz) variants of every
+// compressible file in the build output. CloudFront's viewer-request function
+// serves a variant whenever the viewer accepts its encoding, so every file
+// with one of these extensions must get both variants, however small.
+//
+// Keep COMPRESSIBLE_EXTENSIONS in sync with PRECOMPRESSED_EXTENSIONS in
+// cdk/my_constructs/cloudfront_distribution.py.
+import { readdir, readFile, writeFile } from 'node:fs/promises'
+import { extname, join, relative } from 'node:path'
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib'
+
+const COMPRESSIBLE_EXTENSIONS = [
+  '.css',
+  '.html',
+  '.ico',
+  '.js',
+  '.json',
+  '.map',
+  '.mjs',
+  '.svg',
+  '.txt',
+  '.webmanifest',
+  '.xml',
+]
+
+const outDir = process.argv[2] ?? 'dist'
+
+async function* walk(dir) {
+  for (const entry of await readdir(dir, { withFileTypes: true })) {
+    const path = join(dir, entry.name)
+    if (entry.isDirectory()) {
+      yield* walk(path)
+    } else {
+      yield path
+    }
+  }
+}
+
+let originalBytes = 0
+let brotliBytes = 0
+let count = 0
+for await (const path of walk(outDir)) {
+  if (!COMPRESSIBLE_EXTENSIONS.includes(extname(path).toLowerCase())) {
+    continue
+  }
+  const source = await readFile(path)
+  const brotli = brotliCompressSync(source, {
+    params: {
+      [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+      [constants.BROTLI_PARAM_SIZE_HINT]: source.length,
+    },
+  })
+  const gzip = gzipSync(source, { level: constants.Z_BEST_COMPRESSION })
+  await writeFile(`${path}.br`, brotli)
+  await writeFile(`${path}.gz`, gzip)
+
+  originalBytes += source.length
+  brotliBytes += brotli.length
+  count += 1
+  console.log(
+    `${relative(outDir, path)}: ${source.length} -> br ${brotli.length}, gz ${gzip.length}`,
+  )
+}
+
+console.log(
+  `Precompressed ${count} file(s): ${originalBytes} -> ${brotliBytes} bytes with Brotli`,
+)